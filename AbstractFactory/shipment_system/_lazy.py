@@ -0,0 +1,23 @@
+from importlib import import_module
+import sys
+
+def lazy_exports(package, modules):
+    """Build a package's ``__getattr__`` and ``__dir__`` for lazily loaded names.
+    
+    ``modules`` maps each exported name to the module that defines it. The
+    module is imported on first access to the name, and the value is stored
+    on the package so later lookups skip ``__getattr__``.
+    """
+    def __getattr__(name):
+        try:
+            module = modules[name]
+        except KeyError:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}") from None
+        value = getattr(import_module(module), name)
+        setattr(sys.modules[package], name, value)
+        return value
+
+    def __dir__():
+        return sorted(set(vars(sys.modules[package])) | set(modules))
+
+    return __getattr__, __dir__
@@ -1,17 +1,26 @@
 from abc import ABC, abstractmethod
-import random
+from shipment_system.delivery import default_calendar, parse_delivery_time
+from shipment_system.tracking import id_allocator
 
 class Shipment(ABC):
     """Abstract base class for all shipment types."""
     
+    __slots__ = ("tracking_number", "weight", "destination")
+    
+    # Carrier and mode codes of the concrete product, used for rate lookups.
+    carrier = None
+    mode = None
+    # Name of the flag holding the product's carrier-specific option.
+    option_attribute = None
+    
     def __init__(self):
         self.tracking_number = self._generate_tracking_number()
         self.weight = 0.0
         self.destination = ""
     
     def _generate_tracking_number(self):
-        """Generate a random tracking number."""
-        return f"TRK-{random.randint(100000, 999999)}"
+        """Generate a unique, time-ordered tracking number."""
+        return id_allocator.format_tracking_number(id_allocator.default_allocator.allocate(), self.carrier)
     
     def get_tracking_number(self):
         """Get the shipment tracking number."""
@@ -33,6 +42,22 @@ class Shipment(ABC):
         """Get the shipment destination."""
         return self.destination
     
+    def has_option(self):
+        """Check whether the carrier-specific option is enabled."""
+        return bool(getattr(self, self.option_attribute))
+    
+    def set_option(self, enabled):
+        """Enable or disable the carrier-specific option."""
+        setattr(self, self.option_attribute, enabled)
+    
+    def get_delivery_window(self):
+        """Get the estimated delivery time as a (min_days, max_days) window."""
+        return parse_delivery_time(self.get_estimated_delivery_time())
+    
+    def get_delivery_dates(self, shipped_on=None, calendar=None):
+        """Get the earliest and latest delivery dates for a shipping date."""
+        return (calendar or default_calendar).delivery_dates(self.get_delivery_window(), shipped_on)
+    
     @abstractmethod
     def calculate_cost(self):
         """Calculate the cost of the shipment."""
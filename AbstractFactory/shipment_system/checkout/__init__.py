@@ -0,0 +1,7 @@
+from shipment_system.checkout.checkout_pipeline import (
+    CheckoutMetrics,
+    CheckoutPipeline,
+    CheckoutResult,
+    Order,
+    Settlement,
+)
@@ -0,0 +1,216 @@
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+import math
+import threading
+import time
+from typing import NamedTuple, Optional
+from shipment_system.factories.factory_registry import default_registry
+
+DEFAULT_WINDOW = 10000
+DEFAULT_BATCH_SIZE = 100
+
+class Order(NamedTuple):
+    """One parcel to ship and charge for; ``options`` are product option keywords."""
+    
+    order_id: str
+    customer: str
+    payment_method: str
+    carrier: str
+    shipment_type: str
+    destination: str
+    weight: float
+    options: Optional[dict] = None
+
+class CheckoutResult(NamedTuple):
+    """Outcome of one order; ``error`` is set when pricing or payment failed."""
+    
+    order_id: str
+    tracking_number: Optional[str]
+    cost: Optional[float]
+    transaction_id: Optional[str]
+    error: Optional[Exception] = None
+
+class Settlement(NamedTuple):
+    """One charge covering several orders of a customer with one payment method."""
+    
+    customer: str
+    payment_method: str
+    amount: float
+    order_indexes: tuple
+
+class CheckoutMetrics:
+    """Counters of a checkout run, updated as windows are settled."""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.orders = 0
+        self.failed_orders = 0
+        self.settlements = 0
+        self.failed_settlements = 0
+        self.batches = 0
+        self.pricing_seconds = 0.0
+        self.settlement_seconds = 0.0
+    
+    def add(self, **counts):
+        with self._lock:
+            for name, value in counts.items():
+                setattr(self, name, getattr(self, name) + value)
+    
+    @property
+    def orders_per_transaction(self):
+        """How many orders each provider transaction paid for on average."""
+        return self.orders / self.settlements if self.settlements else 0.0
+    
+    @property
+    def settlement_seconds_per_order(self):
+        return self.settlement_seconds / self.orders if self.orders else 0.0
+    
+    def as_dict(self):
+        return {
+            "orders": self.orders,
+            "failed_orders": self.failed_orders,
+            "settlements": self.settlements,
+            "failed_settlements": self.failed_settlements,
+            "batches": self.batches,
+            "orders_per_transaction": self.orders_per_transaction,
+            "pricing_seconds": self.pricing_seconds,
+            "settlement_seconds": self.settlement_seconds,
+            "settlement_seconds_per_order": self.settlement_seconds_per_order,
+        }
+
+class CheckoutPipeline:
+    """Price a stream of orders through the factories and charge for them in batches.
+    
+    Orders are read in windows of ``window`` orders. Each order is created
+    through the factory registry and priced with ``calculate_cost()``; the
+    costs of a window are then summed per (customer, payment method) into
+    settlements, so a customer shipping many parcels is charged once per
+    window instead of once per parcel. Settlements larger than
+    ``max_settlement`` are split.
+    
+    ``processors`` maps payment method names to payment processors. A
+    processor with ``process_batch(amounts, currencies)`` (such as
+    ``PaymentProcessor``) receives settlements ``batch_size`` at a time, and
+    at most ``max_concurrency`` batches are in flight across all processors;
+    any other processor gets one ``process_transaction(amount, currency)``
+    call per settlement. A failed charge, including a processor that raises
+    for a whole batch, is reported on the affected orders' results and does
+    not stop the stream.
+    """
+    
+    def __init__(self, processors, registry=default_registry, window=DEFAULT_WINDOW,
+                 batch_size=DEFAULT_BATCH_SIZE, max_concurrency=8, currency="USD", max_settlement=None):
+        self.processors = processors
+        self.registry = registry
+        self.window = window
+        self.batch_size = batch_size
+        self.max_concurrency = max_concurrency
+        self.currency = currency
+        self.max_settlement = max_settlement
+        self.metrics = CheckoutMetrics()
+    
+    def run(self, orders):
+        """Yield a ``CheckoutResult`` per order, in order."""
+        orders = iter(orders)
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+            while True:
+                window = list(islice(orders, self.window))
+                if not window:
+                    return
+                yield from self._checkout_window(window, executor)
+    
+    def _checkout_window(self, orders, executor):
+        start = time.perf_counter()
+        priced = [self._price(order) for order in orders]
+        pricing_seconds = time.perf_counter() - start
+        
+        start = time.perf_counter()
+        settlements = self._settlements(orders, priced)
+        transaction_ids = [None] * len(orders)
+        errors = [error for _, _, error in priced]
+        futures = []
+        for payment_method, pending in settlements.items():
+            processor = self.processors.get(payment_method)
+            for i in range(0, len(pending), self.batch_size):
+                batch = pending[i:i + self.batch_size]
+                future = executor.submit(self._charge, processor, batch) if processor is not None else None
+                futures.append((batch, future))
+        
+        failed_settlements = 0
+        for batch, future in futures:
+            outcomes = future.result() if future is not None else [
+                (None, ValueError(f"Unknown payment method: {batch[0].payment_method}"))
+            ] * len(batch)
+            for settlement, (transaction_id, error) in zip(batch, outcomes):
+                failed_settlements += error is not None
+                for index in settlement.order_indexes:
+                    if error is None:
+                        transaction_ids[index] = transaction_id
+                    else:
+                        errors[index] = error
+        self.metrics.add(
+            orders=len(orders),
+            failed_orders=sum(error is not None for error in errors),
+            settlements=sum(len(batch) for batch, _ in futures),
+            failed_settlements=failed_settlements,
+            batches=len(futures),
+            pricing_seconds=pricing_seconds,
+            settlement_seconds=time.perf_counter() - start,
+        )
+        
+        return [
+            CheckoutResult(
+                order.order_id, tracking_number, cost,
+                transaction_ids[index] if errors[index] is None else None, errors[index],
+            )
+            for index, (order, (tracking_number, cost, _)) in enumerate(zip(orders, priced))
+        ]
+    
+    def _price(self, order):
+        try:
+            shipment, _ = self.registry.create(
+                order.carrier, order.shipment_type, order.destination, order.weight, **(order.options or {})
+            )
+            return shipment.get_tracking_number(), round(shipment.calculate_cost(), 2), None
+        except Exception as e:
+            return None, None, e
+    
+    def _settlements(self, orders, priced):
+        """Group the priced orders of a window per payment method, then per customer."""
+        groups = {}
+        for index, (order, (_, cost, error)) in enumerate(zip(orders, priced)):
+            if error is None:
+                groups.setdefault((order.payment_method, order.customer), []).append(index)
+        settlements = {}
+        for (payment_method, customer), indexes in groups.items():
+            pending = settlements.setdefault(payment_method, [])
+            chunk, total = [], 0.0
+            for index in indexes:
+                cost = priced[index][1]
+                if chunk and self.max_settlement is not None and total + cost > self.max_settlement:
+                    pending.append(Settlement(customer, payment_method, round(total, 2), tuple(chunk)))
+                    chunk, total = [], 0.0
+                chunk.append(index)
+                total = math.fsum((total, cost))
+            pending.append(Settlement(customer, payment_method, round(total, 2), tuple(chunk)))
+        return settlements
+    
+    def _charge(self, processor, batch):
+        """Charge a batch of settlements; returns (transaction_id, error) per settlement."""
+        amounts = [settlement.amount for settlement in batch]
+        if hasattr(processor, "process_batch"):
+            try:
+                items = processor.process_batch(amounts, self.currency)
+            except Exception as e:
+                return [(None, e)] * len(batch)
+            return [
+                (item.details.transaction_id, None) if item.error is None else (None, item.error)
+                for item in items
+            ]
+        outcomes = []
+        for amount in amounts:
+            try:
+                outcomes.append((processor.process_transaction(amount, self.currency).transaction_id, None))
+            except Exception as e:
+                outcomes.append((None, e))
+        return outcomes
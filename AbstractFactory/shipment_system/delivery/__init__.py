@@ -0,0 +1,2 @@
+from shipment_system.delivery.delivery_window import DeliveryWindow, parse_delivery_time
+from shipment_system.delivery.business_calendar import BusinessCalendar, default_calendar
\ No newline at end of file
@@ -0,0 +1,54 @@
+import datetime
+from array import array
+from bisect import bisect_right
+from functools import lru_cache
+
+class BusinessCalendar:
+    """Working days between two years, with weekends and holidays removed.
+    
+    All business days of the covered years are precomputed as a sorted
+    array of date ordinals, so moving a date by N business days is one
+    binary search and one index; results are also memoized.
+    """
+    
+    def __init__(self, holidays=(), weekend=(5, 6), first_year=None, last_year=None):
+        today = datetime.date.today()
+        self.holidays = frozenset(holidays)
+        self.weekend = frozenset(weekend)
+        self.first_year = first_year or today.year - 1
+        self.last_year = last_year or today.year + 2
+        first = datetime.date(self.first_year, 1, 1).toordinal()
+        last = datetime.date(self.last_year, 12, 31).toordinal()
+        holiday_ordinals = {day.toordinal() for day in self.holidays}
+        self._business_days = array("l", [
+            ordinal for ordinal in range(first, last + 1)
+            if ordinal not in holiday_ordinals and (ordinal - 1) % 7 not in self.weekend
+        ])
+        self.add_business_days = lru_cache(maxsize=4096)(self._add_business_days)
+    
+    @classmethod
+    def from_file(cls, path, **kwargs):
+        """Build a calendar from a file with one ISO date (YYYY-MM-DD) per line."""
+        with open(path, encoding="utf-8") as holiday_file:
+            holidays = [datetime.date.fromisoformat(line.strip()) for line in holiday_file if line.strip()]
+        return cls(holidays, **kwargs)
+    
+    def is_business_day(self, day):
+        """Check whether a date is a working day."""
+        return day.weekday() not in self.weekend and day not in self.holidays
+    
+    def _add_business_days(self, day, days):
+        """Get the date ``days`` business days after ``day``."""
+        if days <= 0:
+            return day
+        index = bisect_right(self._business_days, day.toordinal()) + days - 1
+        if index >= len(self._business_days) or day.year < self.first_year:
+            raise ValueError(f"Date outside of the calendar ({self.first_year}-{self.last_year}): {day}")
+        return datetime.date.fromordinal(self._business_days[index])
+    
+    def delivery_dates(self, window, shipped_on=None):
+        """Get the earliest and latest delivery dates for a delivery window."""
+        shipped_on = shipped_on or datetime.date.today()
+        return self.add_business_days(shipped_on, window.min_days), self.add_business_days(shipped_on, window.max_days)
+
+default_calendar = BusinessCalendar()
\ No newline at end of file
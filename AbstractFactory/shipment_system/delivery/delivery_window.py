@@ -0,0 +1,28 @@
+import re
+from functools import lru_cache
+from typing import NamedTuple
+
+class DeliveryWindow(NamedTuple):
+    """Delivery time as a range of business days after shipping."""
+    
+    min_days: int
+    max_days: int
+
+_DAY_RANGE = re.compile(r"^(\d+)(?:\s*-\s*(\d+))?\s+business days?$")
+_NAMED_WINDOWS = {
+    "overnight": DeliveryWindow(1, 1),
+    "next business day": DeliveryWindow(1, 1),
+}
+
+@lru_cache(maxsize=1024)
+def parse_delivery_time(text):
+    """Turn a delivery time text such as "3-5 business days" into a window."""
+    normalized = text.strip().lower()
+    window = _NAMED_WINDOWS.get(normalized)
+    if window is not None:
+        return window
+    match = _DAY_RANGE.match(normalized)
+    if match is None:
+        raise ValueError(f"Unknown delivery time: {text}")
+    min_days = int(match.group(1))
+    return DeliveryWindow(min_days, int(match.group(2) or min_days))
\ No newline at end of file
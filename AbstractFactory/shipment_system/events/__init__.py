@@ -0,0 +1,9 @@
+from shipment_system.events.event_log import (
+    BatchingEventWriter,
+    EventLog,
+    JsonFormatter,
+    configure,
+    emit,
+    logger,
+    shutdown,
+)
@@ -0,0 +1,209 @@
+import atexit
+import json
+import logging
+import queue
+import sys
+import threading
+import time
+import traceback
+from typing import Any, Callable, Dict, List, Optional, TextIO, Tuple
+
+# A queued event: (created, level, logger name, message, args, fields). The
+# writer thread formats it; the caller only builds the tuple.
+Event = Tuple[float, int, str, str, tuple, Dict[str, Any]]
+
+_STANDARD_ATTRIBUTES = frozenset(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+def _event_message(event: Event) -> str:
+    message, args = event[3], event[4]
+    return message % args if args else message
+
+def format_console(event: Event) -> str:
+    """Format a queued event as its message."""
+    return _event_message(event)
+
+def format_json(event: Event) -> str:
+    """Format a queued event as one JSON object, extra fields included."""
+    entry = {
+        "time": event[0],
+        "level": logging.getLevelName(event[1]),
+        "logger": event[2],
+        "message": _event_message(event),
+    }
+    entry.update(event[5])
+    return json.dumps(entry, default=str)
+
+def _record_event(record: logging.LogRecord) -> Event:
+    fields = {name: value for name, value in vars(record).items() if name not in _STANDARD_ATTRIBUTES}
+    return (record.created, record.levelno, record.name, str(record.msg), record.args or (), fields)
+
+class JsonFormatter(logging.Formatter):
+    """Formats every record as one JSON object per line, extra fields included."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        return format_json(_record_event(record))
+
+class BatchingEventWriter:
+    """
+    Drains a queue of events on a background thread and writes them to a
+    stream in batches: one write and one flush for everything that arrived
+    since the last wake-up, instead of one locked write per event. An event
+    that fails to format, or a batch that fails to write, is reported on
+    stderr the way logging.Handler.handleError does and then skipped.
+    """
+
+    _STOP = None
+
+    def __init__(self, records: "queue.SimpleQueue", stream: TextIO,
+                 format_event: Callable[[Event], str] = format_console, batch_size: int = 512,
+                 name: str = "events"):
+        self.records = records
+        self.stream = stream
+        self.format_event = format_event
+        self.batch_size = batch_size
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self.records.put(self._STOP)
+        self._thread.join()
+
+    def _run(self) -> None:
+        format_event = self.format_event
+        running = True
+        while running:
+            batch: List[Event] = [self.records.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self.records.get_nowait())
+                except queue.Empty:
+                    break
+            if self._STOP in batch:
+                running = False
+                batch = [event for event in batch if event is not self._STOP]
+            if not batch:
+                continue
+            lines = []
+            for event in batch:
+                try:
+                    lines.append(format_event(event) + "\n")
+                except Exception:
+                    _report_error(event)
+            try:
+                self.stream.write("".join(lines))
+                self.stream.flush()
+            except Exception:
+                _report_error(None)
+
+def _report_error(event: Optional[Event]) -> None:
+    """Print the current exception and the offending event, like logging.Handler.handleError."""
+    if not logging.raiseExceptions or sys.stderr is None:
+        return
+    try:
+        sys.stderr.write("--- Logging error ---\n")
+        traceback.print_exc(file=sys.stderr)
+        if event is not None:
+            sys.stderr.write(f"Message: {event[3]!r}\nArguments: {event[4]}\n")
+    except OSError:
+        pass
+
+class _EnqueueHandler(logging.Handler):
+    # Records logged through the logger directly, rather than with emit(),
+    # are queued as event tuples too. handle() is overridden so enqueueing
+    # takes no handler lock; the queue is thread-safe on its own. Not a
+    # logging.handlers.QueueHandler, whose import pulls in socket and pickle.
+    def __init__(self, records: "queue.SimpleQueue"):
+        super().__init__()
+        self.records = records
+
+    def handle(self, record: logging.LogRecord) -> bool:
+        self.records.put_nowait(_record_event(record))
+        return True
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.handle(record)
+
+class EventLog:
+    """
+    A logger that code reports events to instead of printing, and the sink
+    attached to it. Nothing is attached by default, so until configure() is
+    called the only cost of an event is the logger.isEnabledFor() check that
+    guards it.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.logger = logging.getLogger(name)
+        self.logger.addHandler(logging.NullHandler())
+        self.logger.setLevel(logging.WARNING)
+        self.logger.propagate = False
+        self._handler: Optional[logging.Handler] = None
+        self._writer: Optional[BatchingEventWriter] = None
+        self._records: Optional["queue.SimpleQueue"] = None
+        self._exit_hook = False
+
+    def emit(self, level: int, message: str, *args, **fields) -> None:
+        """
+        Logs message % args with fields attached. With a background sink the
+        event goes straight onto its queue as a tuple, with no LogRecord and
+        no lock; otherwise a record is built directly, skipping the caller
+        lookup Logger.info() performs. Either way callers guard it with
+        logger.isEnabledFor(level).
+        """
+        records = self._records
+        if records is not None:
+            records.put_nowait((time.time(), level, self.name, message, args, fields))
+            return
+        record = logging.LogRecord(self.name, level, "", 0, message, args, None)
+        record.__dict__.update(fields)
+        self.logger.handle(record)
+
+    def configure(self, level: int = logging.INFO, stream: Optional[TextIO] = None, json_output: bool = False,
+                  background: bool = True, batch_size: int = 512) -> None:
+        """
+        Attaches a sink to the logger. Events go to stream (stdout by default)
+        as plain console lines, or as JSON lines with json_output. With
+        background=True callers only enqueue events and a writer thread
+        formats them and batches the I/O; background=False writes
+        synchronously, keeping events in order with the caller's own prints.
+        A background sink is shut down at interpreter exit, writing out the
+        events still queued.
+        """
+        self.shutdown()
+        stream = stream if stream is not None else sys.stdout
+        if background:
+            records: "queue.SimpleQueue" = queue.SimpleQueue()
+            self._writer = BatchingEventWriter(records, stream, format_json if json_output else format_console,
+                                               batch_size, f"{self.name}-events")
+            self._writer.start()
+            self._handler = _EnqueueHandler(records)
+            self._records = records
+            if not self._exit_hook:
+                atexit.register(self.shutdown)
+                self._exit_hook = True
+        else:
+            self._handler = logging.StreamHandler(stream)
+            self._handler.setFormatter(JsonFormatter() if json_output else logging.Formatter("%(message)s"))
+        self.logger.addHandler(self._handler)
+        self.logger.setLevel(level)
+
+    def shutdown(self) -> None:
+        """Detaches the configured sink, writing out any queued events first."""
+        self._records = None
+        if self._handler is not None:
+            self.logger.removeHandler(self._handler)
+            self._handler.close()
+            self._handler = None
+        if self._writer is not None:
+            self._writer.stop()
+            self._writer = None
+        self.logger.setLevel(logging.WARNING)
+
+# Shipment code reports through this event log.
+_events = EventLog("shipment_system")
+logger = _events.logger
+emit = _events.emit
+configure = _events.configure
+shutdown = _events.shutdown
@@ -1,3 +1,15 @@
-from shipment_system.factories.dhl_factory import DHLFactory
-from shipment_system.factories.fedex_factory import FedExFactory
-from shipment_system.factories.ups_factory import UPSFactory
\ No newline at end of file
+from shipment_system._lazy import lazy_exports
+
+# Factories load with their module on first attribute access, so importing
+# this package does not import every carrier's products.
+_MODULES = {
+    "DHLFactory": "shipment_system.factories.dhl_factory",
+    "FedExFactory": "shipment_system.factories.fedex_factory",
+    "UPSFactory": "shipment_system.factories.ups_factory",
+    "FactoryRegistry": "shipment_system.factories.factory_registry",
+    "default_registry": "shipment_system.factories.factory_registry",
+}
+
+__all__ = list(_MODULES)
+
+__getattr__, __dir__ = lazy_exports(__name__, _MODULES)
\ No newline at end of file
@@ -20,4 +20,11 @@ class DHLFactory(ShipmentFactory):
     
     def offer_insurance(self):
         """DHL-specific method to offer insurance."""
-        return True
\ No newline at end of file
+        return True
+
+def register(registry):
+    """Register the DHL factory and its product options with a ``FactoryRegistry``."""
+    registry.register_factory("DHL", DHLFactory())
+    registry.register_option(DHLAirShipment, "express", DHLAirShipment.set_express_air)
+    registry.register_option(DHLGroundShipment, "route_optimization", DHLGroundShipment.set_route_optimization)
+    registry.register_option(DHLWaterShipment, "container_type", DHLWaterShipment.set_container_type, parse=str)
\ No newline at end of file
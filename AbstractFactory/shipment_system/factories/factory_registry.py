@@ -0,0 +1,189 @@
+from importlib import import_module
+import threading
+
+SHIPMENT_TYPES = ("air", "ground", "water")
+
+_TRUE_VALUES = {"1", "true", "yes", "y", "t"}
+
+def parse_flag(text):
+    """Parse an on/off option written as text, such as "yes" or "0"."""
+    return text.strip().lower() in _TRUE_VALUES
+
+# Built-in carriers, as "module:function" references to a callable that
+# registers the carrier with a registry; the module is only imported when
+# the carrier is first used.
+BUILTIN_CARRIERS = {
+    "DHL": "shipment_system.factories.dhl_factory:register",
+    "FedEx": "shipment_system.factories.fedex_factory:register",
+    "UPS": "shipment_system.factories.ups_factory:register",
+}
+
+class FactoryRegistry:
+    """Registry of shared factories with table-driven shipment dispatch.
+    
+    Factories are stateless, so one instance per carrier is reused for every
+    shipment. Registering a factory precomputes a (carrier, shipment type) ->
+    bound constructor table, and registering an option binds the product's
+    setter once, so creating a shipment costs a couple of dict lookups.
+    
+    Carriers can also be registered lazily with ``register_lazy``: their
+    modules are imported and registered the first time the carrier is asked
+    for, so a process that only ships with one carrier never loads the others.
+    Loading is serialized on a lock, and the carrier's constructors are only
+    published once its loader has registered everything, so threads racing
+    on a carrier's first use wait for it instead of missing it.
+    """
+    
+    def __init__(self):
+        self._factories = {}
+        self._constructors = {}
+        self._options = {}
+        self._option_parsers = {}
+        self._resolved_options = {}
+        self._lazy = {}
+        self._names = {}
+        self._load_lock = threading.RLock()
+        self._pending = None
+    
+    def register_factory(self, name, factory):
+        """Register a factory instance under a carrier name."""
+        key = name.lower()
+        self._factories[key] = factory
+        self._names.setdefault(key)
+        # While a lazy carrier loads, its constructors are held back until
+        # the loader has also registered the options.
+        constructors = self._pending if self._pending is not None else self._constructors
+        for shipment_type in SHIPMENT_TYPES:
+            entry = (getattr(factory, f"create_{shipment_type}_shipment"), factory)
+            constructors[(key, shipment_type)] = entry
+            # Keep the spelling used at registration time as a direct hit too.
+            constructors[(name, shipment_type)] = entry
+    
+    def register_lazy(self, name, loader):
+        """Register a carrier to be loaded on first use.
+        
+        ``loader`` is a callable taking this registry, or a ``"module:function"``
+        reference to one, that registers the carrier's factory and options.
+        """
+        self._lazy[name.lower()] = loader
+        self._names.setdefault(name.lower())
+    
+    def load(self, name):
+        """Load a lazily registered carrier now; does nothing if already loaded.
+        
+        The carrier stays in the lazy table until its loader has finished, so
+        other threads asking for it meanwhile block on the lock in here.
+        """
+        key = name.lower()
+        if key not in self._lazy:
+            return
+        with self._load_lock:
+            loader = self._lazy.get(key)
+            if loader is None:
+                return
+            if isinstance(loader, str):
+                module, _, function = loader.partition(":")
+                loader = getattr(import_module(module), function)
+            outer, self._pending = self._pending, {}
+            try:
+                loader(self)
+                (outer if outer is not None else self._constructors).update(self._pending)
+            finally:
+                self._pending = outer
+            del self._lazy[key]
+    
+    def load_all(self):
+        """Load every lazily registered carrier."""
+        for name in list(self._lazy):
+            self.load(name)
+    
+    def register_option(self, product_class, keyword, setter, parse=parse_flag):
+        """Apply ``setter(shipment, value)`` when ``keyword`` is passed for a product class.
+        
+        ``parse`` turns the option's text form, as read from a CSV manifest,
+        into the value passed to the setter; options are flags by default.
+        """
+        self._options.setdefault(product_class, {})[keyword] = setter
+        self._option_parsers[keyword] = parse
+        self._resolved_options.clear()
+    
+    def get_factory(self, name):
+        """Get the shared factory registered under a carrier name."""
+        key = name.lower()
+        if key in self._lazy:
+            self.load(key)
+        try:
+            return self._factories[key]
+        except KeyError:
+            raise ValueError(f"Unknown factory: {name}") from None
+    
+    def factory_names(self):
+        """Get the names of all registered carriers, loaded or not."""
+        return list(self._names)
+    
+    def option_keywords(self):
+        """Get every option keyword accepted by ``create``, loading every carrier."""
+        self.load_all()
+        return {keyword for options in self._options.values() for keyword in options}
+    
+    def option_parsers(self):
+        """Get the text parser of every option keyword, loading every carrier."""
+        self.load_all()
+        return dict(self._option_parsers)
+    
+    def create(self, factory_name, shipment_type, destination, weight, **kwargs):
+        """Create and configure a shipment and return it with its factory."""
+        entry = self._constructors.get((factory_name, shipment_type))
+        if entry is None:
+            entry = self._resolve(factory_name, shipment_type)
+        constructor, factory = entry
+        shipment = constructor()
+        shipment.set_destination(destination)
+        shipment.set_weight(weight)
+        if kwargs:
+            for keyword, setter in self._product_options(type(shipment)):
+                if keyword in kwargs:
+                    setter(shipment, kwargs[keyword])
+        return shipment, factory
+    
+    def load_plugins(self, group="shipment_system.carriers"):
+        """Let installed packages register carriers through entry points.
+        
+        Each entry point must load a callable taking this registry.
+        """
+        from importlib.metadata import entry_points
+        for entry_point in entry_points(group=group):
+            entry_point.load()(self)
+    
+    def _resolve(self, factory_name, shipment_type):
+        """Find a constructor for names that are not spelled as registered."""
+        key = factory_name.lower()
+        if key in self._lazy:
+            self.load(key)
+            entry = self._constructors.get((factory_name, shipment_type))
+            if entry is not None:
+                return entry
+        if key not in self._factories:
+            raise ValueError(f"Unknown factory: {factory_name}")
+        entry = self._constructors.get((key, shipment_type.lower()))
+        if entry is None:
+            raise ValueError(f"Unknown shipment type: {shipment_type}")
+        return entry
+    
+    def _product_options(self, product_class):
+        """Get the option setters of a product class, including inherited ones."""
+        options = self._resolved_options.get(product_class)
+        if options is None:
+            merged = {}
+            for cls in reversed(product_class.__mro__):
+                merged.update(self._options.get(cls, {}))
+            options = self._resolved_options[product_class] = tuple(merged.items())
+        return options
+
+def _register_defaults(registry):
+    """Register the built-in carriers, to be loaded on first use."""
+    for name, loader in BUILTIN_CARRIERS.items():
+        registry.register_lazy(name, loader)
+
+default_registry = FactoryRegistry()
+_register_defaults(default_registry)
\ No newline at end of file
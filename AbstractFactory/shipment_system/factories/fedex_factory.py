@@ -20,4 +20,11 @@ class FedExFactory(ShipmentFactory):
     
     def priority_routing(self):
         """FedEx-specific method to offer priority routing."""
-        return True
\ No newline at end of file
+        return True
+
+def register(registry):
+    """Register the FedEx factory and its product options with a ``FactoryRegistry``."""
+    registry.register_factory("FedEx", FedExFactory())
+    registry.register_option(FedExAirShipment, "first_class", FedExAirShipment.set_first_class)
+    registry.register_option(FedExGroundShipment, "local", FedExGroundShipment.set_local_delivery)
+    registry.register_option(FedExWaterShipment, "international_shipping", FedExWaterShipment.set_international_shipping)
\ No newline at end of file
@@ -20,4 +20,11 @@ class UPSFactory(ShipmentFactory):
     
     def saturday_delivery(self):
         """UPS-specific method to offer Saturday delivery."""
-        return True
\ No newline at end of file
+        return True
+
+def register(registry):
+    """Register the UPS factory and its product options with a ``FactoryRegistry``."""
+    registry.register_factory("UPS", UPSFactory())
+    registry.register_option(UPSAirShipment, "next_day_air", UPSAirShipment.set_next_day_air)
+    registry.register_option(UPSGroundShipment, "ground_saver", UPSGroundShipment.set_ground_saver)
+    registry.register_option(UPSWaterShipment, "freight_forwarding", UPSWaterShipment.set_freight_forwarding)
\ No newline at end of file
@@ -0,0 +1 @@
+from shipment_system.ingestion.manifest_pipeline import Quote, read_manifest, run_pipeline
\ No newline at end of file
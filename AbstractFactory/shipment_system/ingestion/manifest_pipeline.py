@@ -0,0 +1,202 @@
+import argparse
+import csv
+import io
+import json
+import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import NamedTuple
+from shipment_system.factories.factory_registry import default_registry
+
+MANIFEST_FIELDS = ("carrier", "shipment_type", "destination", "weight")
+QUOTE_FIELDS = ("tracking_number", "cost", "estimated_delivery")
+DEFAULT_CHUNK_SIZE = 10000
+
+class Quote(NamedTuple):
+    """Result of quoting one manifest row."""
+    
+    tracking_number: str
+    cost: float
+    estimated_delivery: str
+
+def manifest_format(path):
+    """Get the manifest format, "csv" or "jsonl", from a file name."""
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".csv":
+        return "csv"
+    if extension in (".jsonl", ".ndjson"):
+        return "jsonl"
+    raise ValueError(f"Unknown manifest format: {path}")
+
+def read_manifest(path, file_format=None):
+    """Yield manifest rows as dicts, one line at a time."""
+    file_format = file_format or manifest_format(path)
+    with open(path, newline="", encoding="utf-8") as manifest:
+        if file_format == "csv":
+            yield from csv.DictReader(manifest)
+        else:
+            for line in manifest:
+                if line.strip():
+                    yield json.loads(line)
+
+def parse_row(row, option_parsers):
+    """Split a manifest row into create_and_configure_shipment arguments.
+    
+    ``option_parsers`` maps option keywords to the parser their carrier
+    registered, applied to values that arrive as text.
+    """
+    options = {}
+    for keyword, parse in option_parsers.items():
+        value = row.get(keyword)
+        if value is None or value == "":
+            continue
+        if isinstance(value, str):
+            value = parse(value)
+        options[keyword] = value
+    return row["carrier"], row["shipment_type"], row.get("destination", ""), float(row["weight"]), options
+
+def quote_chunks(rows, registry=default_registry, chunk_size=DEFAULT_CHUNK_SIZE, cache=None):
+    """Yield lists of quotes for consecutive chunks of manifest rows.
+    
+    A ``QuoteCache`` can be passed to reuse prices of repeated shipments.
+    """
+    option_parsers = registry.option_parsers()
+    create = registry.create
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            return
+        quotes = []
+        for row in chunk:
+            carrier, shipment_type, destination, weight, options = parse_row(row, option_parsers)
+            shipment, _ = create(carrier, shipment_type, destination, weight, **options)
+            if cache is None:
+                quotes.append(Quote(shipment.tracking_number, shipment.calculate_cost(), shipment.get_estimated_delivery_time()))
+            else:
+                cost, estimated_delivery = cache.quote(shipment)
+                quotes.append(Quote(shipment.tracking_number, cost, estimated_delivery))
+        yield quotes
+
+def write_quotes(chunks, output, file_format="csv", header=True):
+    """Write chunks of quotes to an open text file and return the row count."""
+    count = 0
+    if file_format == "csv":
+        writer = csv.writer(output)
+        if header:
+            writer.writerow(QUOTE_FIELDS)
+        for quotes in chunks:
+            writer.writerows(quotes)
+            count += len(quotes)
+    else:
+        for quotes in chunks:
+            output.writelines(json.dumps(quote._asdict()) + "\n" for quote in quotes)
+            count += len(quotes)
+    return count
+
+def run_pipeline(input_path, output_path, chunk_size=DEFAULT_CHUNK_SIZE, workers=1):
+    """Quote every row of a manifest file into an output file.
+    
+    Rows are streamed, so memory use does not grow with the file size. With
+    more than one worker the input is split into byte ranges that are
+    quoted by a process pool and joined back in input order. Byte ranges
+    are cut at line breaks, so CSV fields must not contain newlines.
+    """
+    input_format = manifest_format(input_path)
+    output_format = manifest_format(output_path)
+    if workers > 1:
+        return _run_parallel(input_path, output_path, input_format, output_format, chunk_size, workers)
+    with open(output_path, "w", newline="", encoding="utf-8") as output:
+        return write_quotes(quote_chunks(read_manifest(input_path, input_format), chunk_size=chunk_size), output, output_format)
+
+def split_byte_ranges(path, parts, start=0):
+    """Split a file into about ``parts`` byte ranges that start at line breaks."""
+    size = os.path.getsize(path)
+    step = max(1, (size - start) // parts)
+    bounds = [start]
+    with open(path, "rb") as source:
+        for offset in range(start + step, size, step):
+            if offset <= bounds[-1]:
+                continue
+            source.seek(offset - 1)
+            # Move forward to the first byte after the next line break.
+            source.readline()
+            position = source.tell()
+            if position >= size:
+                break
+            if position > bounds[-1]:
+                bounds.append(position)
+    bounds.append(size)
+    return list(zip(bounds, bounds[1:]))
+
+def _read_range(path, start, end, file_format, fieldnames):
+    """Yield manifest rows whose lines start inside a byte range."""
+    with open(path, "rb") as source:
+        source.seek(start)
+        lines = (line.decode("utf-8") for line in iter(source.readline, b""))
+        lines = _until(source, end, lines)
+        if file_format == "csv":
+            yield from csv.DictReader(lines, fieldnames=fieldnames)
+        else:
+            for line in lines:
+                if line.strip():
+                    yield json.loads(line)
+
+def _until(source, end, lines):
+    """Stop a line iterator once the file position passes ``end``."""
+    for line in lines:
+        yield line
+        if source.tell() >= end:
+            return
+
+def _quote_range(args):
+    """Worker entry point: quote one byte range into its own part file."""
+    input_path, part_path, start, end, input_format, output_format, fieldnames, chunk_size = args
+    rows = _read_range(input_path, start, end, input_format, fieldnames)
+    with open(part_path, "w", newline="", encoding="utf-8") as output:
+        return write_quotes(quote_chunks(rows, chunk_size=chunk_size), output, output_format, header=False)
+
+def _run_parallel(input_path, output_path, input_format, output_format, chunk_size, workers):
+    fieldnames = None
+    start = 0
+    if input_format == "csv":
+        with open(input_path, "rb") as source:
+            header = source.readline()
+            start = source.tell()
+        fieldnames = next(csv.reader([header.decode("utf-8")]))
+    ranges = split_byte_ranges(input_path, workers, start)
+    part_dir = tempfile.mkdtemp(prefix="manifest-", dir=os.path.dirname(os.path.abspath(output_path)))
+    try:
+        part_paths = [os.path.join(part_dir, f"part-{index:05d}") for index in range(len(ranges))]
+        jobs = [
+            (input_path, part_path, range_start, range_end, input_format, output_format, fieldnames, chunk_size)
+            for part_path, (range_start, range_end) in zip(part_paths, ranges)
+        ]
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            count = sum(executor.map(_quote_range, jobs))
+        with open(output_path, "w", newline="", encoding="utf-8") as output:
+            if output_format == "csv":
+                csv.writer(output).writerow(QUOTE_FIELDS)
+            for part_path in part_paths:
+                with open(part_path, newline="", encoding="utf-8") as part:
+                    shutil.copyfileobj(part, output, io.DEFAULT_BUFFER_SIZE * 16)
+        return count
+    finally:
+        shutil.rmtree(part_dir, ignore_errors=True)
+
+def main():
+    """Quote a manifest file from the command line."""
+    parser = argparse.ArgumentParser(description="Quote a CSV or JSON Lines shipment manifest.")
+    parser.add_argument("input", help="manifest file (.csv, .jsonl or .ndjson)")
+    parser.add_argument("output", help="quote file (.csv, .jsonl or .ndjson)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--workers", type=int, default=1)
+    args = parser.parse_args()
+    count = run_pipeline(args.input, args.output, args.chunk_size, args.workers)
+    print(f"Quoted {count} shipments into {args.output}")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
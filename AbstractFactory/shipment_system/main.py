@@ -5,76 +5,67 @@ This script demonstrates the use of the Abstract Factory pattern
 in a shipping system.
 """
 
-from shipment_system.factories import DHLFactory, FedExFactory, UPSFactory
-from shipment_system.products.dhl.dhl_air_shipment import DHLAirShipment
-from shipment_system.products.fedex.fedex_ground_shipment import FedExGroundShipment
-from shipment_system.products.ups.ups_water_shipment import UPSWaterShipment
+import logging
+
+from shipment_system import events, factories
+from shipment_system.factories import default_registry
 
 
 def create_and_configure_shipment(factory_name, shipment_type, destination, weight, **kwargs):
     """Create and configure a shipment based on factory name and shipment type."""
-    # Create the appropriate factory
-    if factory_name.lower() == "dhl":
-        factory = DHLFactory()
-    elif factory_name.lower() == "fedex":
-        factory = FedExFactory()
-    elif factory_name.lower() == "ups":
-        factory = UPSFactory()
-    else:
-        raise ValueError(f"Unknown factory: {factory_name}")
-    
-    # Create the appropriate shipment
-    if shipment_type.lower() == "air":
-        shipment = factory.create_air_shipment()
-    elif shipment_type.lower() == "ground":
-        shipment = factory.create_ground_shipment()
-    elif shipment_type.lower() == "water":
-        shipment = factory.create_water_shipment()
-    else:
-        raise ValueError(f"Unknown shipment type: {shipment_type}")
-    
-    # Configure the shipment
-    shipment.set_destination(destination)
-    shipment.set_weight(weight)
-    
-    # Handle special options based on shipment type
-    # DHL options
-    if isinstance(shipment, DHLAirShipment) and "express" in kwargs:
-        shipment.set_express_air(kwargs["express"])
-    
-    # FedEx options
-    if isinstance(shipment, FedExGroundShipment) and "local" in kwargs:
-        shipment.set_local_delivery(kwargs["local"])
-    
-    # UPS options
-    if isinstance(shipment, UPSWaterShipment) and "freight_forwarding" in kwargs:
-        shipment.set_freight_forwarding(kwargs["freight_forwarding"])
-    
-    return shipment, factory
+    return default_registry.create(factory_name, shipment_type, destination, weight, **kwargs)
+
+
+def shipment_info(shipment, factory):
+    """Collect the fields shown for a shipment and its factory-specific feature."""
+    info = {
+        "shipment_type": shipment.__class__.__name__,
+        "tracking_number": shipment.get_tracking_number(),
+        "destination": shipment.get_destination(),
+        "weight": shipment.get_weight(),
+        "cost": shipment.calculate_cost(),
+        "tracking_status": shipment.track_shipment(),
+        "estimated_delivery": shipment.get_estimated_delivery_time(),
+    }
+    # Checked by method rather than isinstance, which would import every carrier.
+    if hasattr(factory, "offer_insurance"):
+        info["insurance_available"] = factory.offer_insurance()
+    elif hasattr(factory, "priority_routing"):
+        info["priority_routing_available"] = factory.priority_routing()
+    elif hasattr(factory, "saturday_delivery"):
+        info["saturday_delivery_available"] = factory.saturday_delivery()
+    return info
+
+
+_FEATURE_LABELS = {
+    "insurance_available": "Insurance Available",
+    "priority_routing_available": "Priority Routing Available",
+    "saturday_delivery_available": "Saturday Delivery Available",
+}
 
 
 def print_shipment_info(shipment, factory):
-    """Print information about a shipment and its factory."""
-    print(f"\n{'-'*50}")
-    print(f"Shipment Type: {shipment.__class__.__name__}")
-    print(f"Tracking Number: {shipment.get_tracking_number()}")
-    print(f"Destination: {shipment.get_destination()}")
-    print(f"Weight: {shipment.get_weight()} kg")
-    print(f"Cost: ${shipment.calculate_cost():.2f}")
-    print(f"Tracking Status: {shipment.track_shipment()}")
-    print(f"Estimated Delivery: {shipment.get_estimated_delivery_time()}")
-    
-    # Show factory-specific features
-    if isinstance(factory, DHLFactory):
-        print(f"Insurance Available: {factory.offer_insurance()}")
-    elif isinstance(factory, FedExFactory):
-        print(f"Priority Routing Available: {factory.priority_routing()}")
-    elif isinstance(factory, UPSFactory):
-        print(f"Saturday Delivery Available: {factory.saturday_delivery()}")
+    """Report a shipment and its factory as a single shipment.info event."""
+    if not events.logger.isEnabledFor(logging.INFO):
+        return
+    info = shipment_info(shipment, factory)
+    lines = [
+        f"\n{'-'*50}",
+        f"Shipment Type: {info['shipment_type']}",
+        f"Tracking Number: {info['tracking_number']}",
+        f"Destination: {info['destination']}",
+        f"Weight: {info['weight']} kg",
+        f"Cost: ${info['cost']:.2f}",
+        f"Tracking Status: {info['tracking_status']}",
+        f"Estimated Delivery: {info['estimated_delivery']}",
+    ]
+    lines.extend(f"{label}: {info[key]}" for key, label in _FEATURE_LABELS.items() if key in info)
+    events.emit(logging.INFO, "\n".join(lines), event="shipment.info", **info)
 
 
 def main():
     """Main function to demonstrate the shipment system."""
+    events.configure(background=False)
     print("Shipment System Demo")
     print("===================")
     
@@ -93,7 +84,7 @@ def main():
     print("-------------------------------------------------------------")
     
     # Example of client code that works with any factory
-    for factory_class in [DHLFactory, FedExFactory, UPSFactory]:
+    for factory_class in [factories.DHLFactory, factories.FedExFactory, factories.UPSFactory]:
         factory = factory_class()
         
         # Create an air shipment regardless of the factory type
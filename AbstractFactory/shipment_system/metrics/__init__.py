@@ -0,0 +1,11 @@
+from shipment_system.metrics.instrumentation import (
+    Attachment,
+    Counter,
+    Histogram,
+    MetricsRegistry,
+    attach,
+    timed,
+)
+
+# Registry that shipment_system's own helpers and benchmarks report to.
+default_registry = MetricsRegistry("shipment_system")
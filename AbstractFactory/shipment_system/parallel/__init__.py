@@ -0,0 +1 @@
+from shipment_system.parallel.parallel_quoter import ParallelQuoter
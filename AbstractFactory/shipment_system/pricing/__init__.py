@@ -0,0 +1,4 @@
+from shipment_system.pricing.codes import Carrier, Mode
+from shipment_system.pricing.rate_table import RateTable, default_rate_table
+from shipment_system.pricing.batch_rate_engine import BatchRateEngine
+from shipment_system.pricing.quote_cache import QuoteCache, RateQuote
\ No newline at end of file
@@ -0,0 +1,59 @@
+from array import array
+import sys
+from shipment_system.pricing.rate_table import MODE_COUNT, default_rate_table
+
+class BatchRateEngine:
+    """Price many shipments in one pass from columnar input.
+    
+    Each column is a sequence of the same length: carrier codes, mode codes,
+    weights in kg and option flags. Any sequence works, including ``array``
+    objects and NumPy arrays. The result holds exactly the same floats that
+    ``calculate_cost()`` returns for the matching product objects, since both
+    read the same shared ``RateTable``.
+    
+    When any column is a NumPy array the batch is priced with ndarray math
+    and a float64 ndarray is returned; otherwise the columns are walked once
+    in Python and an ``array("d")`` is returned. NumPy is never imported
+    here: an ndarray can only be passed in once the caller has loaded it.
+    """
+    
+    def __init__(self, rate_table=default_rate_table):
+        self.rate_table = rate_table
+    
+    def quote(self, carriers, modes, weights, options):
+        """Calculate the cost of every shipment described by the columns."""
+        if not len(carriers) == len(modes) == len(weights) == len(options):
+            raise ValueError("All columns must have the same length")
+        # Read the entries once so a hot reload never splits a batch.
+        table = self.rate_table.entries
+        numpy = _numpy_for(carriers, modes, weights, options)
+        if numpy is not None:
+            return _quote_ndarray(numpy, table, carriers, modes, weights, options)
+        return array("d", [
+            (rate[0] + (weight * rate[1])) * rate[2]
+            for rate, weight in zip(
+                (table[(c * MODE_COUNT + m) * 2 + (1 if o else 0)]
+                 for c, m, o in zip(carriers, modes, options)),
+                weights,
+            )
+        ])
+    
+    def quote_one(self, carrier, mode, weight, option=False):
+        """Calculate the cost of a single shipment without creating it."""
+        base, per_kg, multiplier = self.rate_table.lookup(carrier, mode, option)
+        return (base + (weight * per_kg)) * multiplier
+
+def _numpy_for(*columns):
+    """Get the numpy module if any column is an ndarray, else None."""
+    numpy = sys.modules.get("numpy")
+    if numpy is not None and any(isinstance(column, numpy.ndarray) for column in columns):
+        return numpy
+    return None
+
+def _quote_ndarray(numpy, table, carriers, modes, weights, options):
+    """Price the columns with elementwise ndarray math, in the same order of operations as ``calculate_cost()``."""
+    rates = numpy.array(table, dtype=numpy.float64)
+    index = (numpy.asarray(carriers, dtype=numpy.intp) * MODE_COUNT + numpy.asarray(modes, dtype=numpy.intp)) * 2
+    index += numpy.asarray(options).astype(bool)
+    rate = rates[index]
+    return (rate[:, 0] + numpy.asarray(weights, dtype=numpy.float64) * rate[:, 1]) * rate[:, 2]
@@ -0,0 +1,28 @@
+from enum import IntEnum
+
+class Carrier(IntEnum):
+    """Numeric carrier codes used by the columnar pricing APIs."""
+    
+    DHL = 0
+    FEDEX = 1
+    UPS = 2
+    
+    @property
+    def label(self):
+        """Get the display name of the carrier."""
+        return _CARRIER_LABELS[self]
+
+class Mode(IntEnum):
+    """Numeric transport mode codes used by the columnar pricing APIs."""
+    
+    AIR = 0
+    GROUND = 1
+    WATER = 2
+    
+    @property
+    def label(self):
+        """Get the display name of the transport mode."""
+        return _MODE_LABELS[self]
+
+_CARRIER_LABELS = ("DHL", "FedEx", "UPS")
+_MODE_LABELS = ("Air", "Ground", "Water")
\ No newline at end of file
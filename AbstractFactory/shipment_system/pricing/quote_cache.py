@@ -0,0 +1,108 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import NamedTuple
+from shipment_system.pricing.rate_table import default_rate_table
+
+class RateQuote(NamedTuple):
+    """Cached price and delivery time for one kind of shipment."""
+    
+    cost: float
+    estimated_delivery: str
+
+class QuoteCache:
+    """Bounded LRU cache of quotes keyed by carrier, mode, weight and option.
+    
+    With the default ``weight_step`` of None the exact weight is part of the
+    key and cached costs equal ``calculate_cost()``. A step such as 0.01
+    prices every weight rounded to that step, which makes far more requests
+    share an entry. Entries older than ``ttl`` seconds are dropped, and the
+    whole cache is cleared when the rate table is reloaded.
+    """
+    
+    def __init__(self, maxsize=100000, ttl=None, weight_step=None, rate_table=default_rate_table, clock=time.monotonic):
+        if maxsize <= 0:
+            raise ValueError(f"Cache size must be positive: {maxsize}")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.weight_step = weight_step
+        self.rate_table = rate_table
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+        self._clock = clock
+        self._entries = OrderedDict()
+        self._rate_version = rate_table.version
+        self._lock = threading.Lock()
+    
+    def __len__(self):
+        return len(self._entries)
+    
+    def key(self, shipment):
+        """Get the canonical cache key of a shipment."""
+        weight = shipment.get_weight()
+        if self.weight_step is not None:
+            weight = round(weight / self.weight_step)
+        return (shipment.carrier, shipment.mode, weight, shipment.has_option())
+    
+    def quote(self, shipment):
+        """Get the cost and delivery time of a shipment, computing them on a miss."""
+        key = self.key(shipment)
+        with self._lock:
+            if self.rate_table.version != self._rate_version:
+                self._invalidate()
+            entry = self._entries.get(key)
+            if entry is not None:
+                quote, expires_at = entry
+                if expires_at is None or expires_at > self._clock():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return quote
+                del self._entries[key]
+                self.expirations += 1
+            self.misses += 1
+            version = self._rate_version
+        quote = RateQuote(self._calculate_cost(key), shipment.get_estimated_delivery_time())
+        expires_at = None if self.ttl is None else self._clock() + self.ttl
+        with self._lock:
+            # A reload while pricing may have mixed old and new rates; return
+            # the quote but don't cache it.
+            if self.rate_table.version != version or self._rate_version != version:
+                return quote
+            self._entries[key] = (quote, expires_at)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return quote
+    
+    def clear(self):
+        """Drop every cached quote."""
+        with self._lock:
+            self._entries.clear()
+    
+    def stats(self):
+        """Get the cache counters."""
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+        }
+    
+    def _calculate_cost(self, key):
+        """Price a cache key straight from the rate table."""
+        carrier, mode, weight, option = key
+        if self.weight_step is not None:
+            weight = weight * self.weight_step
+        base, per_kg, multiplier = self.rate_table.lookup(carrier, mode, option)
+        return (base + (weight * per_kg)) * multiplier
+    
+    def _invalidate(self):
+        """Forget quotes priced with an older version of the rate table."""
+        self._entries.clear()
+        self._rate_version = self.rate_table.version
+        self.invalidations += 1
\ No newline at end of file
@@ -0,0 +1,104 @@
+import json
+import os
+import threading
+from shipment_system.pricing.codes import Carrier, Mode
+
+DEFAULT_RATES_PATH = os.environ.get(
+    "SHIPMENT_RATES_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "rates.json"),
+)
+
+MODE_COUNT = len(Mode)
+
+def rate_index(carrier, mode, option):
+    """Get the position of a (carrier, mode, option) entry in the rate table."""
+    return (carrier * MODE_COUNT + mode) * 2 + (1 if option else 0)
+
+class RateTable:
+    """Rates compiled from a data file into a flat, shared lookup table.
+    
+    The data file maps carrier name -> mode name -> base cost, cost per kg and
+    the multiplier applied when the product option is enabled. Each entry is
+    compiled into a ``(base, per_kg, multiplier)`` tuple stored at
+    ``rate_index(carrier, mode, option)``; entries without the option use a
+    multiplier of 1.0, so ``(base + weight * per_kg) * multiplier`` gives the
+    cost in every case.
+    """
+    
+    def __init__(self, path=DEFAULT_RATES_PATH):
+        self.path = path
+        self.version = 0
+        self.entries = ()
+        self._mtime = None
+        self._lock = threading.Lock()
+        self.reload()
+    
+    def lookup(self, carrier, mode, option=False):
+        """Get the (base, per_kg, multiplier) rate for a carrier, mode and option."""
+        return self.entries[(carrier * MODE_COUNT + mode) * 2 + (1 if option else 0)]
+    
+    def reload(self):
+        """Recompile the table from its data file and bump the version."""
+        with self._lock:
+            mtime = os.stat(self.path).st_mtime_ns
+            with open(self.path, encoding="utf-8") as rates_file:
+                entries = self._compile(json.load(rates_file))
+            # Swapping the whole tuple keeps concurrent lookups consistent.
+            self.entries = entries
+            self._mtime = mtime
+            self.version += 1
+    
+    def reload_if_changed(self):
+        """Reload the table if its data file was modified since the last load."""
+        if os.stat(self.path).st_mtime_ns != self._mtime:
+            self.reload()
+            return True
+        return False
+    
+    def watch(self, interval=5.0):
+        """Start a daemon thread that hot-reloads the table when the file changes."""
+        stop = threading.Event()
+        
+        def poll():
+            while not stop.wait(interval):
+                try:
+                    self.reload_if_changed()
+                except Exception:
+                    # Keep serving the last good table while the file is being
+                    # rewritten or holds a mistake; the next change retries.
+                    pass
+        
+        threading.Thread(target=poll, name="rate-table-watcher", daemon=True).start()
+        return stop
+    
+    @staticmethod
+    def _compile(data):
+        """Build the flat entry tuple from parsed rate data, raising ValueError if it is malformed."""
+        if not isinstance(data, dict):
+            raise ValueError("Rate table must map carriers to shipment types")
+        entries = [None] * (len(Carrier) * MODE_COUNT * 2)
+        carriers = {carrier.label.lower(): carrier for carrier in Carrier}
+        for carrier_name, modes in data.items():
+            carrier = carriers.get(carrier_name.lower())
+            if carrier is None:
+                raise ValueError(f"Unknown carrier in rate table: {carrier_name}")
+            if not isinstance(modes, dict):
+                raise ValueError(f"Rate table entry for {carrier_name} must map shipment types to rates")
+            for mode_name, rate in modes.items():
+                try:
+                    mode = Mode[mode_name.upper()]
+                except KeyError:
+                    raise ValueError(f"Unknown shipment type in rate table: {mode_name}") from None
+                try:
+                    base = float(rate["base"])
+                    per_kg = float(rate["per_kg"])
+                    multiplier = float(rate.get("multiplier", 1.0))
+                except (AttributeError, KeyError, TypeError, ValueError) as error:
+                    raise ValueError(f"Malformed rate for {carrier_name} {mode_name}: {error!r}") from None
+                entries[rate_index(carrier, mode, False)] = (base, per_kg, 1.0)
+                entries[rate_index(carrier, mode, True)] = (base, per_kg, multiplier)
+        if None in entries:
+            raise ValueError("Rate table must define every carrier and shipment type")
+        return tuple(entries)
+
+default_rate_table = RateTable()
\ No newline at end of file
@@ -0,0 +1,41 @@
+from functools import lru_cache
+from importlib import import_module
+from shipment_system.delivery import parse_delivery_time
+from shipment_system.pricing.codes import Carrier, Mode
+
+# Product class of every (carrier, mode), as "module:class" so a carrier's
+# products are only imported once one of them is needed.
+PRODUCT_PATHS = {
+    (Carrier.DHL, Mode.AIR): "shipment_system.products.dhl.dhl_air_shipment:DHLAirShipment",
+    (Carrier.DHL, Mode.GROUND): "shipment_system.products.dhl.dhl_ground_shipment:DHLGroundShipment",
+    (Carrier.DHL, Mode.WATER): "shipment_system.products.dhl.dhl_water_shipment:DHLWaterShipment",
+    (Carrier.FEDEX, Mode.AIR): "shipment_system.products.fedex.fedex_air_shipment:FedExAirShipment",
+    (Carrier.FEDEX, Mode.GROUND): "shipment_system.products.fedex.fedex_ground_shipment:FedExGroundShipment",
+    (Carrier.FEDEX, Mode.WATER): "shipment_system.products.fedex.fedex_water_shipment:FedExWaterShipment",
+    (Carrier.UPS, Mode.AIR): "shipment_system.products.ups.ups_air_shipment:UPSAirShipment",
+    (Carrier.UPS, Mode.GROUND): "shipment_system.products.ups.ups_ground_shipment:UPSGroundShipment",
+    (Carrier.UPS, Mode.WATER): "shipment_system.products.ups.ups_water_shipment:UPSWaterShipment",
+}
+
+@lru_cache(maxsize=None)
+def product_class(carrier, mode):
+    """Get the product class for a carrier and mode code."""
+    module, _, name = PRODUCT_PATHS[(Carrier(carrier), Mode(mode))].partition(":")
+    return getattr(import_module(module), name)
+
+def __getattr__(name):
+    # PRODUCT_CLASSES loads every product; prefer product_class().
+    if name == "PRODUCT_CLASSES":
+        return {key: product_class(*key) for key in PRODUCT_PATHS}
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+@lru_cache(maxsize=None)
+def delivery_time(carrier, mode, option):
+    """Get the delivery time text of a product, asked once per combination."""
+    shipment = product_class(carrier, mode)()
+    shipment.set_option(bool(option))
+    return shipment.get_estimated_delivery_time()
+
+def delivery_window(carrier, mode, option):
+    """Get the delivery window of a product as (min_days, max_days)."""
+    return parse_delivery_time(delivery_time(carrier, mode, option))
\ No newline at end of file
@@ -1,3 +1,12 @@
-from shipment_system.products.dhl.dhl_air_shipment import DHLAirShipment
-from shipment_system.products.dhl.dhl_ground_shipment import DHLGroundShipment
-from shipment_system.products.dhl.dhl_water_shipment import DHLWaterShipment
\ No newline at end of file
+from shipment_system._lazy import lazy_exports
+
+# Product classes load with their module on first attribute access.
+_MODULES = {
+    "DHLAirShipment": "shipment_system.products.dhl.dhl_air_shipment",
+    "DHLGroundShipment": "shipment_system.products.dhl.dhl_ground_shipment",
+    "DHLWaterShipment": "shipment_system.products.dhl.dhl_water_shipment",
+}
+
+__all__ = list(_MODULES)
+
+__getattr__, __dir__ = lazy_exports(__name__, _MODULES)
\ No newline at end of file
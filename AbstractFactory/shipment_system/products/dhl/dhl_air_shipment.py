@@ -1,8 +1,16 @@
 from shipment_system.abstract.shipment import Shipment
+from shipment_system.pricing.codes import Carrier, Mode
+from shipment_system.pricing.rate_table import default_rate_table
 
 class DHLAirShipment(Shipment):
     """DHL Air Shipment implementation."""
     
+    __slots__ = ("express_air",)
+    
+    carrier = Carrier.DHL
+    mode = Mode.AIR
+    option_attribute = "express_air"
+    
     def __init__(self):
         super().__init__()
         self.express_air = False
@@ -13,8 +21,8 @@ class DHLAirShipment(Shipment):
     
     def calculate_cost(self):
         """Calculate the cost of the DHL air shipment."""
-        base_cost = 100.0 + (self.weight * 2.5)
-        return base_cost * 1.5 if self.express_air else base_cost
+        base, per_kg, multiplier = default_rate_table.lookup(self.carrier, self.mode, self.express_air)
+        return (base + (self.weight * per_kg)) * multiplier
     
     def track_shipment(self):
         """Track the DHL air shipment."""
@@ -1,8 +1,16 @@
 from shipment_system.abstract.shipment import Shipment
+from shipment_system.pricing.codes import Carrier, Mode
+from shipment_system.pricing.rate_table import default_rate_table
 
 class DHLGroundShipment(Shipment):
     """DHL Ground Shipment implementation."""
     
+    __slots__ = ("route_optimization",)
+    
+    carrier = Carrier.DHL
+    mode = Mode.GROUND
+    option_attribute = "route_optimization"
+    
     def __init__(self):
         super().__init__()
         self.route_optimization = False
@@ -13,8 +21,8 @@ class DHLGroundShipment(Shipment):
     
     def calculate_cost(self):
         """Calculate the cost of the DHL ground shipment."""
-        base_cost = 50.0 + (self.weight * 1.2)
-        return base_cost * 1.1 if self.route_optimization else base_cost
+        base, per_kg, multiplier = default_rate_table.lookup(self.carrier, self.mode, self.route_optimization)
+        return (base + (self.weight * per_kg)) * multiplier
     
     def track_shipment(self):
         """Track the DHL ground shipment."""
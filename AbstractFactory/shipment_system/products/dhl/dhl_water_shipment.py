@@ -1,8 +1,16 @@
 from shipment_system.abstract.shipment import Shipment
+from shipment_system.pricing.codes import Carrier, Mode
+from shipment_system.pricing.rate_table import default_rate_table
 
 class DHLWaterShipment(Shipment):
     """DHL Water Shipment implementation."""
     
+    __slots__ = ("container_type",)
+    
+    carrier = Carrier.DHL
+    mode = Mode.WATER
+    option_attribute = "container_type"
+    
     def __init__(self):
         super().__init__()
         self.container_type = "Standard"
@@ -11,10 +19,18 @@ class DHLWaterShipment(Shipment):
         """Set the container type for this shipment."""
         self.container_type = container_type
     
+    def has_option(self):
+        """Check whether the shipment uses a Premium container."""
+        return self.container_type == "Premium"
+    
+    def set_option(self, enabled):
+        """Switch between a Premium and a Standard container."""
+        self.container_type = "Premium" if enabled else "Standard"
+    
     def calculate_cost(self):
         """Calculate the cost of the DHL water shipment."""
-        base_cost = 200.0 + (self.weight * 0.8)
-        return base_cost * 1.3 if self.container_type == "Premium" else base_cost
+        base, per_kg, multiplier = default_rate_table.lookup(self.carrier, self.mode, self.container_type == "Premium")
+        return (base + (self.weight * per_kg)) * multiplier
     
     def track_shipment(self):
         """Track the DHL water shipment."""
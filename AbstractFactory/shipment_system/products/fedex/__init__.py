@@ -1,3 +1,12 @@
-from shipment_system.products.fedex.fedex_air_shipment import FedExAirShipment
-from shipment_system.products.fedex.fedex_ground_shipment import FedExGroundShipment
-from shipment_system.products.fedex.fedex_water_shipment import FedExWaterShipment
\ No newline at end of file
+from shipment_system._lazy import lazy_exports
+
+# Product classes load with their module on first attribute access.
+_MODULES = {
+    "FedExAirShipment": "shipment_system.products.fedex.fedex_air_shipment",
+    "FedExGroundShipment": "shipment_system.products.fedex.fedex_ground_shipment",
+    "FedExWaterShipment": "shipment_system.products.fedex.fedex_water_shipment",
+}
+
+__all__ = list(_MODULES)
+
+__getattr__, __dir__ = lazy_exports(__name__, _MODULES)
\ No newline at end of file
@@ -1,8 +1,16 @@
 from shipment_system.abstract.shipment import Shipment
+from shipment_system.pricing.codes import Carrier, Mode
+from shipment_system.pricing.rate_table import default_rate_table
 
 class FedExAirShipment(Shipment):
     """FedEx Air Shipment implementation."""
     
+    __slots__ = ("first_class",)
+    
+    carrier = Carrier.FEDEX
+    mode = Mode.AIR
+    option_attribute = "first_class"
+    
     def __init__(self):
         super().__init__()
         self.first_class = False
@@ -13,8 +21,8 @@ class FedExAirShipment(Shipment):
     
     def calculate_cost(self):
         """Calculate the cost of the FedEx air shipment."""
-        base_cost = 120.0 + (self.weight * 2.8)
-        return base_cost * 1.7 if self.first_class else base_cost
+        base, per_kg, multiplier = default_rate_table.lookup(self.carrier, self.mode, self.first_class)
+        return (base + (self.weight * per_kg)) * multiplier
     
     def track_shipment(self):
         """Track the FedEx air shipment."""
@@ -1,8 +1,16 @@
 from shipment_system.abstract.shipment import Shipment
+from shipment_system.pricing.codes import Carrier, Mode
+from shipment_system.pricing.rate_table import default_rate_table
 
 class FedExGroundShipment(Shipment):
     """FedEx Ground Shipment implementation."""
     
+    __slots__ = ("local_delivery",)
+    
+    carrier = Carrier.FEDEX
+    mode = Mode.GROUND
+    option_attribute = "local_delivery"
+    
     def __init__(self):
         super().__init__()
         self.local_delivery = False
@@ -13,8 +21,8 @@ class FedExGroundShipment(Shipment):
     
     def calculate_cost(self):
         """Calculate the cost of the FedEx ground shipment."""
-        base_cost = 45.0 + (self.weight * 1.1)
-        return base_cost * 0.9 if self.local_delivery else base_cost
+        base, per_kg, multiplier = default_rate_table.lookup(self.carrier, self.mode, self.local_delivery)
+        return (base + (self.weight * per_kg)) * multiplier
     
     def track_shipment(self):
         """Track the FedEx ground shipment."""
@@ -1,8 +1,16 @@
 from shipment_system.abstract.shipment import Shipment
+from shipment_system.pricing.codes import Carrier, Mode
+from shipment_system.pricing.rate_table import default_rate_table
 
 class FedExWaterShipment(Shipment):
     """FedEx Water Shipment implementation."""
     
+    __slots__ = ("international_shipping",)
+    
+    carrier = Carrier.FEDEX
+    mode = Mode.WATER
+    option_attribute = "international_shipping"
+    
     def __init__(self):
         super().__init__()
         self.international_shipping = False
@@ -13,8 +21,8 @@ class FedExWaterShipment(Shipment):
     
     def calculate_cost(self):
         """Calculate the cost of the FedEx water shipment."""
-        base_cost = 180.0 + (self.weight * 0.9)
-        return base_cost * 1.4 if self.international_shipping else base_cost
+        base, per_kg, multiplier = default_rate_table.lookup(self.carrier, self.mode, self.international_shipping)
+        return (base + (self.weight * per_kg)) * multiplier
     
     def track_shipment(self):
         """Track the FedEx water shipment."""
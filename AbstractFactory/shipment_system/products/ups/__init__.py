@@ -1,3 +1,12 @@
-from shipment_system.products.ups.ups_air_shipment import UPSAirShipment
-from shipment_system.products.ups.ups_ground_shipment import UPSGroundShipment
-from shipment_system.products.ups.ups_water_shipment import UPSWaterShipment
\ No newline at end of file
+from shipment_system._lazy import lazy_exports
+
+# Product classes load with their module on first attribute access.
+_MODULES = {
+    "UPSAirShipment": "shipment_system.products.ups.ups_air_shipment",
+    "UPSGroundShipment": "shipment_system.products.ups.ups_ground_shipment",
+    "UPSWaterShipment": "shipment_system.products.ups.ups_water_shipment",
+}
+
+__all__ = list(_MODULES)
+
+__getattr__, __dir__ = lazy_exports(__name__, _MODULES)
\ No newline at end of file
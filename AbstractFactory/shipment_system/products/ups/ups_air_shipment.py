@@ -1,8 +1,16 @@
 from shipment_system.abstract.shipment import Shipment
+from shipment_system.pricing.codes import Carrier, Mode
+from shipment_system.pricing.rate_table import default_rate_table
 
 class UPSAirShipment(Shipment):
     """UPS Air Shipment implementation."""
     
+    __slots__ = ("next_day_air",)
+    
+    carrier = Carrier.UPS
+    mode = Mode.AIR
+    option_attribute = "next_day_air"
+    
     def __init__(self):
         super().__init__()
         self.next_day_air = False
@@ -13,8 +21,8 @@ class UPSAirShipment(Shipment):
     
     def calculate_cost(self):
         """Calculate the cost of the UPS air shipment."""
-        base_cost = 110.0 + (self.weight * 2.6)
-        return base_cost * 1.8 if self.next_day_air else base_cost
+        base, per_kg, multiplier = default_rate_table.lookup(self.carrier, self.mode, self.next_day_air)
+        return (base + (self.weight * per_kg)) * multiplier
     
     def track_shipment(self):
         """Track the UPS air shipment."""
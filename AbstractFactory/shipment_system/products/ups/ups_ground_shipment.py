@@ -1,8 +1,16 @@
 from shipment_system.abstract.shipment import Shipment
+from shipment_system.pricing.codes import Carrier, Mode
+from shipment_system.pricing.rate_table import default_rate_table
 
 class UPSGroundShipment(Shipment):
     """UPS Ground Shipment implementation."""
     
+    __slots__ = ("ground_saver",)
+    
+    carrier = Carrier.UPS
+    mode = Mode.GROUND
+    option_attribute = "ground_saver"
+    
     def __init__(self):
         super().__init__()
         self.ground_saver = False
@@ -13,8 +21,8 @@ class UPSGroundShipment(Shipment):
     
     def calculate_cost(self):
         """Calculate the cost of the UPS ground shipment."""
-        base_cost = 55.0 + (self.weight * 1.3)
-        return base_cost * 0.85 if self.ground_saver else base_cost
+        base, per_kg, multiplier = default_rate_table.lookup(self.carrier, self.mode, self.ground_saver)
+        return (base + (self.weight * per_kg)) * multiplier
     
     def track_shipment(self):
         """Track the UPS ground shipment."""
@@ -1,8 +1,16 @@
 from shipment_system.abstract.shipment import Shipment
+from shipment_system.pricing.codes import Carrier, Mode
+from shipment_system.pricing.rate_table import default_rate_table
 
 class UPSWaterShipment(Shipment):
     """UPS Water Shipment implementation."""
     
+    __slots__ = ("freight_forwarding",)
+    
+    carrier = Carrier.UPS
+    mode = Mode.WATER
+    option_attribute = "freight_forwarding"
+    
     def __init__(self):
         super().__init__()
         self.freight_forwarding = False
@@ -13,8 +21,8 @@ class UPSWaterShipment(Shipment):
     
     def calculate_cost(self):
         """Calculate the cost of the UPS water shipment."""
-        base_cost = 190.0 + (self.weight * 0.85)
-        return base_cost * 1.25 if self.freight_forwarding else base_cost
+        base, per_kg, multiplier = default_rate_table.lookup(self.carrier, self.mode, self.freight_forwarding)
+        return (base + (self.weight * per_kg)) * multiplier
     
     def track_shipment(self):
         """Track the UPS water shipment."""
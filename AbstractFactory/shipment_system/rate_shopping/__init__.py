@@ -0,0 +1 @@
+from shipment_system.rate_shopping.rate_shopper import RateShopper, ShippingChoice, ShippingOption
\ No newline at end of file
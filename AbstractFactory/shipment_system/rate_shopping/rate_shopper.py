@@ -0,0 +1,150 @@
+from array import array
+from bisect import bisect_right
+from typing import NamedTuple
+from shipment_system.pricing.codes import Carrier, Mode
+from shipment_system.pricing.rate_table import default_rate_table
+from shipment_system.products.catalog import delivery_time, delivery_window
+
+class ShippingOption(NamedTuple):
+    """One carrier, mode and option combination that can be bought."""
+    
+    carrier: Carrier
+    mode: Mode
+    option: bool
+    max_days: int
+    estimated_delivery: str
+
+class ShippingChoice(NamedTuple):
+    """A shipping option together with its price for one parcel."""
+    
+    option: ShippingOption
+    cost: float
+
+class RateShopper:
+    """Pick the cheapest or fastest carrier, mode and option for a parcel.
+    
+    Every combination is priced straight from the rate table, so no product
+    objects are created. Costs are linear in the weight, so for a given set
+    of allowed options the cheapest one only changes at a few fixed weights;
+    ``cheapest_batch`` precomputes those breakpoints once and then resolves
+    each parcel with a binary search.
+    """
+    
+    def __init__(self, rate_table=default_rate_table):
+        self.rate_table = rate_table
+        self.options = []
+        self._rates = []
+        self._rate_version = None
+        self._envelopes = {}
+    
+    def cheapest(self, weight, max_days=None, budget=None):
+        """Get the cheapest choice delivered within ``max_days`` and ``budget``."""
+        return self._best(weight, max_days, budget, lambda choice: (choice.cost, choice.option.max_days))
+    
+    def fastest(self, weight, max_days=None, budget=None):
+        """Get the quickest choice within the constraints, cheapest on ties."""
+        return self._best(weight, max_days, budget, lambda choice: (choice.option.max_days, choice.cost))
+    
+    def cheapest_batch(self, weights, max_days=None, budget=None):
+        """Get the cheapest choice for every weight.
+        
+        Returns the chosen ``ShippingOption`` per parcel (None when nothing
+        meets the constraints) and an array of the matching costs (NaN
+        where there is no choice).
+        """
+        self._refresh()
+        breakpoints, segments = self._envelope(max_days)
+        rates = self._rates
+        options = self.options
+        choices = []
+        costs = array("d")
+        for weight in weights:
+            if not segments:
+                choices.append(None)
+                costs.append(float("nan"))
+                continue
+            index = segments[max(bisect_right(breakpoints, weight) - 1, 0)]
+            base, per_kg, multiplier = rates[index]
+            cost = (base + (weight * per_kg)) * multiplier
+            if budget is not None and cost > budget:
+                choices.append(None)
+                costs.append(float("nan"))
+            else:
+                choices.append(options[index])
+                costs.append(cost)
+        return choices, costs
+    
+    def _best(self, weight, max_days, budget, rank):
+        """Price every allowed option in one pass and keep the best one."""
+        self._refresh()
+        best = None
+        best_rank = None
+        for option, (base, per_kg, multiplier) in zip(self.options, self._rates):
+            if max_days is not None and option.max_days > max_days:
+                continue
+            cost = (base + (weight * per_kg)) * multiplier
+            if budget is not None and cost > budget:
+                continue
+            choice = ShippingChoice(option, cost)
+            choice_rank = rank(choice)
+            if best is None or choice_rank < best_rank:
+                best, best_rank = choice, choice_rank
+        return best
+    
+    def _refresh(self):
+        """Rebuild the option list after the rate table was reloaded."""
+        if self._rate_version == self.rate_table.version:
+            return
+        options = []
+        rates = []
+        for carrier in Carrier:
+            for mode in Mode:
+                for option in (False, True):
+                    options.append(ShippingOption(
+                        carrier,
+                        mode,
+                        option,
+                        delivery_window(carrier, mode, option).max_days,
+                        delivery_time(carrier, mode, option),
+                    ))
+                    rates.append(self.rate_table.lookup(carrier, mode, option))
+        self.options = options
+        self._rates = rates
+        self._envelopes = {}
+        self._rate_version = self.rate_table.version
+    
+    def _envelope(self, max_days):
+        """Get the weights where the cheapest allowed option changes.
+        
+        Returns sorted start weights and the option index used from each of
+        them, i.e. the lower envelope of the allowed cost lines over w >= 0.
+        """
+        envelope = self._envelopes.get(max_days)
+        if envelope is not None:
+            return envelope
+        lines = [
+            (base * multiplier, per_kg * multiplier, index)
+            for index, ((base, per_kg, multiplier), option) in enumerate(zip(self._rates, self.options))
+            if max_days is None or option.max_days <= max_days
+        ]
+        breakpoints, segments = [], []
+        if lines:
+            intercept, slope, index = min(lines)
+            start = 0.0
+            while True:
+                breakpoints.append(start)
+                segments.append(index)
+                # Find the first line that drops below the current one.
+                crossing = None
+                for other_intercept, other_slope, other_index in lines:
+                    if other_slope >= slope:
+                        continue
+                    weight = (other_intercept - intercept) / (slope - other_slope)
+                    candidate = (weight, other_slope, other_intercept, other_index)
+                    if weight > start and (crossing is None or candidate < crossing):
+                        crossing = candidate
+                if crossing is None:
+                    break
+                start, slope, intercept, index = crossing
+        envelope = self._envelopes[max_days] = (breakpoints, segments)
+        return envelope
\ No newline at end of file
@@ -0,0 +1 @@
+from shipment_system.storage.shipment_store import ShipmentStore, ShipmentView
\ No newline at end of file
@@ -0,0 +1,184 @@
+from array import array
+from shipment_system.abstract.shipment import Shipment
+from shipment_system.pricing.batch_rate_engine import BatchRateEngine
+from shipment_system.pricing.codes import Carrier, Mode
+from shipment_system.pricing.rate_table import MODE_COUNT, default_rate_table, rate_index
+from shipment_system.delivery import default_calendar
+from shipment_system.products.catalog import delivery_time, delivery_window, product_class
+from shipment_system.tracking import id_allocator
+
+# Bits of the per-shipment flags field.
+FLAG_OPTION = 0x01
+
+class ShipmentStore:
+    """Shipments kept as parallel typed arrays instead of one object each.
+    
+    Every shipment is a row across the columns below, addressed by its index:
+    tracking ids (int64), weights (float64), carrier and mode codes (int8),
+    a flags bitfield (uint8) and destination ids (uint32) into a table of
+    interned destination names. ``view()`` wraps a row in a ``ShipmentView``
+    that implements the ``Shipment`` interface.
+    """
+    
+    def __init__(self, allocator=None):
+        self._allocator = allocator
+        self.tracking_ids = array("q")
+        self.weights = array("d")
+        self.carriers = array("b")
+        self.modes = array("b")
+        self.flags = array("B")
+        self.destination_ids = array("I")
+        self.destinations = []
+        self._destination_index = {}
+    
+    def __len__(self):
+        return len(self.weights)
+    
+    def __iter__(self):
+        for index in range(len(self.weights)):
+            yield ShipmentView(self, index)
+    
+    def add(self, carrier, mode, weight=0.0, destination="", option=False, tracking_id=None):
+        """Add a shipment and return a view of it."""
+        if tracking_id is None:
+            allocator = self._allocator or id_allocator.default_allocator
+            tracking_id = allocator.allocate()
+        index = len(self.weights)
+        self.tracking_ids.append(tracking_id)
+        self.weights.append(weight)
+        self.carriers.append(carrier)
+        self.modes.append(mode)
+        self.flags.append(FLAG_OPTION if option else 0)
+        self.destination_ids.append(self.intern_destination(destination))
+        return ShipmentView(self, index)
+    
+    def add_shipment(self, shipment):
+        """Copy a product object into the store and return a view of it."""
+        return self.add(
+            shipment.carrier,
+            shipment.mode,
+            shipment.get_weight(),
+            shipment.get_destination(),
+            shipment.has_option(),
+            id_allocator.parse_tracking_number(shipment.get_tracking_number()),
+        )
+    
+    def view(self, index):
+        """Get a view of the shipment stored at ``index``."""
+        if not 0 <= index < len(self.weights):
+            raise IndexError(f"Shipment index out of range: {index}")
+        return ShipmentView(self, index)
+    
+    def intern_destination(self, destination):
+        """Get the id of a destination name, adding it to the table if new."""
+        destination_id = self._destination_index.get(destination)
+        if destination_id is None:
+            destination_id = len(self.destinations)
+            self._destination_index[destination] = destination_id
+            self.destinations.append(destination)
+        return destination_id
+    
+    def calculate_costs(self, engine=None):
+        """Calculate the cost of every stored shipment in one batch."""
+        engine = engine or BatchRateEngine()
+        return engine.quote(self.carriers, self.modes, self.weights, [flags & FLAG_OPTION for flags in self.flags])
+    
+    def delivery_days(self):
+        """Get the minimum and maximum delivery days of every stored shipment.
+        
+        Both are plain integer arrays, so shipments can be sorted or filtered
+        by delivery time without touching any text.
+        """
+        windows = [None] * (len(Carrier) * MODE_COUNT * 2)
+        for carrier in Carrier:
+            for mode in Mode:
+                for option in (False, True):
+                    windows[rate_index(carrier, mode, option)] = delivery_window(carrier, mode, option)
+        rows = [
+            windows[(carrier * MODE_COUNT + mode) * 2 + (flags & FLAG_OPTION)]
+            for carrier, mode, flags in zip(self.carriers, self.modes, self.flags)
+        ]
+        return array("H", [window.min_days for window in rows]), array("H", [window.max_days for window in rows])
+
+class ShipmentView:
+    """Lightweight ``Shipment`` backed by one row of a ``ShipmentStore``."""
+    
+    __slots__ = ("_store", "_index")
+    
+    def __init__(self, store, index):
+        self._store = store
+        self._index = index
+    
+    @property
+    def carrier(self):
+        """Get the carrier code of the shipment."""
+        return Carrier(self._store.carriers[self._index])
+    
+    @property
+    def mode(self):
+        """Get the mode code of the shipment."""
+        return Mode(self._store.modes[self._index])
+    
+    def get_tracking_number(self):
+        """Get the shipment tracking number."""
+        return id_allocator.format_tracking_number(self._store.tracking_ids[self._index], self.carrier)
+    
+    def set_weight(self, weight):
+        """Set the shipment weight."""
+        self._store.weights[self._index] = weight
+    
+    def get_weight(self):
+        """Get the shipment weight."""
+        return self._store.weights[self._index]
+    
+    def set_destination(self, destination):
+        """Set the shipment destination."""
+        self._store.destination_ids[self._index] = self._store.intern_destination(destination)
+    
+    def get_destination(self):
+        """Get the shipment destination."""
+        return self._store.destinations[self._store.destination_ids[self._index]]
+    
+    def has_option(self):
+        """Check whether the carrier-specific option is enabled."""
+        return bool(self._store.flags[self._index] & FLAG_OPTION)
+    
+    def set_option(self, enabled):
+        """Enable or disable the carrier-specific option."""
+        flags = self._store.flags[self._index]
+        self._store.flags[self._index] = flags | FLAG_OPTION if enabled else flags & ~FLAG_OPTION
+    
+    def calculate_cost(self):
+        """Calculate the cost of the shipment."""
+        store, index = self._store, self._index
+        base, per_kg, multiplier = default_rate_table.lookup(
+            store.carriers[index], store.modes[index], store.flags[index] & FLAG_OPTION
+        )
+        return (base + (store.weights[index] * per_kg)) * multiplier
+    
+    def track_shipment(self):
+        """Track the current status of the shipment."""
+        return f"Tracking {self.carrier.label} {self.mode.label} shipment {self.get_tracking_number()}"
+    
+    def get_estimated_delivery_time(self):
+        """Get the estimated delivery time for the shipment."""
+        return delivery_time(self._store.carriers[self._index], self._store.modes[self._index], self.has_option())
+    
+    def get_delivery_window(self):
+        """Get the estimated delivery time as a (min_days, max_days) window."""
+        return delivery_window(self._store.carriers[self._index], self._store.modes[self._index], self.has_option())
+    
+    def get_delivery_dates(self, shipped_on=None, calendar=None):
+        """Get the earliest and latest delivery dates for a shipping date."""
+        return (calendar or default_calendar).delivery_dates(self.get_delivery_window(), shipped_on)
+    
+    def to_shipment(self):
+        """Build a full product object with the same data."""
+        shipment = product_class(self.carrier, self.mode)()
+        shipment.tracking_number = self.get_tracking_number()
+        shipment.set_weight(self.get_weight())
+        shipment.set_destination(self.get_destination())
+        shipment.set_option(self.has_option())
+        return shipment
+
+Shipment.register(ShipmentView)
\ No newline at end of file
@@ -0,0 +1,19 @@
+from shipment_system._lazy import lazy_exports
+from shipment_system.tracking.id_allocator import (
+    IdAllocator,
+    TimeOrderedIdAllocator,
+    format_tracking_number,
+    parse_tracking_number,
+    set_default_allocator,
+)
+
+# Every shipment imports id_allocator through this package; the tracking
+# index is only loaded when one of its names is first used.
+_LAZY = {
+    "TrackingEvent": "shipment_system.tracking.tracking_index",
+    "TrackingIndex": "shipment_system.tracking.tracking_index",
+    "TrackingRecord": "shipment_system.tracking.tracking_index",
+    "TrackingStatus": "shipment_system.tracking.tracking_index",
+}
+
+__getattr__, __dir__ = lazy_exports(__name__, _LAZY)
\ No newline at end of file
@@ -0,0 +1,241 @@
+from abc import ABC, abstractmethod
+import atexit
+import os
+import tempfile
+import threading
+import time
+import weakref
+
+if os.name == "nt":
+    import msvcrt
+else:
+    import fcntl
+
+# Tracking ids are 63-bit integers laid out as
+#   41 bits: milliseconds since ID_EPOCH_MS (about 69 years of range)
+#   10 bits: node id, unique per live process
+#   12 bits: sequence within the millisecond slot
+# so they sort by creation time and never collide between nodes.
+ID_EPOCH_MS = 1735689600000  # 2025-01-01T00:00:00Z
+NODE_BITS = 10
+SEQUENCE_BITS = 12
+MAX_NODE_ID = (1 << NODE_BITS) - 1
+BLOCK_SIZE = 1 << SEQUENCE_BITS
+# How many milliseconds slots may be borrowed ahead of the clock before a
+# reservation waits for it to catch up.
+MAX_LEAD_MS = 2
+
+def _user_suffix():
+    """Get the current user's uid, or name where there are no uids."""
+    if hasattr(os, "getuid"):
+        return str(os.getuid())
+    import getpass
+    return getpass.getuser()
+
+# Node files live in a per-user directory so another user's files never get
+# in the way. Processes of different users on one host only get disjoint node
+# ids if SHIPMENT_NODE_DIR points them at a directory they can all write; each
+# user then skips the node files the others created.
+DEFAULT_NODE_DIR = os.environ.get(
+    "SHIPMENT_NODE_DIR",
+    os.path.join(tempfile.gettempdir(), f"shipment_system-nodes-{_user_suffix()}"),
+)
+
+class IdAllocator(ABC):
+    """Abstract base class for tracking id allocators."""
+    
+    @abstractmethod
+    def allocate(self):
+        """Allocate one unique integer id."""
+        pass
+    
+    def allocate_many(self, count):
+        """Allocate ``count`` unique integer ids."""
+        return [self.allocate() for _ in range(count)]
+
+class _Block(threading.local):
+    """Per-thread window of reserved ids: ``next`` up to, excluding, ``end``."""
+    
+    next = 0
+    end = 0
+
+class TimeOrderedIdAllocator(IdAllocator):
+    """Time-ordered id allocator handing out ids in per-thread blocks.
+    
+    A thread reserves a whole millisecond slot of ``BLOCK_SIZE`` ids under a
+    short lock and then allocates from it without any locking. When the clock
+    has not advanced since the previous reservation the next slot is borrowed
+    from the future, so ids stay unique and increasing under bursts. The lead
+    over the clock is capped at ``max_lead_ms``: a burst that gets further
+    ahead waits for the clock, so a later process reusing the node id cannot
+    start inside a range that was already handed out.
+    
+    Without an explicit ``node_id`` a free one is reserved through a locked
+    node file in ``node_dir`` on first use, and re-reserved in forked
+    children, which keeps worker processes on disjoint id ranges. The last
+    slot used is written to the node file on exit and the next owner of the
+    node id resumes after it.
+    """
+    
+    def __init__(self, node_id=None, node_dir=DEFAULT_NODE_DIR, clock=time.time, max_lead_ms=MAX_LEAD_MS):
+        if node_id is not None and not 0 <= node_id <= MAX_NODE_ID:
+            raise ValueError(f"Node id must be between 0 and {MAX_NODE_ID}: {node_id}")
+        self._node_id = node_id
+        self._reserved = node_id is None
+        self._node_dir = node_dir
+        self._clock = clock
+        self._max_lead_ms = max_lead_ms
+        self._last_slot = 0
+        self._lock = threading.Lock()
+        self._block = _Block()
+        _allocators.add(self)
+    
+    @property
+    def node_id(self):
+        """Get the node id, reserving one if none was assigned yet."""
+        if self._node_id is None:
+            with self._lock:
+                if self._node_id is None:
+                    node_id, fd, last_slot = _claim_node(self._node_dir)
+                    self._last_slot = max(self._last_slot, last_slot)
+                    atexit.register(_release_node, fd, os.getpid(), self)
+                    self._node_id = node_id
+        return self._node_id
+    
+    def allocate(self):
+        """Allocate one unique, time-ordered id."""
+        block = self._block
+        value = block.next
+        if value >= block.end:
+            value = self._reserve_block(block)
+        block.next = value + 1
+        return value
+    
+    def allocate_many(self, count):
+        """Allocate ``count`` unique ids, taking whole blocks where possible."""
+        ids = []
+        block = self._block
+        while count > 0:
+            if block.next >= block.end:
+                block.next = self._reserve_block(block)
+            take = min(count, block.end - block.next)
+            ids.extend(range(block.next, block.next + take))
+            block.next += take
+            count -= take
+        return ids
+    
+    def _reserve_block(self, block):
+        """Reserve the next millisecond slot for the calling thread."""
+        node_id = self.node_id
+        with self._lock:
+            now = int(self._clock() * 1000) - ID_EPOCH_MS
+            slot = now if now > self._last_slot else self._last_slot + 1
+            while slot - now > self._max_lead_ms:
+                time.sleep((slot - now - self._max_lead_ms) / 1000)
+                now = int(self._clock() * 1000) - ID_EPOCH_MS
+            self._last_slot = slot
+        start = (slot << (NODE_BITS + SEQUENCE_BITS)) | (node_id << SEQUENCE_BITS)
+        block.end = start + BLOCK_SIZE
+        return start
+    
+    def _after_fork(self):
+        """Drop state inherited from the parent process."""
+        self._lock = threading.Lock()
+        self._block = _Block()
+        if self._reserved:
+            self._node_id = None
+
+def reserve_node_id(node_dir=DEFAULT_NODE_DIR):
+    """Reserve a node id no other live process holds, using locked node files.
+    
+    The node stays reserved until this process exits.
+    """
+    node_id, fd, _ = _claim_node(node_dir)
+    atexit.register(_release_node, fd, os.getpid(), None)
+    return node_id
+
+def _claim_node(node_dir):
+    """Lock the first free node file and get its id, descriptor and last slot.
+    
+    Node files are never removed; the advisory lock on the open file is what
+    marks a node as taken, and the operating system drops it when the owning
+    process exits, however it exits.
+    """
+    os.makedirs(node_dir, exist_ok=True)
+    for node_id in range(MAX_NODE_ID + 1):
+        path = os.path.join(node_dir, f"node-{node_id}.lock")
+        try:
+            fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        except PermissionError:
+            # Another user's node file in a shared directory; leave its id to them.
+            continue
+        if not _try_lock(fd):
+            os.close(fd)
+            continue
+        try:
+            last_slot = int(os.read(fd, 32) or 0)
+        except ValueError:
+            last_slot = 0
+        _held_nodes.append(fd)
+        return node_id, fd, last_slot
+    raise RuntimeError(f"All {MAX_NODE_ID + 1} node ids are in use in {node_dir}")
+
+def _try_lock(fd):
+    """Take an exclusive, non-blocking lock on a node file."""
+    try:
+        if os.name == "nt":
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+        else:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        return False
+    return True
+
+def _release_node(fd, pid, allocator):
+    """Record the last slot used in a node file owned by this process."""
+    if os.getpid() != pid or fd not in _held_nodes:
+        return
+    if allocator is not None:
+        try:
+            os.ftruncate(fd, 0)
+            os.lseek(fd, 0, os.SEEK_SET)
+            os.write(fd, str(allocator._last_slot).encode())
+        except OSError:
+            pass
+    _held_nodes.remove(fd)
+    os.close(fd)
+
+def format_tracking_number(value, carrier=None):
+    """Format an integer id as a tracking number with an optional carrier prefix."""
+    if carrier is None:
+        return f"TRK-{value:016X}"
+    return f"TRK-{carrier.label.upper()}-{value:016X}"
+
+def parse_tracking_number(tracking_number):
+    """Get the integer id back from a tracking number."""
+    return int(tracking_number.rsplit("-", 1)[-1], 16)
+
+_allocators = weakref.WeakSet()
+_held_nodes = []
+
+def _reset_after_fork():
+    # The child's copies of the parent's node files share the parent's
+    # locks; close them so the nodes are freed when the parent exits.
+    for fd in _held_nodes:
+        try:
+            os.close(fd)
+        except OSError:
+            pass
+    _held_nodes.clear()
+    for allocator in list(_allocators):
+        allocator._after_fork()
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+default_allocator = TimeOrderedIdAllocator()
+
+def set_default_allocator(allocator):
+    """Replace the allocator used for new shipments."""
+    global default_allocator
+    default_allocator = allocator
\ No newline at end of file
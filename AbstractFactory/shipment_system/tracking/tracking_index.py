@@ -0,0 +1,401 @@
+from array import array
+from enum import IntEnum
+import mmap
+import os
+import struct
+import threading
+import time
+from typing import NamedTuple
+from shipment_system.pricing.codes import Carrier, Mode
+from shipment_system.tracking.id_allocator import format_tracking_number, parse_tracking_number
+
+class TrackingStatus(IntEnum):
+    """Shipment status codes, stored as one byte per shipment and event."""
+    
+    CREATED = 0
+    PICKED_UP = 1
+    IN_TRANSIT = 2
+    OUT_FOR_DELIVERY = 3
+    DELIVERED = 4
+    EXCEPTION = 5
+    RETURNED = 6
+    
+    @property
+    def label(self):
+        return self.name.replace("_", " ").title()
+
+# Code to member, indexed instead of calling the enum on every read.
+_CARRIERS = tuple(Carrier)
+_MODES = tuple(Mode)
+_STATUSES = tuple(TrackingStatus)
+
+class TrackingRecord(NamedTuple):
+    tracking_number: str
+    carrier: Carrier
+    mode: Mode
+    weight: float
+    destination: str
+    status: TrackingStatus
+    updated_ms: int
+
+class TrackingEvent(NamedTuple):
+    timestamp_ms: int
+    status: TrackingStatus
+
+# Snapshot layout: a header, then every column below back to back, each
+# padded to 8 bytes. "table" is an open-addressing hash table of row + 1
+# (0 marks an empty slot) keyed by tracking id, so a snapshot is searchable
+# as soon as it is mapped, without building a dict.
+_MAGIC = b"SHPTRK01"
+_HEADER = struct.Struct("<8sqqqqq")
+_ROW_COLUMNS = (
+    ("tracking_ids", "q"),
+    ("weights", "d"),
+    ("updated", "q"),
+    ("last_event", "q"),
+    ("destination_ids", "I"),
+    ("carriers", "b"),
+    ("modes", "b"),
+    ("statuses", "B"),
+)
+_EVENT_COLUMNS = (
+    ("event_times", "q"),
+    ("event_previous", "q"),
+    ("event_statuses", "B"),
+)
+# Columns that change on status updates; they are copied out of the
+# snapshot on open, the rest stay mapped read-only.
+_MUTABLE_COLUMNS = ("updated", "last_event", "statuses")
+_HASH_MULTIPLIER = 0x9E3779B97F4A7C15
+_MASK64 = (1 << 64) - 1
+
+def _padded(size):
+    return (size + 7) & ~7
+
+def _table_bits(count):
+    bits = 4
+    while (1 << bits) < 2 * count:
+        bits += 1
+    return bits
+
+def _now_ms():
+    return time.time_ns() // 1_000_000
+
+class TrackingIndex:
+    """Tracking number to shipment record and status timeline, for all carriers.
+    
+    Each shipment is a row across typed columns (tracking id, weight, carrier,
+    mode, interned destination, current status, last update) and its status
+    history is a linked list through an append-only event log, so a record
+    costs a few dozen bytes and no Python objects.
+    
+    ``save()`` writes the index to a snapshot file that ``open()`` maps back
+    in: the hash table and the read-only columns are used straight from the
+    mapping and only the status columns are copied, so opening takes
+    milliseconds even for tens of millions of shipments. Rows and events added
+    after opening live in in-memory overlay arrays next to the mapped ones.
+    
+    Lookups take no lock; writers serialize on one lock.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._mmap = None
+        self._base_rows = 0
+        self._base_events = 0
+        self._table = None
+        self._table_mask = 0
+        self._table_shift = 64
+        self._overlay_rows = {}
+        self.destinations = []
+        self._destination_index = {}
+        for name, typecode in _ROW_COLUMNS + _EVENT_COLUMNS:
+            setattr(self, "_" + name, array(typecode))
+        self._base = {}
+    
+    @classmethod
+    def open(cls, path):
+        """Open a snapshot written by ``save()``."""
+        index = cls()
+        with open(path, "rb") as f:
+            index._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(index._mmap)
+        magic, rows, events, table_bits, destination_count, destination_bytes = _HEADER.unpack_from(view)
+        if magic != _MAGIC:
+            view.release()
+            index.close()
+            raise ValueError(f"Not a tracking index snapshot: {path}")
+        offset = _padded(_HEADER.size)
+        
+        def take(typecode, count):
+            nonlocal offset
+            size = count * array(typecode).itemsize
+            column = view[offset:offset + size].cast(typecode)
+            offset += _padded(size)
+            return column
+        
+        for name, typecode in _ROW_COLUMNS:
+            index._base[name] = take(typecode, rows)
+        index._table = take("q", 1 << table_bits)
+        for name, typecode in _EVENT_COLUMNS:
+            index._base[name] = take(typecode, events)
+        destination_offsets = take("q", destination_count + 1)
+        encoded = take("B", destination_bytes)
+        names = bytes(encoded).decode("utf-8")
+        index.destinations = [
+            names[destination_offsets[i]:destination_offsets[i + 1]] for i in range(destination_count)
+        ]
+        destination_offsets.release()
+        encoded.release()
+        index._destination_index = {name: i for i, name in enumerate(index.destinations)}
+        index._base_rows = rows
+        index._base_events = events
+        index._table_mask = (1 << table_bits) - 1
+        index._table_shift = 64 - table_bits
+        for name in _MUTABLE_COLUMNS:
+            column = index._base.pop(name)
+            getattr(index, "_" + name).frombytes(column.cast("B"))
+            column.release()
+        view.release()
+        return index
+    
+    def close(self):
+        """Unmap the snapshot, if any; the index must not be used afterwards."""
+        for column in self._base.values():
+            column.release()
+        self._base = {}
+        if self._table is not None:
+            self._table.release()
+            self._table = None
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+    
+    def __len__(self):
+        return len(self._statuses)
+    
+    def __contains__(self, tracking):
+        return self._row(tracking) is not None
+    
+    # Row and event columns span the mapped snapshot, then the overlay.
+    
+    def _column(self, name, position):
+        if position < (self._base_events if name.startswith("event") else self._base_rows):
+            return self._base[name][position]
+        base = self._base_events if name.startswith("event") else self._base_rows
+        return getattr(self, "_" + name)[position - base]
+    
+    def _row(self, tracking):
+        if isinstance(tracking, str):
+            try:
+                tracking_id = parse_tracking_number(tracking)
+            except ValueError:
+                # A malformed tracking number is simply not in the index.
+                return None
+        else:
+            tracking_id = tracking
+        row = self._overlay_rows.get(tracking_id)
+        if row is not None or self._table is None:
+            return row
+        table = self._table
+        tracking_ids = self._base["tracking_ids"]
+        mask = self._table_mask
+        slot = ((tracking_id * _HASH_MULTIPLIER) & _MASK64) >> self._table_shift
+        while True:
+            entry = table[slot]
+            if entry == 0:
+                return None
+            if tracking_ids[entry - 1] == tracking_id:
+                return entry - 1
+            slot = (slot + 1) & mask
+    
+    def intern_destination(self, destination):
+        destination_id = self._destination_index.get(destination)
+        if destination_id is None:
+            destination_id = len(self.destinations)
+            self._destination_index[destination] = destination_id
+            self.destinations.append(destination)
+        return destination_id
+    
+    def _append_event(self, row, status, timestamp_ms):
+        position = self._base_events + len(self._event_times)
+        self._event_times.append(timestamp_ms)
+        self._event_previous.append(self._last_event[row])
+        self._event_statuses.append(status)
+        self._last_event[row] = position
+        self._statuses[row] = status
+        self._updated[row] = timestamp_ms
+    
+    # Writes
+    
+    def add(self, tracking_id, carrier, mode, weight=0.0, destination="",
+            status=TrackingStatus.CREATED, timestamp_ms=None):
+        """Index a shipment; returns False if the tracking id is already indexed."""
+        timestamp_ms = _now_ms() if timestamp_ms is None else timestamp_ms
+        with self._lock:
+            if self._row(tracking_id) is not None:
+                return False
+            row = self._base_rows + len(self._tracking_ids)
+            self._tracking_ids.append(tracking_id)
+            self._weights.append(weight)
+            self._destination_ids.append(self.intern_destination(destination))
+            self._carriers.append(carrier)
+            self._modes.append(mode)
+            self._statuses.append(status)
+            self._updated.append(timestamp_ms)
+            self._last_event.append(-1)
+            self._overlay_rows[tracking_id] = row
+            self._append_event(row, status, timestamp_ms)
+            return True
+    
+    def add_shipment(self, shipment, status=TrackingStatus.CREATED, timestamp_ms=None):
+        """Index a product object or ``ShipmentView``."""
+        return self.add(
+            parse_tracking_number(shipment.get_tracking_number()),
+            shipment.carrier,
+            shipment.mode,
+            shipment.get_weight(),
+            shipment.get_destination(),
+            status,
+            timestamp_ms,
+        )
+    
+    def add_store(self, store, status=TrackingStatus.CREATED, timestamp_ms=None):
+        """Index every shipment of a ``ShipmentStore``; returns how many were new."""
+        timestamp_ms = _now_ms() if timestamp_ms is None else timestamp_ms
+        destinations = store.destinations
+        added = 0
+        for tracking_id, carrier, mode, weight, destination_id in zip(
+                store.tracking_ids, store.carriers, store.modes, store.weights, store.destination_ids):
+            added += self.add(tracking_id, carrier, mode, weight, destinations[destination_id], status, timestamp_ms)
+        return added
+    
+    def update_status(self, tracking, status, timestamp_ms=None):
+        """Record a status change; returns False for an unknown tracking number."""
+        timestamp_ms = _now_ms() if timestamp_ms is None else timestamp_ms
+        with self._lock:
+            row = self._row(tracking)
+            if row is None:
+                return False
+            self._append_event(row, status, timestamp_ms)
+            return True
+    
+    def update_many(self, trackings, statuses, timestamp_ms=None):
+        """Record status changes for many shipments under one lock acquisition.
+        
+        ``statuses`` is one status for all of them or one per tracking number.
+        Returns how many tracking numbers were known.
+        """
+        timestamp_ms = _now_ms() if timestamp_ms is None else timestamp_ms
+        if isinstance(statuses, int):
+            statuses = [statuses] * len(trackings)
+        elif len(statuses) != len(trackings):
+            raise ValueError("Tracking numbers and statuses must have the same length")
+        updated = 0
+        with self._lock:
+            for tracking, status in zip(trackings, statuses):
+                row = self._row(tracking)
+                if row is not None:
+                    self._append_event(row, status, timestamp_ms)
+                    updated += 1
+        return updated
+    
+    # Reads
+    
+    def _record(self, row):
+        column = self._column
+        carrier = _CARRIERS[column("carriers", row)]
+        tracking_id = column("tracking_ids", row)
+        return TrackingRecord(
+            format_tracking_number(tracking_id, carrier),
+            carrier,
+            _MODES[column("modes", row)],
+            column("weights", row),
+            self.destinations[column("destination_ids", row)],
+            _STATUSES[self._statuses[row]],
+            self._updated[row],
+        )
+    
+    def get(self, tracking):
+        """Get the record of a tracking number (string or integer id), or None."""
+        row = self._row(tracking)
+        return self._record(row) if row is not None else None
+    
+    def get_many(self, trackings):
+        """Get the records of many tracking numbers, None for unknown ones."""
+        row_of = self._row
+        record = self._record
+        return [None if row is None else record(row) for row in map(row_of, trackings)]
+    
+    def status(self, tracking):
+        """Get the current status of a tracking number, or None."""
+        row = self._row(tracking)
+        return _STATUSES[self._statuses[row]] if row is not None else None
+    
+    def timeline(self, tracking):
+        """Get the status history of a tracking number, oldest first."""
+        row = self._row(tracking)
+        if row is None:
+            return []
+        events = []
+        position = self._last_event[row]
+        while position >= 0:
+            events.append(TrackingEvent(
+                self._column("event_times", position), _STATUSES[self._column("event_statuses", position)]
+            ))
+            position = self._column("event_previous", position)
+        events.reverse()
+        return events
+    
+    # Snapshots
+    
+    def save(self, path):
+        """Write a snapshot of the whole index, replacing ``path`` atomically."""
+        with self._lock:
+            rows = len(self)
+            table_bits = _table_bits(rows)
+            table = array("q", bytes(8 << table_bits))
+            mask = (1 << table_bits) - 1
+            shift = 64 - table_bits
+            tracking_ids = self._merged("tracking_ids", "q")
+            for row, tracking_id in enumerate(tracking_ids):
+                slot = ((tracking_id * _HASH_MULTIPLIER) & _MASK64) >> shift
+                while table[slot]:
+                    slot = (slot + 1) & mask
+                table[slot] = row + 1
+            # Offsets are in characters of the decoded names, as open() slices the decoded string.
+            destination_offsets = array("q", [0])
+            for name in self.destinations:
+                destination_offsets.append(destination_offsets[-1] + len(name))
+            names = "".join(self.destinations).encode("utf-8")
+            
+            columns = [self._merged(name, typecode) for name, typecode in _ROW_COLUMNS]
+            columns[0] = tracking_ids
+            columns.append(table)
+            columns.extend(self._merged(name, typecode) for name, typecode in _EVENT_COLUMNS)
+            columns.append(destination_offsets)
+            columns.append(array("B", names))
+            
+            temporary = f"{path}.{os.getpid()}.tmp"
+            with open(temporary, "wb") as f:
+                header = _HEADER.pack(
+                    _MAGIC, rows, len(self._event_statuses) + self._base_events, table_bits,
+                    len(self.destinations), len(names),
+                )
+                f.write(header + bytes(_padded(len(header)) - len(header)))
+                for column in columns:
+                    size = len(column) * column.itemsize
+                    column.tofile(f)
+                    f.write(bytes(_padded(size) - size))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temporary, path)
+    
+    def _merged(self, name, typecode):
+        if name in _MUTABLE_COLUMNS:
+            return getattr(self, "_" + name)
+        merged = array(typecode)
+        if name in self._base:
+            merged.frombytes(self._base[name].cast("B"))
+        merged.extend(getattr(self, "_" + name))
+        return merged
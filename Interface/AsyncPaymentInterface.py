@@ -0,0 +1,175 @@
+import asyncio
+import random
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Union
+
+from PaymentInterface import PaymentDetails, PaymentStatus, transaction_ids
+
+class AsyncPayment(ABC):
+    @abstractmethod
+    async def process_payment(self, amount: float, currency: str = "USD") -> PaymentDetails:
+        """
+        Process a payment with the specified amount and currency without blocking the event loop.
+        Args:
+            amount: The amount to process
+            currency: The currency code (default: USD)
+        Returns:
+            PaymentDetails: Details of the processed payment
+        """
+        pass
+
+    @abstractmethod
+    async def refund(self, transaction_id: str) -> bool:
+        """
+        Refund a specific transaction.
+        Args:
+            transaction_id: The ID of the transaction to refund
+        Returns:
+            bool: True if refund was successful, False otherwise
+        """
+        pass
+
+    @abstractmethod
+    async def get_status(self, transaction_id: str) -> PaymentStatus:
+        """
+        Get the status of a transaction.
+        Args:
+            transaction_id: The transaction ID to check
+        Returns:
+            PaymentStatus: The current status of the transaction
+        """
+        pass
+
+    @abstractmethod
+    def validate_payment(self, amount: float) -> bool:
+        """
+        Validate if a payment amount is valid for this payment method.
+        Validation is local, so it stays synchronous.
+        Args:
+            amount: The amount to validate
+        Returns:
+            bool: True if the amount is valid, False otherwise
+        """
+        pass
+
+class AsyncPaymentProcessor:
+    """
+    Runs payments against an AsyncPayment provider on one event loop.
+    At most max_concurrency gateway calls are in flight for the provider at a
+    time, and each call is cancelled after timeout seconds (None = no limit).
+    """
+
+    def __init__(self, payment_provider: AsyncPayment, max_concurrency: int = 100, timeout: Optional[float] = None):
+        if max_concurrency <= 0:
+            raise ValueError(f"Invalid concurrency limit: {max_concurrency}")
+        self.payment_provider = payment_provider
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self._slots = asyncio.Semaphore(max_concurrency)
+
+    async def process_transaction(self, amount: float, currency: str = "USD") -> PaymentDetails:
+        if not self.payment_provider.validate_payment(amount):
+            raise ValueError(f"Invalid payment amount: {amount}")
+
+        return await self._call(self.payment_provider.process_payment(amount, currency))
+
+    async def process_batch(
+        self, amounts: Sequence[float], currencies: Optional[Sequence[str]] = None
+    ) -> List[Union[PaymentDetails, Exception]]:
+        """
+        Submit many payments at once and wait for all of them.
+        Args:
+            amounts: The amounts to process
+            currencies: One currency per amount (default: USD for all)
+        Returns:
+            List: PaymentDetails, or the exception raised, for each amount in order
+        """
+        if currencies is None:
+            currencies = ["USD"] * len(amounts)
+        elif len(currencies) != len(amounts):
+            raise ValueError("Amounts and currencies must have the same length")
+        return await asyncio.gather(
+            *(self.process_transaction(amount, currency) for amount, currency in zip(amounts, currencies)),
+            return_exceptions=True,
+        )
+
+    async def request_refund(self, transaction_id: str) -> bool:
+        return await self._call(self.payment_provider.refund(transaction_id))
+
+    async def check_status(self, transaction_id: str) -> PaymentStatus:
+        return await self.payment_provider.get_status(transaction_id)
+
+    async def _call(self, coroutine):
+        async with self._slots:
+            if self.timeout is None:
+                return await coroutine
+            return await asyncio.wait_for(coroutine, self.timeout)
+
+class SimulatedAsyncGateway(AsyncPayment):
+    """
+    In-process stand-in for a remote payment gateway.
+    Every call waits latency seconds (plus up to jitter seconds) and fails
+    with ConnectionError at the given failure_rate.
+    """
+
+    def __init__(self, prefix: str = "SIM", max_amount: float = 10000, latency: float = 0.05,
+                 jitter: float = 0.0, failure_rate: float = 0.0, seed: Optional[int] = None):
+        self.prefix = prefix
+        self.max_amount = max_amount
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.transactions: Dict[str, PaymentDetails] = {}
+        self._random = random.Random(seed)
+
+    def validate_payment(self, amount: float) -> bool:
+        return amount > 0 and amount <= self.max_amount
+
+    async def process_payment(self, amount: float, currency: str = "USD") -> PaymentDetails:
+        await self._round_trip()
+        transaction_id = transaction_ids.next_id(self.prefix)
+        payment_details = PaymentDetails(
+            amount=amount,
+            currency=currency,
+            description="Simulated gateway payment",
+            transaction_id=transaction_id,
+            timestamp=datetime.now(),
+            status=PaymentStatus.COMPLETED
+        )
+        self.transactions[transaction_id] = payment_details
+        return payment_details
+
+    async def refund(self, transaction_id: str) -> bool:
+        await self._round_trip()
+        if transaction_id in self.transactions:
+            self.transactions[transaction_id].status = PaymentStatus.REFUNDED
+            return True
+        return False
+
+    async def get_status(self, transaction_id: str) -> PaymentStatus:
+        if transaction_id in self.transactions:
+            return self.transactions[transaction_id].status
+        return PaymentStatus.FAILED
+
+    async def _round_trip(self) -> None:
+        delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0.0)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if self.failure_rate and self._random.random() < self.failure_rate:
+            raise ConnectionError(f"Simulated {self.prefix} gateway failure")
+
+async def main():
+    gateway = SimulatedAsyncGateway("SIM", latency=0.05, jitter=0.02, seed=42)
+    processor = AsyncPaymentProcessor(gateway, max_concurrency=500, timeout=1.0)
+
+    results = await processor.process_batch([10.0 * (index + 1) for index in range(1000)])
+    completed = [result for result in results if isinstance(result, PaymentDetails)]
+    print(f"Processed {len(completed)} of {len(results)} payments concurrently")
+
+    first = completed[0].transaction_id
+    print(f"Refund {first}: {await processor.request_refund(first)}")
+    print(f"Status: {await processor.check_status(first)}")
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,216 @@
+import sys
+from array import array
+from collections import Counter
+from dataclasses import dataclass, replace
+from datetime import datetime, timedelta
+from decimal import ROUND_HALF_EVEN, Decimal
+from typing import Dict, Iterable, List, Optional
+
+from PaymentInterface import (SETTLED_STATUSES, STATUS_CODES, STATUSES, PaymentDetails, PaymentStatus,
+                              TransactionLedger)
+
+# ISO 4217 minor unit exponents; currencies not listed use 2.
+CURRENCY_EXPONENTS: Dict[str, int] = {
+    "BHD": 3, "CLP": 0, "IQD": 3, "ISK": 0, "JOD": 3, "JPY": 0, "KRW": 0,
+    "KWD": 3, "LYD": 3, "OMR": 3, "PYG": 0, "TND": 3, "UGX": 0, "VND": 0,
+}
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+def currency_exponent(currency: str) -> int:
+    return CURRENCY_EXPONENTS.get(currency, 2)
+
+def to_minor_units(amount: float, currency: str) -> int:
+    """
+    Convert an amount to integer minor units (e.g. cents), rounding half to even.
+    The float's shortest decimal form is used, so 0.1 + 0.2 style errors never leak in.
+    Args:
+        amount: The amount in major units
+        currency: The currency code
+    Returns:
+        int: The amount in minor units
+    """
+    return int(Decimal(repr(amount)).scaleb(currency_exponent(currency)).to_integral_value(ROUND_HALF_EVEN))
+
+def from_minor_units(amount_minor: int, currency: str) -> float:
+    return float(Decimal(amount_minor).scaleb(-currency_exponent(currency)))
+
+def to_epoch_ns(timestamp: datetime) -> int:
+    """Naive timestamps become exact nanoseconds since 1970-01-01."""
+    return (timestamp - _EPOCH) // _MICROSECOND * 1000
+
+def from_epoch_ns(timestamp_ns: int) -> datetime:
+    return _EPOCH + timedelta(microseconds=timestamp_ns // 1000)
+
+@dataclass(frozen=True, slots=True)
+class CompactPaymentDetails:
+    """
+    Memory-compact form of PaymentDetails.
+    Amounts are integer minor units, timestamps are epoch nanoseconds, the
+    status is its integer code, and currency and description strings are
+    interned so every record shares one copy of each.
+    """
+    transaction_id: str
+    amount_minor: int
+    currency: str
+    description: str
+    timestamp_ns: int
+    status_code: int
+
+    @classmethod
+    def from_details(cls, details: PaymentDetails) -> "CompactPaymentDetails":
+        return cls(
+            details.transaction_id,
+            to_minor_units(details.amount, details.currency),
+            sys.intern(details.currency),
+            sys.intern(details.description),
+            to_epoch_ns(details.timestamp),
+            STATUS_CODES[details.status],
+        )
+
+    @property
+    def amount(self) -> float:
+        return from_minor_units(self.amount_minor, self.currency)
+
+    @property
+    def status(self) -> PaymentStatus:
+        return STATUSES[self.status_code]
+
+    def to_details(self) -> PaymentDetails:
+        return PaymentDetails(self.amount, self.currency, self.description, self.transaction_id,
+                              from_epoch_ns(self.timestamp_ns), self.status)
+
+class CompactInMemoryLedger(TransactionLedger):
+    """In-memory ledger that keeps CompactPaymentDetails instead of PaymentDetails."""
+
+    def __init__(self):
+        self._transactions: Dict[str, CompactPaymentDetails] = {}
+
+    def __len__(self) -> int:
+        return len(self._transactions)
+
+    def __contains__(self, transaction_id: str) -> bool:
+        return transaction_id in self._transactions
+
+    def record(self, details: PaymentDetails) -> None:
+        self._transactions[details.transaction_id] = CompactPaymentDetails.from_details(details)
+
+    def get(self, transaction_id: str) -> Optional[PaymentDetails]:
+        compact = self._transactions.get(transaction_id)
+        return compact.to_details() if compact is not None else None
+
+    def get_status(self, transaction_id: str) -> Optional[PaymentStatus]:
+        compact = self._transactions.get(transaction_id)
+        return STATUSES[compact.status_code] if compact is not None else None
+
+    def update_status(self, transaction_id: str, status: PaymentStatus) -> bool:
+        compact = self._transactions.get(transaction_id)
+        if compact is None:
+            return False
+        self._transactions[transaction_id] = replace(compact, status_code=STATUS_CODES[status])
+        return True
+
+    def find_by_status(self, status: PaymentStatus) -> List[PaymentDetails]:
+        code = STATUS_CODES[status]
+        return [compact.to_details() for compact in self._transactions.values() if compact.status_code == code]
+
+    def find_between(self, start: datetime, end: datetime) -> List[PaymentDetails]:
+        low, high = to_epoch_ns(start), to_epoch_ns(end)
+        found = [compact for compact in self._transactions.values() if low <= compact.timestamp_ns < high]
+        return [compact.to_details() for compact in sorted(found, key=lambda compact: compact.timestamp_ns)]
+
+    def compact(self, before: datetime) -> int:
+        cutoff = to_epoch_ns(before)
+        settled = {STATUS_CODES[status] for status in SETTLED_STATUSES}
+        expired = [
+            transaction_id for transaction_id, compact in self._transactions.items()
+            if compact.status_code in settled and compact.timestamp_ns < cutoff
+        ]
+        for transaction_id in expired:
+            del self._transactions[transaction_id]
+        return len(expired)
+
+class PaymentColumns:
+    """
+    Column store of payments for bulk analytics.
+    Each field is a typed array (or the list of transaction IDs); currencies
+    and descriptions are stored once in lookup tables and referenced by index.
+    """
+
+    def __init__(self, payments: Iterable[PaymentDetails] = ()):
+        self.transaction_ids: List[str] = []
+        self.amounts_minor = array("q")
+        self.timestamps_ns = array("q")
+        self.status_codes = array("b")
+        # "I" holds at least 2**32 distinct values; "H" would overflow on the
+        # 65,536th description.
+        self.currency_ids = array("I")
+        self.description_ids = array("I")
+        self.currencies: List[str] = []
+        self.descriptions: List[str] = []
+        self._currency_index: Dict[str, int] = {}
+        self._description_index: Dict[str, int] = {}
+        self.extend(payments)
+
+    def __len__(self) -> int:
+        return len(self.transaction_ids)
+
+    def append(self, details: PaymentDetails) -> None:
+        # Convert every field before appending any, so a payment that fails
+        # to convert leaves the columns the same length.
+        amount_minor = to_minor_units(details.amount, details.currency)
+        timestamp_ns = to_epoch_ns(details.timestamp)
+        status_code = STATUS_CODES[details.status]
+        currency_id = self._intern(details.currency, self.currencies, self._currency_index)
+        description_id = self._intern(details.description, self.descriptions, self._description_index)
+        self.transaction_ids.append(details.transaction_id)
+        self.amounts_minor.append(amount_minor)
+        self.timestamps_ns.append(timestamp_ns)
+        self.status_codes.append(status_code)
+        self.currency_ids.append(currency_id)
+        self.description_ids.append(description_id)
+
+    def extend(self, payments: Iterable[PaymentDetails]) -> None:
+        for details in payments:
+            self.append(details)
+
+    def row(self, index: int) -> CompactPaymentDetails:
+        return CompactPaymentDetails(
+            self.transaction_ids[index],
+            self.amounts_minor[index],
+            self.currencies[self.currency_ids[index]],
+            self.descriptions[self.description_ids[index]],
+            self.timestamps_ns[index],
+            self.status_codes[index],
+        )
+
+    def totals_by_currency(self, status: Optional[PaymentStatus] = None) -> Dict[str, int]:
+        """
+        Sum amounts in minor units per currency, optionally only for one status.
+        Args:
+            status: Only count payments with this status (default: all)
+        Returns:
+            Dict[str, int]: Total minor units per currency code
+        """
+        totals = [0] * len(self.currencies)
+        if status is None:
+            for currency_id, amount in zip(self.currency_ids, self.amounts_minor):
+                totals[currency_id] += amount
+        else:
+            code = STATUS_CODES[status]
+            for currency_id, amount, status_code in zip(self.currency_ids, self.amounts_minor, self.status_codes):
+                if status_code == code:
+                    totals[currency_id] += amount
+        return dict(zip(self.currencies, totals))
+
+    def count_by_status(self) -> Dict[PaymentStatus, int]:
+        return {STATUSES[code]: count for code, count in Counter(self.status_codes).items()}
+
+    @staticmethod
+    def _intern(value: str, table: List[str], index: Dict[str, int]) -> int:
+        position = index.get(value)
+        if position is None:
+            position = index[value] = len(table)
+            table.append(value)
+        return position
@@ -0,0 +1,133 @@
+import json
+import os
+import threading
+from array import array
+from decimal import Decimal
+from fractions import Fraction
+from typing import Dict, List, Sequence, Tuple, Union
+
+from CompactPayments import currency_exponent, from_minor_units, to_minor_units
+
+DEFAULT_FX_RATES_PATH = os.environ.get(
+    "PAYMENT_FX_RATES_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "fx_rates.json")
+)
+
+def _round_half_even(numerator: int, denominator: int) -> int:
+    quotient, remainder = divmod(numerator, denominator)
+    remainder += remainder
+    if remainder > denominator or (remainder == denominator and quotient & 1):
+        quotient += 1
+    return quotient
+
+class FxRates:
+    """
+    Exchange rates loaded from a JSON file of units per base currency.
+    Rates are kept as exact fractions, so a conversion between integer minor
+    units is one multiplication and one division by the cached cross rate,
+    rounded half to even once at the end.
+    """
+
+    def __init__(self, path: str = DEFAULT_FX_RATES_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self.reload()
+
+    def reload(self) -> None:
+        with open(self.path) as f:
+            table = json.load(f)
+        rates = {currency: Fraction(Decimal(rate)) for currency, rate in table["rates"].items()}
+        with self._lock:
+            self.base: str = table["base"]
+            self.as_of = table.get("as_of")
+            self._rates = rates
+            self.currencies: Tuple[str, ...] = tuple(sorted(rates))
+            self._cross: Dict[Tuple[str, str], Tuple[int, int]] = {}
+
+    def rate(self, source: str, target: str) -> Fraction:
+        """Units of target per unit of source."""
+        try:
+            return self._rates[target] / self._rates[source]
+        except KeyError as e:
+            raise ValueError(f"No exchange rate for {e.args[0]}") from None
+
+    def minor_unit_rate(self, source: str, target: str) -> Tuple[int, int]:
+        """
+        The cross rate between minor units of two currencies as an exact
+        (numerator, denominator) pair, cached per currency pair.
+        """
+        key = (source, target)
+        cross = self._cross.get(key)
+        if cross is None:
+            rate = self.rate(source, target) * Fraction(10) ** (currency_exponent(target) - currency_exponent(source))
+            cross = self._cross[key] = (rate.numerator, rate.denominator)
+        return cross
+
+    def convert_minor(self, amount_minor: int, source: str, target: str) -> int:
+        numerator, denominator = self.minor_unit_rate(source, target)
+        return _round_half_even(amount_minor * numerator, denominator)
+
+    def convert(self, amount: float, source: str, target: str) -> float:
+        if source == target:
+            return amount
+        return from_minor_units(self.convert_minor(to_minor_units(amount, source), source, target), target)
+
+    def convert_batch(self, amounts_minor: Sequence[int], source: str, target: str) -> array:
+        """
+        Convert many minor-unit amounts of one currency.
+        Args:
+            amounts_minor: The amounts in minor units of source
+            source: The currency of the amounts
+            target: The currency to convert to
+        Returns:
+            array: The converted amounts in minor units of target ('q' typecode)
+        """
+        numerator, denominator = self.minor_unit_rate(source, target)
+        if denominator == 1:
+            return array("q", [amount * numerator for amount in amounts_minor])
+        converted = []
+        append = converted.append
+        # _round_half_even, inlined: this loop is the settlement hot path.
+        for amount in amounts_minor:
+            quotient, remainder = divmod(amount * numerator, denominator)
+            remainder += remainder
+            if remainder > denominator or (remainder == denominator and quotient & 1):
+                quotient += 1
+            append(quotient)
+        return array("q", converted)
+
+    def normalize_batch(self, amounts_minor: Sequence[int], currencies: Union[str, Sequence[str]],
+                        target: str) -> array:
+        """
+        Convert a settlement batch of mixed currencies into one currency.
+        Each currency pair's cross rate is looked up once per batch, so every
+        amount costs one multiplication and one integer division.
+        Args:
+            amounts_minor: The amounts in minor units of their own currency
+            currencies: One currency for all amounts, or one per amount
+            target: The currency to convert to
+        Returns:
+            array: The converted amounts in minor units of target ('q' typecode)
+        """
+        if isinstance(currencies, str):
+            return self.convert_batch(amounts_minor, currencies, target)
+        if len(currencies) != len(amounts_minor):
+            raise ValueError("Amounts and currencies must have the same length")
+        cross = {currency: self.minor_unit_rate(currency, target) for currency in set(currencies)}
+        converted = []
+        append = converted.append
+        for amount, currency in zip(amounts_minor, currencies):
+            numerator, denominator = cross[currency]
+            quotient, remainder = divmod(amount * numerator, denominator)
+            remainder += remainder
+            if remainder > denominator or (remainder == denominator and quotient & 1):
+                quotient += 1
+            append(quotient)
+        return array("q", converted)
+
+    def convert_amounts(self, amounts: Sequence[float], currencies: Union[str, Sequence[str]],
+                        target: str) -> List[float]:
+        """Like normalize_batch, for amounts in major units."""
+        if isinstance(currencies, str):
+            currencies = [currencies] * len(amounts)
+        minor = [to_minor_units(amount, currency) for amount, currency in zip(amounts, currencies)]
+        return [from_minor_units(amount, target) for amount in self.normalize_batch(minor, currencies, target)]
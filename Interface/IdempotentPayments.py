@@ -0,0 +1,279 @@
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Callable, Dict, Optional, Tuple
+
+from PaymentInterface import PaymentDetails, PaymentProcessor, PaymentStatus
+
+class SQLiteIdempotencyStore:
+    """
+    Persistent backing for idempotency keys, so retries are recognised
+    across restarts and by every worker sharing the database file.
+    A worker claims a key by inserting a pending row before it charges; a
+    worker that loses the insert waits for the claimant's result instead of
+    charging again. Pending rows whose claimant vanished expire after
+    pending_ttl seconds, and expired rows are deleted as keys are claimed.
+    """
+
+    def __init__(self, path: str, pending_ttl: float = 300.0, purge_every: int = 1000):
+        self.pending_ttl = pending_ttl
+        self.purge_every = purge_every
+        self._claims = 0
+        self._lock = threading.Lock()
+        # Autocommit mode, so claims can open their own BEGIN IMMEDIATE transaction.
+        self._connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=30.0)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("""
+            CREATE TABLE IF NOT EXISTS idempotency_keys (
+                idempotency_key TEXT PRIMARY KEY,
+                amount REAL NOT NULL,
+                currency TEXT NOT NULL,
+                description TEXT,
+                transaction_id TEXT,
+                timestamp TEXT,
+                status TEXT,
+                created REAL NOT NULL
+            )
+        """)
+        self._connection.execute("CREATE INDEX IF NOT EXISTS idempotency_keys_created ON idempotency_keys (created)")
+
+    def get(self, key: str, max_age: Optional[float] = None) -> Optional[PaymentDetails]:
+        """
+        Get the stored result of a key.
+        Args:
+            key: The idempotency key
+            max_age: Ignore results stored more than this many seconds ago
+        Returns:
+            Optional[PaymentDetails]: The result, or None if the key is unknown,
+            expired or still pending
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT amount, currency, description, transaction_id, timestamp, status, created "
+                "FROM idempotency_keys WHERE idempotency_key = ?", (key,)
+            ).fetchone()
+        if row is None or row[5] is None or (max_age is not None and time.time() - row[6] > max_age):
+            return None
+        amount, currency, description, transaction_id, timestamp, status, _ = row
+        return PaymentDetails(amount, currency, description, transaction_id,
+                              datetime.fromisoformat(timestamp), PaymentStatus(status))
+
+    def claim(self, key: str, amount: float, currency: str, max_age: Optional[float] = None) -> bool:
+        """
+        Reserve a key for one charge, replacing an expired row for it.
+        Args:
+            key: The idempotency key
+            amount: The amount about to be charged
+            currency: The currency about to be charged
+            max_age: Age in seconds after which a stored result no longer counts
+        Returns:
+            bool: True if this caller now owns the key and should charge,
+            False if another caller holds a pending or stored result
+        """
+        now = time.time()
+        with self._lock:
+            self._claims += 1
+            purge = self._claims % self.purge_every == 0
+            self._connection.execute("BEGIN IMMEDIATE")
+            try:
+                self._connection.execute(
+                    "DELETE FROM idempotency_keys WHERE idempotency_key = ? "
+                    "AND ((status IS NOT NULL AND created < ?) OR (status IS NULL AND created < ?))",
+                    (key, now - max_age if max_age is not None else float("-inf"), now - self.pending_ttl),
+                )
+                if purge:
+                    self._purge(now, max_age)
+                try:
+                    self._connection.execute(
+                        "INSERT INTO idempotency_keys (idempotency_key, amount, currency, created) VALUES (?, ?, ?, ?)",
+                        (key, amount, currency, now),
+                    )
+                    claimed = True
+                except sqlite3.IntegrityError:
+                    claimed = False
+                self._connection.execute("COMMIT")
+            except BaseException:
+                self._connection.execute("ROLLBACK")
+                raise
+        return claimed
+
+    def complete(self, key: str, details: PaymentDetails) -> None:
+        """Store the result of a claimed key."""
+        with self._lock:
+            self._connection.execute(
+                "UPDATE idempotency_keys SET amount = ?, currency = ?, description = ?, transaction_id = ?, "
+                "timestamp = ?, status = ? WHERE idempotency_key = ?",
+                (details.amount, details.currency, details.description, details.transaction_id,
+                 details.timestamp.isoformat(), details.status.value, key),
+            )
+
+    def release(self, key: str) -> None:
+        """Give up a claimed key whose charge failed, so it can be retried."""
+        with self._lock:
+            self._connection.execute(
+                "DELETE FROM idempotency_keys WHERE idempotency_key = ? AND status IS NULL", (key,)
+            )
+
+    def purge(self, max_age: Optional[float]) -> int:
+        """
+        Delete expired results and abandoned claims.
+        Args:
+            max_age: Age in seconds after which a stored result expires
+        Returns:
+            int: How many keys were deleted
+        """
+        with self._lock:
+            return self._purge(time.time(), max_age)
+
+    def _purge(self, now: float, max_age: Optional[float]) -> int:
+        deleted = self._connection.execute(
+            "DELETE FROM idempotency_keys WHERE status IS NULL AND created < ?", (now - self.pending_ttl,)
+        ).rowcount
+        if max_age is not None:
+            deleted += self._connection.execute(
+                "DELETE FROM idempotency_keys WHERE status IS NOT NULL AND created < ?", (now - max_age,)
+            ).rowcount
+        return deleted
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM idempotency_keys").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+class _InFlight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Optional[PaymentDetails] = None
+        self.error: Optional[BaseException] = None
+
+class IdempotentPaymentProcessor:
+    """
+    Wraps a PaymentProcessor so a retried request never pays twice.
+    Results are cached per idempotency key in a bounded LRU whose entries
+    expire after ttl seconds; concurrent requests with the same key wait for
+    the one already in flight instead of calling the provider again. Failed
+    attempts are not cached, so they can be retried. Reusing a key for a
+    different amount or currency raises ValueError.
+    With a store, a key is claimed in the store before the provider is
+    called, so processors in other threads or processes sharing it wait up
+    to store_wait seconds for that result rather than charging again.
+    """
+
+    def __init__(self, processor: PaymentProcessor, maxsize: int = 100000, ttl: Optional[float] = 86400.0,
+                 store: Optional[SQLiteIdempotencyStore] = None, clock: Callable[[], float] = time.monotonic,
+                 store_wait: float = 30.0, poll_interval: float = 0.01):
+        self.processor = processor
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.store = store
+        self.store_wait = store_wait
+        self.poll_interval = poll_interval
+        self.backend_calls = 0
+        self.hits = 0
+        self.coalesced = 0
+        self._clock = clock
+        self._results: "OrderedDict[str, Tuple[PaymentDetails, Optional[float]]]" = OrderedDict()
+        self._in_flight: Dict[str, _InFlight] = {}
+        self._lock = threading.Lock()
+
+    def process_transaction(self, amount: float, currency: str = "USD",
+                            idempotency_key: Optional[str] = None) -> PaymentDetails:
+        if idempotency_key is None:
+            with self._lock:
+                self.backend_calls += 1
+            return self.processor.process_transaction(amount, currency)
+
+        with self._lock:
+            cached = self._cached(idempotency_key)
+            if cached is not None:
+                self.hits += 1
+                return self._checked(idempotency_key, cached, amount, currency)
+            waiting = self._in_flight.get(idempotency_key)
+            if waiting is None:
+                flight = self._in_flight[idempotency_key] = _InFlight()
+            else:
+                self.coalesced += 1
+
+        if waiting is not None:
+            waiting.done.wait()
+            if waiting.error is not None:
+                raise waiting.error
+            return self._checked(idempotency_key, waiting.result, amount, currency)
+
+        try:
+            if self.store is not None:
+                details = self._through_store(idempotency_key, amount, currency)
+            else:
+                with self._lock:
+                    self.backend_calls += 1
+                details = self.processor.process_transaction(amount, currency)
+            flight.result = details
+            with self._lock:
+                self._remember(idempotency_key, details)
+            return self._checked(idempotency_key, details, amount, currency)
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._in_flight[idempotency_key]
+            flight.done.set()
+
+    def _through_store(self, key: str, amount: float, currency: str) -> PaymentDetails:
+        """Charge a key at most once across everything sharing the store."""
+        deadline = time.monotonic() + self.store_wait
+        while True:
+            details = self.store.get(key, self.ttl)
+            if details is not None:
+                with self._lock:
+                    self.hits += 1
+                return details
+            if self.store.claim(key, amount, currency, self.ttl):
+                with self._lock:
+                    self.backend_calls += 1
+                try:
+                    details = self.processor.process_transaction(amount, currency)
+                except BaseException:
+                    self.store.release(key)
+                    raise
+                self.store.complete(key, details)
+                return details
+            # Another worker holds the claim; poll until it stores a result or gives up.
+            if time.monotonic() >= deadline:
+                raise TimeoutError(f"Idempotency key {key} is still being processed elsewhere")
+            time.sleep(self.poll_interval)
+
+    def request_refund(self, transaction_id: str) -> bool:
+        return self.processor.request_refund(transaction_id)
+
+    def check_status(self, transaction_id: str) -> PaymentStatus:
+        return self.processor.check_status(transaction_id)
+
+    def _cached(self, key: str) -> Optional[PaymentDetails]:
+        entry = self._results.get(key)
+        if entry is None:
+            return None
+        details, expires_at = entry
+        if expires_at is not None and expires_at <= self._clock():
+            del self._results[key]
+            return None
+        self._results.move_to_end(key)
+        return details
+
+    def _remember(self, key: str, details: PaymentDetails) -> None:
+        expires_at = None if self.ttl is None else self._clock() + self.ttl
+        self._results[key] = (details, expires_at)
+        self._results.move_to_end(key)
+        while len(self._results) > self.maxsize:
+            self._results.popitem(last=False)
+
+    @staticmethod
+    def _checked(key: str, details: PaymentDetails, amount: float, currency: str) -> PaymentDetails:
+        if details.amount != amount or details.currency != currency:
+            raise ValueError(f"Idempotency key {key} was already used for {details.amount} {details.currency}")
+        return details
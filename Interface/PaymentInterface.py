@@ -1,9 +1,19 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Optional
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Union
 from datetime import datetime
+import itertools
+import logging
+import os
+import threading
 from dataclasses import dataclass
 from enum import Enum
 
+import PaymentEvents
+from PaymentEvents import emit, logger as events
+
+if TYPE_CHECKING:
+    from CurrencyExchange import FxRates
+
 class PaymentStatus(Enum):
     PENDING = "PENDING"
     PROCESSING = "PROCESSING"
@@ -11,6 +21,10 @@ class PaymentStatus(Enum):
     FAILED = "FAILED"
     REFUNDED = "REFUNDED"
 
+# Compact integer codes for PaymentStatus, used by the on-disk and columnar formats.
+STATUS_CODES = {status: code for code, status in enumerate(PaymentStatus)}
+STATUSES = list(PaymentStatus)
+
 @dataclass
 class PaymentDetails:
     amount: float
@@ -20,7 +34,286 @@ class PaymentDetails:
     timestamp: datetime
     status: PaymentStatus = PaymentStatus.PENDING
 
+@dataclass
+class BatchItemResult:
+    index: int
+    details: Optional[PaymentDetails] = None
+    error: Optional[Exception] = None
+
+    @property
+    def succeeded(self) -> bool:
+        return self.error is None
+
+class TransactionLedger(ABC):
+    """
+    Storage for the transactions of a payment provider.
+    Backends only have to keep the latest PaymentDetails per transaction ID;
+    see TransactionLedger.py for the persistent ones.
+    """
+
+    @abstractmethod
+    def record(self, details: PaymentDetails) -> None:
+        """
+        Store a transaction, replacing any earlier record with the same ID.
+        Args:
+            details: The transaction to store
+        """
+        pass
+
+    @abstractmethod
+    def get(self, transaction_id: str) -> Optional[PaymentDetails]:
+        """
+        Get a transaction.
+        Args:
+            transaction_id: The transaction ID to look up
+        Returns:
+            Optional[PaymentDetails]: The transaction, or None if unknown
+        """
+        pass
+
+    @abstractmethod
+    def update_status(self, transaction_id: str, status: PaymentStatus) -> bool:
+        """
+        Change the status of a stored transaction.
+        Args:
+            transaction_id: The transaction to update
+            status: The new status
+        Returns:
+            bool: True if the transaction exists, False otherwise
+        """
+        pass
+
+    @abstractmethod
+    def find_by_status(self, status: PaymentStatus) -> List[PaymentDetails]:
+        """
+        Get all transactions with a status.
+        Args:
+            status: The status to look for
+        Returns:
+            List[PaymentDetails]: The matching transactions
+        """
+        pass
+
+    @abstractmethod
+    def find_between(self, start: datetime, end: datetime) -> List[PaymentDetails]:
+        """
+        Get all transactions with start <= timestamp < end, oldest first.
+        Args:
+            start: Start of the time range (inclusive)
+            end: End of the time range (exclusive)
+        Returns:
+            List[PaymentDetails]: The matching transactions
+        """
+        pass
+
+    def get_status(self, transaction_id: str) -> Optional[PaymentStatus]:
+        """
+        Get the status of a transaction.
+        Args:
+            transaction_id: The transaction ID to look up
+        Returns:
+            Optional[PaymentStatus]: The status, or None if unknown
+        """
+        details = self.get(transaction_id)
+        return details.status if details is not None else None
+
+    def transition(self, transaction_id: str, allowed_from: Sequence[PaymentStatus], status: PaymentStatus) -> bool:
+        """
+        Change the status of a transaction only if it currently has one of allowed_from.
+        Backends used from several threads must make the check and the update atomic.
+        Args:
+            transaction_id: The transaction to update
+            allowed_from: The statuses the transaction may be moved out of
+            status: The new status
+        Returns:
+            bool: True if the status was changed, False if unknown or not allowed
+        """
+        current = self.get_status(transaction_id)
+        if current is None or current not in allowed_from:
+            return False
+        return self.update_status(transaction_id, status)
+
+    def compact(self, before: datetime) -> int:
+        """
+        Remove settled (COMPLETED or REFUNDED) transactions older than a date.
+        Args:
+            before: Transactions with an earlier timestamp are removed
+        Returns:
+            int: The number of transactions removed
+        """
+        return 0
+
+    def close(self) -> None:
+        """Release any resources held by the ledger."""
+        pass
+
+    def __contains__(self, transaction_id: str) -> bool:
+        return self.get(transaction_id) is not None
+
+SETTLED_STATUSES = (PaymentStatus.COMPLETED, PaymentStatus.REFUNDED)
+# Only money that was taken, or is being taken, can be refunded, and only once.
+REFUNDABLE_STATUSES = (PaymentStatus.COMPLETED, PaymentStatus.PROCESSING)
+
+class InMemoryLedger(TransactionLedger):
+    def __init__(self):
+        self._transactions: Dict[str, PaymentDetails] = {}
+
+    def __len__(self) -> int:
+        return len(self._transactions)
+
+    def __contains__(self, transaction_id: str) -> bool:
+        return transaction_id in self._transactions
+
+    def record(self, details: PaymentDetails) -> None:
+        self._transactions[details.transaction_id] = details
+
+    def get(self, transaction_id: str) -> Optional[PaymentDetails]:
+        return self._transactions.get(transaction_id)
+
+    def get_status(self, transaction_id: str) -> Optional[PaymentStatus]:
+        details = self._transactions.get(transaction_id)
+        return details.status if details is not None else None
+
+    def update_status(self, transaction_id: str, status: PaymentStatus) -> bool:
+        details = self._transactions.get(transaction_id)
+        if details is None:
+            return False
+        details.status = status
+        return True
+
+    def find_by_status(self, status: PaymentStatus) -> List[PaymentDetails]:
+        return [details for details in self._transactions.values() if details.status == status]
+
+    def find_between(self, start: datetime, end: datetime) -> List[PaymentDetails]:
+        found = [details for details in self._transactions.values() if start <= details.timestamp < end]
+        return sorted(found, key=lambda details: details.timestamp)
+
+    def compact(self, before: datetime) -> int:
+        expired = [
+            transaction_id for transaction_id, details in self._transactions.items()
+            if details.status in SETTLED_STATUSES and details.timestamp < before
+        ]
+        for transaction_id in expired:
+            del self._transactions[transaction_id]
+        return len(expired)
+
+class ShardedLedger(TransactionLedger):
+    """
+    In-memory ledger that can be shared by threads.
+    Transactions are spread over shards by hash of their ID, each guarded by
+    its own lock, so payments and refunds on different IDs rarely contend and
+    a status check-and-update in transition() is atomic.
+    """
+
+    def __init__(self, shards: int = 16):
+        self._shards: List[Dict[str, PaymentDetails]] = [{} for _ in range(shards)]
+        self._locks = [threading.Lock() for _ in range(shards)]
+
+    def _shard(self, transaction_id: str) -> int:
+        return hash(transaction_id) % len(self._shards)
+
+    def __len__(self) -> int:
+        return sum(len(shard) for shard in self._shards)
+
+    def __contains__(self, transaction_id: str) -> bool:
+        return transaction_id in self._shards[self._shard(transaction_id)]
+
+    def record(self, details: PaymentDetails) -> None:
+        index = self._shard(details.transaction_id)
+        with self._locks[index]:
+            self._shards[index][details.transaction_id] = details
+
+    def get(self, transaction_id: str) -> Optional[PaymentDetails]:
+        return self._shards[self._shard(transaction_id)].get(transaction_id)
+
+    def get_status(self, transaction_id: str) -> Optional[PaymentStatus]:
+        details = self._shards[self._shard(transaction_id)].get(transaction_id)
+        return details.status if details is not None else None
+
+    def update_status(self, transaction_id: str, status: PaymentStatus) -> bool:
+        index = self._shard(transaction_id)
+        with self._locks[index]:
+            details = self._shards[index].get(transaction_id)
+            if details is None:
+                return False
+            details.status = status
+            return True
+
+    def transition(self, transaction_id: str, allowed_from: Sequence[PaymentStatus], status: PaymentStatus) -> bool:
+        index = self._shard(transaction_id)
+        with self._locks[index]:
+            details = self._shards[index].get(transaction_id)
+            if details is None or details.status not in allowed_from:
+                return False
+            details.status = status
+            return True
+
+    def _snapshot(self) -> List[PaymentDetails]:
+        found = []
+        for shard, lock in zip(self._shards, self._locks):
+            with lock:
+                found.extend(shard.values())
+        return found
+
+    def find_by_status(self, status: PaymentStatus) -> List[PaymentDetails]:
+        return [details for details in self._snapshot() if details.status == status]
+
+    def find_between(self, start: datetime, end: datetime) -> List[PaymentDetails]:
+        found = [details for details in self._snapshot() if start <= details.timestamp < end]
+        return sorted(found, key=lambda details: details.timestamp)
+
+    def compact(self, before: datetime) -> int:
+        removed = 0
+        for shard, lock in zip(self._shards, self._locks):
+            with lock:
+                expired = [
+                    transaction_id for transaction_id, details in shard.items()
+                    if details.status in SETTLED_STATUSES and details.timestamp < before
+                ]
+                for transaction_id in expired:
+                    del shard[transaction_id]
+                removed += len(expired)
+        return removed
+
+class TransactionIdGenerator:
+    """
+    Generates unique, increasing transaction IDs.
+    The process start time and PID are formatted once; each ID only adds a
+    fixed-width counter, so IDs sort in creation order within a process and
+    never repeat across threads or concurrently running processes.
+    """
+
+    def __init__(self):
+        self._reset()
+
+    def _reset(self) -> None:
+        now = datetime.now()
+        self._stamp = f"{now.strftime('%Y%m%d%H%M%S')}{now.microsecond // 1000:03d}{os.getpid() % 10**7:07d}"
+        # next() on itertools.count is atomic under the GIL, so no lock is needed.
+        self._counter = itertools.count()
+
+    def next_id(self, prefix: str) -> str:
+        """
+        Generate the next transaction ID.
+        Args:
+            prefix: Provider prefix, e.g. "PP"
+        Returns:
+            str: A new transaction ID such as PP_<timestamp><pid><counter>
+        """
+        return f"{prefix}_{self._stamp}{next(self._counter):010d}"
+
+transaction_ids = TransactionIdGenerator()
+
+if hasattr(os, "register_at_fork"):
+    # A forked child must not continue the parent's sequence under the parent's PID.
+    os.register_at_fork(after_in_child=transaction_ids._reset)
+
 class Payment(ABC):
+    # Largest amount accepted by validate_payment, if the provider has a fixed limit.
+    max_amount: Optional[float] = None
+    # Currency that validate_payment and max_amount are expressed in.
+    limit_currency: str = "USD"
+
     @abstractmethod
     def process_payment(self, amount: float, currency: str = "USD") -> PaymentDetails:
         """
@@ -66,13 +359,41 @@ class Payment(ABC):
         """
         pass
 
+    def validate_batch(self, amounts: Sequence[float]) -> List[bool]:
+        """
+        Validate many payment amounts at once.
+        Providers with a fixed max_amount are checked with a single comparison
+        per amount instead of one validate_payment call each.
+        Args:
+            amounts: The amounts to validate
+        Returns:
+            List[bool]: Whether each amount is valid, in order
+        """
+        if self.max_amount is None:
+            return [self.validate_payment(amount) for amount in amounts]
+        limit = self.max_amount
+        return [0 < amount <= limit for amount in amounts]
+
 class PaymentProcessor:
-    def __init__(self, payment_provider: Payment):
+    def __init__(self, payment_provider: Payment, fx: Optional["FxRates"] = None):
+        """
+        Args:
+            payment_provider: The provider that processes the payments
+            fx: Exchange rates (see CurrencyExchange.py); when given, amounts are
+                converted to the provider's limit_currency before validation
+        """
         self.payment_provider = payment_provider
+        self.fx = fx
+
+    def _limit_amount(self, amount: float, currency: str) -> float:
+        limit_currency = self.payment_provider.limit_currency
+        if self.fx is None or currency == limit_currency:
+            return amount
+        return self.fx.convert(amount, currency, limit_currency)
 
     def process_transaction(self, amount: float, currency: str = "USD") -> PaymentDetails:
-        if not self.payment_provider.validate_payment(amount):
-            raise ValueError(f"Invalid payment amount: {amount}")
+        if not self.payment_provider.validate_payment(self._limit_amount(amount, currency)):
+            raise ValueError(f"Invalid payment amount: {amount} {currency}")
         
         return self.payment_provider.process_payment(amount, currency)
 
@@ -82,18 +403,111 @@ class PaymentProcessor:
     def check_status(self, transaction_id: str) -> PaymentStatus:
         return self.payment_provider.get_status(transaction_id)
 
+    def process_batch(self, amounts: Sequence[float],
+                      currencies: Union[str, Sequence[str]] = "USD") -> List[BatchItemResult]:
+        """
+        Process many payments, validating all amounts up front.
+        A failing item, including one in a currency without an exchange rate,
+        is reported in its result and does not stop the batch.
+        Args:
+            amounts: The amounts to process
+            currencies: One currency for all amounts, or one per amount
+        Returns:
+            List[BatchItemResult]: The payment details or error of each amount, in order
+        """
+        if isinstance(currencies, str):
+            currencies = [currencies] * len(amounts)
+        elif len(currencies) != len(amounts):
+            raise ValueError("Amounts and currencies must have the same length")
+
+        limit_amounts = amounts
+        conversion_errors: Dict[int, Exception] = {}
+        if self.fx is not None:
+            limit_amounts = self._limit_amounts(amounts, currencies, conversion_errors)
+
+        process_payment = self.payment_provider.process_payment
+        results = []
+        for index, (amount, currency, valid) in enumerate(
+                zip(amounts, currencies, self.payment_provider.validate_batch(limit_amounts))):
+            if index in conversion_errors:
+                results.append(BatchItemResult(index, error=conversion_errors[index]))
+                continue
+            if not valid:
+                results.append(BatchItemResult(index, error=ValueError(f"Invalid payment amount: {amount} {currency}")))
+                continue
+            try:
+                results.append(BatchItemResult(index, details=process_payment(amount, currency)))
+            except Exception as e:
+                results.append(BatchItemResult(index, error=e))
+        return results
+
+    def _limit_amounts(self, amounts: Sequence[float], currencies: Sequence[str],
+                       errors: Dict[int, Exception]) -> List[float]:
+        """
+        Convert a batch to the provider's limit_currency one currency at a time.
+        Items in a currency that cannot be converted are added to errors and
+        keep their unconverted amount.
+        """
+        limit_currency = self.payment_provider.limit_currency
+        groups: Dict[str, List[int]] = {}
+        for index, currency in enumerate(currencies):
+            groups.setdefault(currency, []).append(index)
+        limit_amounts = list(amounts)
+        for currency, indices in groups.items():
+            if currency == limit_currency:
+                continue
+            try:
+                converted = self.fx.convert_amounts([amounts[i] for i in indices], currency, limit_currency)
+            except ValueError as e:
+                for index in indices:
+                    errors[index] = e
+                continue
+            for index, amount in zip(indices, converted):
+                limit_amounts[index] = amount
+        return limit_amounts
+
+    def refund_batch(self, transaction_ids: Sequence[str]) -> List[bool]:
+        """
+        Refund many transactions; a failing refund is reported as False.
+        Args:
+            transaction_ids: The IDs of the transactions to refund
+        Returns:
+            List[bool]: Whether each refund succeeded, in order
+        """
+        refund = self.payment_provider.refund
+        results = []
+        for transaction_id in transaction_ids:
+            try:
+                results.append(refund(transaction_id))
+            except Exception:
+                results.append(False)
+        return results
+
+    def status_batch(self, transaction_ids: Sequence[str]) -> List[PaymentStatus]:
+        """
+        Get the status of many transactions.
+        Args:
+            transaction_ids: The transaction IDs to check
+        Returns:
+            List[PaymentStatus]: The status of each transaction, in order
+        """
+        get_status = self.payment_provider.get_status
+        return [get_status(transaction_id) for transaction_id in transaction_ids]
+
 class PayPalPayment(Payment):
-    def __init__(self, client_id: str, client_secret: str):
+    max_amount = 10000
+
+    def __init__(self, client_id: str, client_secret: str, ledger: Optional[TransactionLedger] = None):
         self.client_id = client_id
         self.client_secret = client_secret
-        self.transactions: Dict[str, PaymentDetails] = {}
+        self.transactions: TransactionLedger = ledger if ledger is not None else InMemoryLedger()
 
     def validate_payment(self, amount: float) -> bool:
-        return amount > 0 and amount <= 10000
+        return amount > 0 and amount <= self.max_amount
 
     def process_payment(self, amount: float, currency: str = "USD") -> PaymentDetails:
         # Aquí iría la lógica real de integración con PayPal
-        transaction_id = f"PP_{datetime.now().strftime('%Y%m%d%H%M%S')}"
+        transaction_id = transaction_ids.next_id("PP")
         payment_details = PaymentDetails(
             amount=amount,
             currency=currency,
@@ -102,33 +516,37 @@ class PayPalPayment(Payment):
             timestamp=datetime.now(),
             status=PaymentStatus.COMPLETED
         )
-        self.transactions[transaction_id] = payment_details
-        print(f"Processing PayPal payment of {amount} {currency}")
+        self.transactions.record(payment_details)
+        if events.isEnabledFor(logging.INFO):
+            emit(logging.INFO, "Processing PayPal payment of %s %s", amount, currency,
+                 event="payment.processed", provider="PayPal", transaction_id=transaction_id, amount=amount, currency=currency)
         return payment_details
 
     def refund(self, transaction_id: str) -> bool:
-        if transaction_id in self.transactions:
-            self.transactions[transaction_id].status = PaymentStatus.REFUNDED
-            print(f"Refunding PayPal transaction {transaction_id}")
+        if self.transactions.transition(transaction_id, REFUNDABLE_STATUSES, PaymentStatus.REFUNDED):
+            if events.isEnabledFor(logging.INFO):
+                emit(logging.INFO, "Refunding PayPal transaction %s", transaction_id,
+                     event="payment.refunded", provider="PayPal", transaction_id=transaction_id)
             return True
         return False
 
     def get_status(self, transaction_id: str) -> PaymentStatus:
-        if transaction_id in self.transactions:
-            return self.transactions[transaction_id].status
-        return PaymentStatus.FAILED
+        status = self.transactions.get_status(transaction_id)
+        return status if status is not None else PaymentStatus.FAILED
 
 class CreditCardPayment(Payment):
-    def __init__(self, merchant_id: str, api_key: str):
+    max_amount = 5000
+
+    def __init__(self, merchant_id: str, api_key: str, ledger: Optional[TransactionLedger] = None):
         self.merchant_id = merchant_id
         self.api_key = api_key
-        self.transactions: Dict[str, PaymentDetails] = {}
+        self.transactions: TransactionLedger = ledger if ledger is not None else InMemoryLedger()
 
     def validate_payment(self, amount: float) -> bool:
-        return amount > 0 and amount <= 5000
+        return amount > 0 and amount <= self.max_amount
 
     def process_payment(self, amount: float, currency: str = "USD") -> PaymentDetails:
-        transaction_id = f"CC_{datetime.now().strftime('%Y%m%d%H%M%S')}"
+        transaction_id = transaction_ids.next_id("CC")
         payment_details = PaymentDetails(
             amount=amount,
             currency=currency,
@@ -137,33 +555,37 @@ class CreditCardPayment(Payment):
             timestamp=datetime.now(),
             status=PaymentStatus.COMPLETED
         )
-        self.transactions[transaction_id] = payment_details
-        print(f"Processing Credit Card payment of {amount} {currency}")
+        self.transactions.record(payment_details)
+        if events.isEnabledFor(logging.INFO):
+            emit(logging.INFO, "Processing Credit Card payment of %s %s", amount, currency,
+                 event="payment.processed", provider="Credit Card", transaction_id=transaction_id, amount=amount, currency=currency)
         return payment_details
 
     def refund(self, transaction_id: str) -> bool:
-        if transaction_id in self.transactions:
-            self.transactions[transaction_id].status = PaymentStatus.REFUNDED
-            print(f"Refunding Credit Card transaction {transaction_id}")
+        if self.transactions.transition(transaction_id, REFUNDABLE_STATUSES, PaymentStatus.REFUNDED):
+            if events.isEnabledFor(logging.INFO):
+                emit(logging.INFO, "Refunding Credit Card transaction %s", transaction_id,
+                     event="payment.refunded", provider="Credit Card", transaction_id=transaction_id)
             return True
         return False
 
     def get_status(self, transaction_id: str) -> PaymentStatus:
-        if transaction_id in self.transactions:
-            return self.transactions[transaction_id].status
-        return PaymentStatus.FAILED
+        status = self.transactions.get_status(transaction_id)
+        return status if status is not None else PaymentStatus.FAILED
 
 class BankTransferPayment(Payment):
-    def __init__(self, bank_id: str, account_number: str):
+    max_amount = 50000
+
+    def __init__(self, bank_id: str, account_number: str, ledger: Optional[TransactionLedger] = None):
         self.bank_id = bank_id
         self.account_number = account_number
-        self.transactions: Dict[str, PaymentDetails] = {}
+        self.transactions: TransactionLedger = ledger if ledger is not None else InMemoryLedger()
 
     def validate_payment(self, amount: float) -> bool:
-        return amount > 0 and amount <= 50000
+        return amount > 0 and amount <= self.max_amount
 
     def process_payment(self, amount: float, currency: str = "USD") -> PaymentDetails:
-        transaction_id = f"BT_{datetime.now().strftime('%Y%m%d%H%M%S')}"
+        transaction_id = transaction_ids.next_id("BT")
         payment_details = PaymentDetails(
             amount=amount,
             currency=currency,
@@ -172,23 +594,27 @@ class BankTransferPayment(Payment):
             timestamp=datetime.now(),
             status=PaymentStatus.PROCESSING
         )
-        self.transactions[transaction_id] = payment_details
-        print(f"Processing Bank Transfer payment of {amount} {currency}")
+        self.transactions.record(payment_details)
+        if events.isEnabledFor(logging.INFO):
+            emit(logging.INFO, "Processing Bank Transfer payment of %s %s", amount, currency,
+                 event="payment.processed", provider="Bank Transfer", transaction_id=transaction_id, amount=amount, currency=currency)
         return payment_details
 
     def refund(self, transaction_id: str) -> bool:
-        if transaction_id in self.transactions:
-            self.transactions[transaction_id].status = PaymentStatus.REFUNDED
-            print(f"Refunding Bank Transfer transaction {transaction_id}")
+        if self.transactions.transition(transaction_id, REFUNDABLE_STATUSES, PaymentStatus.REFUNDED):
+            if events.isEnabledFor(logging.INFO):
+                emit(logging.INFO, "Refunding Bank Transfer transaction %s", transaction_id,
+                     event="payment.refunded", provider="Bank Transfer", transaction_id=transaction_id)
             return True
         return False
 
     def get_status(self, transaction_id: str) -> PaymentStatus:
-        if transaction_id in self.transactions:
-            return self.transactions[transaction_id].status
-        return PaymentStatus.FAILED
+        status = self.transactions.get_status(transaction_id)
+        return status if status is not None else PaymentStatus.FAILED
 
 def main():
+    PaymentEvents.configure(background=False)
+
     # Crear instancias de los proveedores de pago
     paypal = PayPalPayment("client_id", "client_secret")
     credit_card = CreditCardPayment("merchant_id", "api_key")
@@ -0,0 +1,388 @@
+from functools import wraps
+import inspect
+from itertools import count
+import os
+import threading
+from time import perf_counter_ns
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+# Histograms use HDR-style log-linear buckets over nanoseconds: values below
+# 2**SUB_BUCKET_BITS get one bucket each, and every further power of two is
+# split into 2**SUB_BUCKET_BITS buckets, so any recorded value is off by at
+# most 1 / 2**SUB_BUCKET_BITS (about 3%) from its bucket's lower bound.
+SUB_BUCKET_BITS = 5
+SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+MAX_BITS = 40  # values up to about 18 minutes in nanoseconds
+BUCKET_COUNT = (MAX_BITS - SUB_BUCKET_BITS + 1) * SUB_BUCKETS
+
+# Upper bounds, in seconds, of the "le" buckets in the Prometheus export.
+EXPORT_BOUNDS = (
+    1e-7, 2.5e-7, 5e-7, 1e-6, 2.5e-6, 5e-6, 1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 5e-4,
+    1e-3, 2.5e-3, 5e-3, 1e-2, 2.5e-2, 5e-2, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+Labels = Tuple[Tuple[str, Any], ...]
+
+def bucket_index(value: int) -> int:
+    """
+    Get the histogram bucket of a value.
+    Args:
+        value: A duration in nanoseconds
+    Returns:
+        int: The index of the bucket the value falls into
+    """
+    if value < SUB_BUCKETS:
+        return value if value > 0 else 0
+    shift = value.bit_length() - SUB_BUCKET_BITS - 1
+    index = (shift + 1) * SUB_BUCKETS + (value >> shift) - SUB_BUCKETS
+    return index if index < BUCKET_COUNT else BUCKET_COUNT - 1
+
+def bucket_lower_bound(index: int) -> int:
+    """
+    Get the smallest value that falls into a bucket.
+    Args:
+        index: The bucket index
+    Returns:
+        int: The lower bound of the bucket in nanoseconds
+    """
+    if index < SUB_BUCKETS:
+        return index
+    shift = index // SUB_BUCKETS - 1
+    return (SUB_BUCKETS + index % SUB_BUCKETS) << shift
+
+def _label_text(labels: Labels) -> str:
+    if not labels:
+        return ""
+    pairs = ",".join(
+        '{}="{}"'.format(key, str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for key, value in labels
+    )
+    return "{" + pairs + "}"
+
+class _PerThread:
+    """
+    Base of metrics that keep one cell per thread and merge them on read.
+    Recording only touches the calling thread's cell, so it takes no lock;
+    the lock is taken once per thread, to register its cell, and by readers.
+    """
+
+    kind = ""
+
+    def __init__(self, name: str, labels: Dict[str, Any]):
+        self.name = name
+        self.labels: Labels = tuple(sorted(labels.items()))
+        self._local = threading.local()
+        self._cells: List[List[int]] = []
+        self._lock = threading.Lock()
+
+    def _make_cell(self) -> List[int]:
+        raise NotImplementedError
+
+    def _new_cell(self) -> List[int]:
+        cell = self._make_cell()
+        with self._lock:
+            self._cells.append(cell)
+        self._local.cell = cell
+        return cell
+
+    def _snapshot_cells(self) -> List[List[int]]:
+        with self._lock:
+            return list(self._cells)
+
+class Counter(_PerThread):
+    """A monotonically increasing count."""
+
+    kind = "counter"
+
+    def _make_cell(self) -> List[int]:
+        return [0]
+
+    def inc(self, amount: int = 1) -> None:
+        try:
+            cell = self._local.cell
+        except AttributeError:
+            cell = self._new_cell()
+        cell[0] += amount
+
+    @property
+    def value(self) -> int:
+        return sum(cell[0] for cell in self._snapshot_cells())
+
+class Histogram(_PerThread):
+    """
+    A latency distribution in nanoseconds over HDR-style buckets.
+    Each thread's cell is a list of bucket counts followed by the sum of all
+    recorded values.
+    """
+
+    kind = "histogram"
+
+    def _make_cell(self) -> List[int]:
+        return [0] * (BUCKET_COUNT + 1)
+
+    def record(self, value: int) -> None:
+        try:
+            cell = self._local.cell
+        except AttributeError:
+            cell = self._new_cell()
+        if value < SUB_BUCKETS:
+            index = value if value > 0 else 0
+        else:
+            shift = value.bit_length() - SUB_BUCKET_BITS - 1
+            index = (shift + 1) * SUB_BUCKETS + (value >> shift) - SUB_BUCKETS
+            if index >= BUCKET_COUNT:
+                index = BUCKET_COUNT - 1
+        cell[index] += 1
+        cell[BUCKET_COUNT] += value
+
+    def counts(self) -> Tuple[List[int], int]:
+        """
+        Get the bucket counts merged across threads.
+        Returns:
+            Tuple[List[int], int]: The count of every bucket and the sum of all values
+        """
+        merged = [0] * (BUCKET_COUNT + 1)
+        for cell in self._snapshot_cells():
+            for index, count in enumerate(cell):
+                if count:
+                    merged[index] += count
+        return merged[:BUCKET_COUNT], merged[BUCKET_COUNT]
+
+    @property
+    def count(self) -> int:
+        return sum(self.counts()[0])
+
+    def percentile(self, fraction: float) -> int:
+        """
+        Get a percentile of the recorded values.
+        Args:
+            fraction: The fraction of recordings, between 0 and 1
+        Returns:
+            int: The value in nanoseconds below which that fraction of recordings fall
+        """
+        counts, _ = self.counts()
+        total = sum(counts)
+        if not total:
+            return 0
+        rank = max(1, round(fraction * total))
+        seen = 0
+        for index, count in enumerate(counts):
+            seen += count
+            if seen >= rank:
+                return bucket_lower_bound(index)
+        return bucket_lower_bound(BUCKET_COUNT - 1)
+
+class MetricsRegistry:
+    """Named counters and histograms, exported together in Prometheus text format."""
+
+    def __init__(self, prefix: str):
+        self.prefix = prefix
+        self._metrics: Dict[Tuple[str, Labels], _PerThread] = {}
+        self._help: Dict[str, Tuple[str, str]] = {}
+        self._lock = threading.Lock()
+
+    def _get(self, metric_class: type, name: str, help_text: str, labels: Dict[str, Any]) -> Any:
+        name = f"{self.prefix}_{name}"
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            metric = self._metrics.get(key)
+            if metric is None:
+                metric = self._metrics[key] = metric_class(name, labels)
+                self._help.setdefault(name, (metric_class.kind, help_text))
+            return metric
+
+    def counter(self, name: str, help_text: str = "", **labels: Any) -> Counter:
+        return self._get(Counter, name, help_text, labels)
+
+    def histogram(self, name: str, help_text: str = "", **labels: Any) -> Histogram:
+        return self._get(Histogram, name, help_text, labels)
+
+    def to_prometheus(self) -> str:
+        """
+        Render every metric in the Prometheus text exposition format.
+        Returns:
+            str: The exposition text
+        """
+        with self._lock:
+            metrics = sorted(self._metrics.items(), key=lambda item: item[0])
+        lines: List[str] = []
+        written = set()
+        for (name, labels), metric in metrics:
+            kind, help_text = self._help[name]
+            if name not in written:
+                written.add(name)
+                if help_text:
+                    lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {kind}")
+            if kind == "counter":
+                lines.append(f"{name}{_label_text(labels)} {metric.value}")
+                continue
+            counts, total_ns = metric.counts()
+            bounds = iter(EXPORT_BOUNDS)
+            bound: Optional[float] = next(bounds)
+            cumulative = 0
+            for index, count in enumerate(counts):
+                # A bucket belongs under the first bound its lower edge is below.
+                while bound is not None and bucket_lower_bound(index) >= bound * 1e9:
+                    lines.append(f"{name}_bucket{_label_text(labels + (('le', repr(bound)),))} {cumulative}")
+                    bound = next(bounds, None)
+                cumulative += count
+            while bound is not None:
+                lines.append(f"{name}_bucket{_label_text(labels + (('le', repr(bound)),))} {cumulative}")
+                bound = next(bounds, None)
+            lines.append(f"{name}_bucket{_label_text(labels + (('le', '+Inf'),))} {cumulative}")
+            lines.append(f"{name}_sum{_label_text(labels)} {total_ns / 1e9!r}")
+            lines.append(f"{name}_count{_label_text(labels)} {cumulative}")
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str) -> None:
+        """
+        Write a snapshot for a node_exporter textfile collector.
+        Args:
+            path: The file to replace atomically with the snapshot
+        """
+        temporary = f"{path}.{os.getpid()}.tmp"
+        with open(temporary, "w", encoding="utf-8") as f:
+            f.write(self.to_prometheus())
+        os.replace(temporary, path)
+
+    def serve(self, port: int = 9464, host: str = "127.0.0.1") -> Any:
+        """
+        Serve snapshots at http://host:port/metrics from a daemon thread.
+        Args:
+            port: The port to listen on
+            host: The address to bind
+        Returns:
+            ThreadingHTTPServer: The running server
+        """
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        registry = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = registry.to_prometheus().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args: Any) -> None:
+                pass
+
+        server = ThreadingHTTPServer((host, port), MetricsHandler)
+        threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+        return server
+
+def timed(histogram: Histogram, errors: Optional[Counter] = None,
+          sample_every: int = 1) -> Callable[[Callable], Callable]:
+    """
+    Decorator recording call durations in histogram and failures in errors.
+    With sample_every set to N (a power of two), only every Nth call is timed
+    and the others just pass through; failures are counted on every call.
+    A timed call costs two clock reads and a histogram update on top of the
+    wrapper call, roughly a microsecond.
+    Args:
+        histogram: The histogram that receives call durations
+        errors: The counter incremented when a call raises
+        sample_every: Time one call in this many
+    Returns:
+        Callable: The decorator
+    """
+    if sample_every < 1 or sample_every & (sample_every - 1):
+        raise ValueError(f"sample_every must be a power of two: {sample_every}")
+    record = histogram.record
+
+    def decorate(function: Callable) -> Callable:
+        if sample_every == 1:
+            @wraps(function)
+            def wrapper(*args, **kwargs):
+                start = perf_counter_ns()
+                try:
+                    return function(*args, **kwargs)
+                except BaseException:
+                    if errors is not None:
+                        errors.inc()
+                    raise
+                finally:
+                    record(perf_counter_ns() - start)
+        else:
+            # next() on itertools.count is atomic under the GIL, so threads share it safely.
+            calls = count()
+            mask = sample_every - 1
+
+            @wraps(function)
+            def wrapper(*args, **kwargs):
+                if next(calls) & mask:
+                    start = None
+                else:
+                    start = perf_counter_ns()
+                try:
+                    return function(*args, **kwargs)
+                except BaseException:
+                    if errors is not None:
+                        errors.inc()
+                    raise
+                finally:
+                    if start is not None:
+                        record(perf_counter_ns() - start)
+
+        return wrapper
+    return decorate
+
+class Attachment:
+    """Instrumented methods of one target, restored by detach()."""
+
+    def __init__(self, target: Any, originals: Dict[str, Optional[Callable]]):
+        self.target = target
+        self._originals = originals
+
+    def detach(self) -> None:
+        """Put the original methods back; the target runs exactly as before attaching."""
+        for name, original in self._originals.items():
+            if original is None:
+                delattr(self.target, name)
+            else:
+                setattr(self.target, name, original)
+        self._originals = {}
+
+    def __enter__(self) -> "Attachment":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.detach()
+
+def attach(target: Any, methods: Iterable[str], registry: MetricsRegistry,
+           metric: str = "call_duration_seconds", sample_every: int = 1) -> Attachment:
+    """
+    Time calls to methods of a class or instance until the attachment is detached.
+    Every method gets a histogram labelled with the target and method name,
+    and a <metric>_errors_total counter. Classes are patched in place;
+    instances get the wrappers as instance attributes.
+    Args:
+        target: The class or instance to instrument
+        methods: Names of the methods to time
+        registry: The registry that owns the metrics
+        metric: The histogram name
+        sample_every: Passed on to timed()
+    Returns:
+        Attachment: Restores the original methods when detached
+    """
+    target_name = target.__name__ if inspect.isclass(target) else type(target).__name__
+    errors_metric = metric.replace("_seconds", "") + "_errors_total"
+    originals: Dict[str, Optional[Callable]] = {}
+    for name in methods:
+        # None marks an inherited method, restored by deleting the wrapper.
+        original = vars(target).get(name) if hasattr(target, "__dict__") else None
+        function = getattr(target, name)
+        histogram = registry.histogram(metric, "Duration of instrumented calls.", target=target_name, method=name)
+        errors = registry.counter(errors_metric, "Instrumented calls that raised.", target=target_name, method=name)
+        originals[name] = original
+        setattr(target, name, timed(histogram, errors, sample_every)(function))
+    return Attachment(target, originals)
+
+# Registry that the payment modules and their benchmarks report to.
+default_registry = MetricsRegistry("payments")
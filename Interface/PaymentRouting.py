@@ -0,0 +1,197 @@
+import threading
+import time
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional
+
+import PaymentEvents
+from PaymentInterface import (BankTransferPayment, CreditCardPayment, Payment, PaymentDetails, PaymentStatus,
+                              PayPalPayment)
+
+if TYPE_CHECKING:
+    from CurrencyExchange import FxRates
+
+class CircuitState(Enum):
+    CLOSED = "CLOSED"
+    OPEN = "OPEN"
+    HALF_OPEN = "HALF_OPEN"
+
+class CircuitBreaker:
+    """
+    Stops sending traffic to a provider after repeated failures.
+    After failure_threshold consecutive failures the circuit opens; once
+    reset_timeout seconds have passed a single trial call is let through
+    (half-open), and its outcome closes or re-opens the circuit.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CircuitState.CLOSED
+        self.failures = 0
+        self._opened_at = 0.0
+        self._clock = clock
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == CircuitState.CLOSED:
+                return True
+            if self.state == CircuitState.OPEN and self._clock() - self._opened_at >= self.reset_timeout:
+                self.state = CircuitState.HALF_OPEN
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self.state = CircuitState.CLOSED
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self.state == CircuitState.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = CircuitState.OPEN
+                self._opened_at = self._clock()
+
+@dataclass
+class ProviderRoute:
+    """A provider with its fees and live health statistics."""
+    name: str
+    provider: Payment
+    fee_rate: float = 0.0
+    fixed_fee: float = 0.0
+    breaker: CircuitBreaker = field(default_factory=CircuitBreaker)
+    latency: float = 0.0
+    error_rate: float = 0.0
+    calls: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False, compare=False)
+
+    def fee(self, amount: float) -> float:
+        return self.fixed_fee + amount * self.fee_rate
+
+    def observe(self, latency: float, failed: bool, smoothing: float) -> None:
+        """Fold one call into the exponentially weighted latency and error rate."""
+        with self._lock:
+            if self.calls == 0:
+                self.latency = latency
+            else:
+                self.latency += smoothing * (latency - self.latency)
+            self.error_rate += smoothing * ((1.0 if failed else 0.0) - self.error_rate)
+            self.calls += 1
+
+class RoutingPaymentProcessor:
+    """
+    Picks a provider per transaction and fails over when one misbehaves.
+    Providers that accept the amount and whose circuit is not open are tried
+    cheapest first, where the score is the fee plus latency_cost per second of
+    observed latency, inflated by the observed error rate. A call that raises
+    or takes longer than slow_call seconds counts as a failure for the circuit
+    breaker; a raising call moves on to the next provider. Calls are
+    synchronous, so a slow call still completes, but its provider quickly
+    drops down the ranking and is then cut off by its breaker.
+    Refunds and status checks go to the provider whose ledger holds the
+    transaction, so the router itself keeps no per-transaction state.
+    """
+
+    def __init__(self, routes: Optional[List[ProviderRoute]] = None, latency_cost: float = 1.0,
+                 slow_call: float = 2.0, smoothing: float = 0.2, clock: Callable[[], float] = time.perf_counter,
+                 fx: Optional["FxRates"] = None):
+        """
+        Args:
+            fx: Exchange rates (see CurrencyExchange.py); when given, amounts are
+                converted to each provider's limit_currency before validation
+        """
+        self.routes: List[ProviderRoute] = list(routes or [])
+        self.latency_cost = latency_cost
+        self.slow_call = slow_call
+        self.smoothing = smoothing
+        self._clock = clock
+        self.fx = fx
+
+    def add_provider(self, name: str, provider: Payment, fee_rate: float = 0.0, fixed_fee: float = 0.0,
+                     breaker: Optional[CircuitBreaker] = None) -> ProviderRoute:
+        route = ProviderRoute(name, provider, fee_rate, fixed_fee, breaker or CircuitBreaker())
+        self.routes.append(route)
+        return route
+
+    def rank(self, amount: float, currency: str = "USD") -> List[ProviderRoute]:
+        """
+        Get the providers that can take an amount, best first.
+        Args:
+            amount: The amount to route
+            currency: The currency of the amount
+        Returns:
+            List[ProviderRoute]: Eligible routes ordered by score
+        """
+        limit_amounts: Dict[str, float] = {}
+        eligible = []
+        for route in self.routes:
+            limit_currency = route.provider.limit_currency
+            if limit_currency not in limit_amounts:
+                limit_amounts[limit_currency] = (
+                    amount if self.fx is None or currency == limit_currency
+                    else self.fx.convert(amount, currency, limit_currency)
+                )
+            if route.provider.validate_payment(limit_amounts[limit_currency]):
+                eligible.append(route)
+        return sorted(eligible, key=lambda route: (route.fee(amount) + self.latency_cost * route.latency)
+                      * (1.0 + route.error_rate))
+
+    def process_transaction(self, amount: float, currency: str = "USD") -> PaymentDetails:
+        candidates = self.rank(amount, currency)
+        if not candidates:
+            raise ValueError(f"Invalid payment amount: {amount} {currency}")
+
+        last_error: Optional[Exception] = None
+        for route in candidates:
+            if not route.breaker.allow():
+                continue
+            start = self._clock()
+            try:
+                details = route.provider.process_payment(amount, currency)
+            except Exception as e:
+                route.observe(self._clock() - start, True, self.smoothing)
+                route.breaker.record_failure()
+                last_error = e
+                continue
+            elapsed = self._clock() - start
+            slow = elapsed > self.slow_call
+            route.observe(elapsed, slow, self.smoothing)
+            if slow:
+                route.breaker.record_failure()
+            else:
+                route.breaker.record_success()
+            return details
+        raise RuntimeError(f"No payment provider could process {amount} {currency}") from last_error
+
+    def _owner(self, transaction_id: str) -> Optional[ProviderRoute]:
+        """Find the route whose provider recorded a transaction."""
+        for route in self.routes:
+            ledger = getattr(route.provider, "transactions", None)
+            if ledger is not None and transaction_id in ledger:
+                return route
+        return None
+
+    def request_refund(self, transaction_id: str) -> bool:
+        route = self._owner(transaction_id)
+        return route.provider.refund(transaction_id) if route is not None else False
+
+    def check_status(self, transaction_id: str) -> PaymentStatus:
+        route = self._owner(transaction_id)
+        return route.provider.get_status(transaction_id) if route is not None else PaymentStatus.FAILED
+
+def main():
+    PaymentEvents.configure(background=False)
+    router = RoutingPaymentProcessor()
+    router.add_provider("credit_card", CreditCardPayment("merchant_id", "api_key"), fee_rate=0.029, fixed_fee=0.30)
+    router.add_provider("paypal", PayPalPayment("client_id", "client_secret"), fee_rate=0.034, fixed_fee=0.49)
+    router.add_provider("bank_transfer", BankTransferPayment("bank_123", "acc_456"), fixed_fee=25.0)
+
+    for amount in (100.00, 7500.00, 20000.00):
+        payment = router.process_transaction(amount, "USD")
+        print(f"{amount} routed, status: {router.check_status(payment.transaction_id)}")
+
+if __name__ == "__main__":
+    main()
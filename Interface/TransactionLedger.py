@@ -0,0 +1,455 @@
+import hashlib
+import mmap
+import os
+import sqlite3
+import struct
+import threading
+from bisect import bisect_left, insort
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+from PaymentInterface import (SETTLED_STATUSES, STATUS_CODES, STATUSES, PaymentDetails, PaymentStatus,
+                              TransactionLedger)
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+def to_micros(timestamp: datetime) -> int:
+    """Naive timestamps are stored as exact microseconds since 1970-01-01."""
+    return (timestamp - _EPOCH) // _MICROSECOND
+
+def from_micros(micros: int) -> datetime:
+    return _EPOCH + timedelta(microseconds=micros)
+
+class MmapLogLedger(TransactionLedger):
+    """
+    Append-only transaction log with a memory-mapped, on-disk hash index.
+    Every record() or update_status() appends the full record to
+    <directory>/ledger.log; the latest one wins. <directory>/ledger.idx is an
+    open-addressing hash table mapping a 64-bit hash of the transaction ID to
+    the offset of its latest record, so get_status() is one probe and one
+    read no matter how large the log is. Reopening only replays the part of
+    the log written after the index was last updated. The status and
+    timestamp indexes are kept in memory and built on the first range query.
+    """
+
+    # Record: size, amount, timestamp (us), status, ID/currency/description lengths.
+    _RECORD = struct.Struct("<IdqBHHH")
+    # Index header: magic, capacity, used slots, indexed log size.
+    _HEADER = struct.Struct("<8sQQQ")
+    _SLOT = struct.Struct("<QQ")
+    _MAGIC = b"PAYIDX01"
+
+    def __init__(self, directory: str, initial_capacity: int = 1 << 16):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self._lock = threading.RLock()
+        self._log_path = os.path.join(directory, "ledger.log")
+        self._index_path = os.path.join(directory, "ledger.idx")
+        self._log = open(self._log_path, "a+b")
+        self._log_size = self._log.seek(0, os.SEEK_END)
+        self._log_map: Optional[mmap.mmap] = None
+        self._by_status: Optional[Dict[PaymentStatus, Set[str]]] = None
+        self._by_time: Optional[List[Tuple[int, str]]] = None
+        self._open_index(initial_capacity)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def record(self, details: PaymentDetails) -> None:
+        with self._lock:
+            previous = self._lookup(details.transaction_id)
+            offset = self._append(details)
+            self._store(details.transaction_id, offset)
+            if self._by_status is not None:
+                if previous is not None:
+                    self._unindex(previous[1])
+                self._index_secondary(details)
+
+    def get(self, transaction_id: str) -> Optional[PaymentDetails]:
+        with self._lock:
+            found = self._lookup(transaction_id)
+            return found[1] if found is not None else None
+
+    def update_status(self, transaction_id: str, status: PaymentStatus) -> bool:
+        with self._lock:
+            found = self._lookup(transaction_id)
+            if found is None:
+                return False
+            details = found[1]
+            if self._by_status is not None:
+                self._by_status[details.status].discard(transaction_id)
+                self._by_status.setdefault(status, set()).add(transaction_id)
+            details.status = status
+            self._store(transaction_id, self._append(details))
+            return True
+
+    def transition(self, transaction_id: str, allowed_from: Sequence[PaymentStatus], status: PaymentStatus) -> bool:
+        with self._lock:
+            return super().transition(transaction_id, allowed_from, status)
+
+    def find_by_status(self, status: PaymentStatus) -> List[PaymentDetails]:
+        with self._lock:
+            self._build_secondary()
+            return [self._lookup(transaction_id)[1] for transaction_id in self._by_status.get(status, ())]
+
+    def find_between(self, start: datetime, end: datetime) -> List[PaymentDetails]:
+        with self._lock:
+            self._build_secondary()
+            low = bisect_left(self._by_time, (to_micros(start), ""))
+            high = bisect_left(self._by_time, (to_micros(end), ""))
+            return [self._lookup(transaction_id)[1] for _, transaction_id in self._by_time[low:high]]
+
+    def compact(self, before: datetime) -> int:
+        """Rewrite the log with only the latest record of each kept transaction."""
+        cutoff = to_micros(before)
+        with self._lock:
+            kept = []
+            removed = 0
+            for offset in self._slot_offsets():
+                details = self._read(offset)
+                if details.status in SETTLED_STATUSES and to_micros(details.timestamp) < cutoff:
+                    removed += 1
+                else:
+                    kept.append(details)
+            kept.sort(key=lambda details: to_micros(details.timestamp))
+            compact_path = self._log_path + ".compact"
+            with open(compact_path, "wb") as compacted:
+                for details in kept:
+                    compacted.write(self._encode(details))
+                compacted.flush()
+                os.fsync(compacted.fileno())
+            self._close_files()
+            os.replace(compact_path, self._log_path)
+            os.remove(self._index_path)
+            self._log = open(self._log_path, "a+b")
+            self._log_size = self._log.seek(0, os.SEEK_END)
+            self._by_status = self._by_time = None
+            self._open_index(max(1 << 16, len(kept) * 2))
+            return removed
+
+    def flush(self) -> None:
+        """Force the log and the index to disk."""
+        with self._lock:
+            self._log.flush()
+            os.fsync(self._log.fileno())
+            self._index.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            self._log.flush()
+            self._close_files()
+
+    def _close_files(self) -> None:
+        if self._log_map is not None:
+            self._log_map.close()
+            self._log_map = None
+        self._index.close()
+        self._index_file.close()
+        self._log.close()
+
+    @staticmethod
+    def _hash(transaction_id: str) -> int:
+        # Zero marks an empty slot, so real keys always have the top bit set.
+        digest = hashlib.blake2b(transaction_id.encode(), digest_size=8).digest()
+        return int.from_bytes(digest, "little") | (1 << 63)
+
+    @classmethod
+    def _encode(cls, details: PaymentDetails) -> bytes:
+        transaction_id = details.transaction_id.encode()
+        currency = details.currency.encode()
+        description = details.description.encode()
+        size = cls._RECORD.size + len(transaction_id) + len(currency) + len(description)
+        header = cls._RECORD.pack(size, details.amount, to_micros(details.timestamp), STATUS_CODES[details.status],
+                                  len(transaction_id), len(currency), len(description))
+        return header + transaction_id + currency + description
+
+    def _append(self, details: PaymentDetails) -> int:
+        offset = self._log_size
+        data = self._encode(details)
+        self._log.write(data)
+        self._log_size += len(data)
+        return offset
+
+    def _read(self, offset: int) -> PaymentDetails:
+        if self._log_map is None or offset + self._RECORD.size > len(self._log_map):
+            self._remap()
+        log_map = self._log_map
+        size, amount, micros, status, id_length, currency_length, description_length = \
+            self._RECORD.unpack_from(log_map, offset)
+        if offset + size > len(log_map):
+            self._remap()
+            log_map = self._log_map
+        start = offset + self._RECORD.size
+        transaction_id = log_map[start:start + id_length].decode()
+        start += id_length
+        currency = log_map[start:start + currency_length].decode()
+        start += currency_length
+        description = log_map[start:start + description_length].decode()
+        return PaymentDetails(amount, currency, description, transaction_id, from_micros(micros), STATUSES[status])
+
+    def _remap(self) -> None:
+        self._log.flush()
+        if self._log_map is not None:
+            self._log_map.close()
+        self._log_map = mmap.mmap(self._log.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def _open_index(self, initial_capacity: int) -> None:
+        exists = os.path.exists(self._index_path)
+        self._index_file = open(self._index_path, "r+b" if exists else "w+b")
+        if not exists:
+            capacity = 1 << max(initial_capacity - 1, 1).bit_length()
+            self._index_file.truncate(self._HEADER.size + capacity * self._SLOT.size)
+        self._index = mmap.mmap(self._index_file.fileno(), 0)
+        if exists:
+            magic, self._capacity, self._count, indexed_size = self._HEADER.unpack_from(self._index, 0)
+            if magic != self._MAGIC:
+                raise ValueError(f"Not a ledger index: {self._index_path}")
+            if indexed_size > self._log_size:
+                # The log lost writes the index had seen (e.g. a crash before a flush): re-index it all.
+                self._index[self._HEADER.size:] = bytes(self._capacity * self._SLOT.size)
+                self._count, indexed_size = 0, 0
+        else:
+            self._capacity, self._count, indexed_size = capacity, 0, 0
+        self._replay(indexed_size)
+
+    def _replay(self, offset: int) -> None:
+        """
+        Index the records appended after the index was last written.
+        A record cut short by a crash mid-write can only be the last one; the
+        log is truncated before it so appends continue from a whole record.
+        """
+        while offset < self._log_size:
+            size = self._record_size(offset)
+            if size is None:
+                self._truncate_log(offset)
+                break
+            details = self._read(offset)
+            self._store(details.transaction_id, offset)
+            offset += size
+        self._write_header()
+
+    def _record_size(self, offset: int) -> Optional[int]:
+        """Get the size of the record at offset, or None if it runs past the end of the log."""
+        if offset + self._RECORD.size > self._log_size:
+            return None
+        if self._log_map is None or offset + self._RECORD.size > len(self._log_map):
+            self._remap()
+        size, _, _, status, id_length, currency_length, description_length = \
+            self._RECORD.unpack_from(self._log_map, offset)
+        if (size != self._RECORD.size + id_length + currency_length + description_length
+                or offset + size > self._log_size or status >= len(STATUSES)):
+            return None
+        return size
+
+    def _truncate_log(self, size: int) -> None:
+        if self._log_map is not None:
+            self._log_map.close()
+            self._log_map = None
+        self._log.flush()
+        os.ftruncate(self._log.fileno(), size)
+        self._log_size = size
+
+    def _write_header(self) -> None:
+        self._HEADER.pack_into(self._index, 0, self._MAGIC, self._capacity, self._count, self._log_size)
+
+    def _probe(self, key: int):
+        """Yield slot positions for a key in linear probing order."""
+        mask = self._capacity - 1
+        slot = key & mask
+        while True:
+            yield self._HEADER.size + slot * self._SLOT.size
+            slot = (slot + 1) & mask
+
+    def _lookup(self, transaction_id: str) -> Optional[Tuple[int, PaymentDetails]]:
+        key = self._hash(transaction_id)
+        for position in self._probe(key):
+            slot_key, offset = self._SLOT.unpack_from(self._index, position)
+            if slot_key == 0:
+                return None
+            if slot_key == key:
+                details = self._read(offset)
+                if details.transaction_id == transaction_id:
+                    return offset, details
+
+    def _store(self, transaction_id: str, offset: int) -> None:
+        key = self._hash(transaction_id)
+        for position in self._probe(key):
+            slot_key, slot_offset = self._SLOT.unpack_from(self._index, position)
+            if slot_key == 0:
+                self._SLOT.pack_into(self._index, position, key, offset)
+                self._count += 1
+                break
+            if slot_key == key and self._read(slot_offset).transaction_id == transaction_id:
+                self._SLOT.pack_into(self._index, position, key, offset)
+                break
+        self._write_header()
+        if self._count * 2 > self._capacity:
+            self._grow()
+
+    def _slot_offsets(self) -> List[int]:
+        offsets = []
+        for slot in range(self._capacity):
+            slot_key, offset = self._SLOT.unpack_from(self._index, self._HEADER.size + slot * self._SLOT.size)
+            if slot_key:
+                offsets.append(offset)
+        return offsets
+
+    def _grow(self) -> None:
+        """Double the index capacity, keeping the load factor at or below one half."""
+        entries = []
+        for slot in range(self._capacity):
+            slot_key, offset = self._SLOT.unpack_from(self._index, self._HEADER.size + slot * self._SLOT.size)
+            if slot_key:
+                entries.append((slot_key, offset))
+        self._capacity *= 2
+        self._index.close()
+        self._index_file.truncate(self._HEADER.size + self._capacity * self._SLOT.size)
+        self._index = mmap.mmap(self._index_file.fileno(), 0)
+        self._index[self._HEADER.size:] = bytes(self._capacity * self._SLOT.size)
+        mask = self._capacity - 1
+        for slot_key, offset in entries:
+            slot = slot_key & mask
+            while self._SLOT.unpack_from(self._index, self._HEADER.size + slot * self._SLOT.size)[0]:
+                slot = (slot + 1) & mask
+            self._SLOT.pack_into(self._index, self._HEADER.size + slot * self._SLOT.size, slot_key, offset)
+        self._write_header()
+
+    def _build_secondary(self) -> None:
+        if self._by_status is not None:
+            return
+        self._by_status = {}
+        self._by_time = []
+        for offset in self._slot_offsets():
+            self._index_secondary(self._read(offset))
+        self._by_time.sort()
+
+    def _index_secondary(self, details: PaymentDetails) -> None:
+        self._by_status.setdefault(details.status, set()).add(details.transaction_id)
+        insort(self._by_time, (to_micros(details.timestamp), details.transaction_id))
+
+    def _unindex(self, details: PaymentDetails) -> None:
+        self._by_status.get(details.status, set()).discard(details.transaction_id)
+        entry = (to_micros(details.timestamp), details.transaction_id)
+        position = bisect_left(self._by_time, entry)
+        if position < len(self._by_time) and self._by_time[position] == entry:
+            del self._by_time[position]
+
+class SQLiteLedger(TransactionLedger):
+    """
+    SQLite ledger in WAL mode with indexes on status and timestamp.
+    Writes are committed every batch_size changes (and on flush/close), so a
+    crash can lose at most the last uncommitted batch.
+    """
+
+    def __init__(self, path: str, batch_size: int = 1000):
+        self.path = path
+        self.batch_size = batch_size
+        self._pending = 0
+        self._lock = threading.RLock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.executescript("""
+            CREATE TABLE IF NOT EXISTS transactions (
+                transaction_id TEXT PRIMARY KEY,
+                amount REAL NOT NULL,
+                currency TEXT NOT NULL,
+                description TEXT NOT NULL,
+                timestamp INTEGER NOT NULL,
+                status INTEGER NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS transactions_by_status ON transactions (status, timestamp);
+            CREATE INDEX IF NOT EXISTS transactions_by_timestamp ON transactions (timestamp);
+        """)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM transactions").fetchone()[0]
+
+    def record(self, details: PaymentDetails) -> None:
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO transactions VALUES (?, ?, ?, ?, ?, ?)",
+                (details.transaction_id, details.amount, details.currency, details.description,
+                 to_micros(details.timestamp), STATUS_CODES[details.status]),
+            )
+            self._written()
+
+    def get(self, transaction_id: str) -> Optional[PaymentDetails]:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT * FROM transactions WHERE transaction_id = ?", (transaction_id,)
+            ).fetchone()
+        return self._details(row) if row is not None else None
+
+    def get_status(self, transaction_id: str) -> Optional[PaymentStatus]:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT status FROM transactions WHERE transaction_id = ?", (transaction_id,)
+            ).fetchone()
+        return STATUSES[row[0]] if row is not None else None
+
+    def update_status(self, transaction_id: str, status: PaymentStatus) -> bool:
+        with self._lock:
+            cursor = self._connection.execute(
+                "UPDATE transactions SET status = ? WHERE transaction_id = ?", (STATUS_CODES[status], transaction_id)
+            )
+            self._written()
+            return cursor.rowcount > 0
+
+    def transition(self, transaction_id: str, allowed_from: Sequence[PaymentStatus], status: PaymentStatus) -> bool:
+        codes = [STATUS_CODES[allowed] for allowed in allowed_from]
+        with self._lock:
+            cursor = self._connection.execute(
+                f"UPDATE transactions SET status = ? WHERE transaction_id = ? "
+                f"AND status IN ({', '.join('?' * len(codes))})",
+                (STATUS_CODES[status], transaction_id, *codes),
+            )
+            self._written()
+            return cursor.rowcount > 0
+
+    def find_by_status(self, status: PaymentStatus) -> List[PaymentDetails]:
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT * FROM transactions WHERE status = ? ORDER BY timestamp", (STATUS_CODES[status],)
+            ).fetchall()
+        return [self._details(row) for row in rows]
+
+    def find_between(self, start: datetime, end: datetime) -> List[PaymentDetails]:
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT * FROM transactions WHERE timestamp >= ? AND timestamp < ? ORDER BY timestamp",
+                (to_micros(start), to_micros(end)),
+            ).fetchall()
+        return [self._details(row) for row in rows]
+
+    def compact(self, before: datetime) -> int:
+        with self._lock:
+            cursor = self._connection.execute(
+                "DELETE FROM transactions WHERE status IN (?, ?) AND timestamp < ?",
+                (*(STATUS_CODES[status] for status in SETTLED_STATUSES), to_micros(before)),
+            )
+            self.flush()
+            return cursor.rowcount
+
+    def flush(self) -> None:
+        """Commit pending writes."""
+        with self._lock:
+            self._connection.commit()
+            self._pending = 0
+
+    def close(self) -> None:
+        with self._lock:
+            self.flush()
+            self._connection.close()
+
+    def _written(self) -> None:
+        self._pending += 1
+        if self._pending >= self.batch_size:
+            self.flush()
+
+    @staticmethod
+    def _details(row) -> PaymentDetails:
+        transaction_id, amount, currency, description, micros, status = row
+        return PaymentDetails(amount, currency, description, transaction_id, from_micros(micros), STATUSES[status])
@@ -0,0 +1,10 @@
+"""Make the shipment_system package and the payment modules importable."""
+
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+for directory in (os.path.join(ROOT, "AbstractFactory"), os.path.join(ROOT, "Interface")):
+    if directory not in sys.path:
+        sys.path.insert(0, directory)
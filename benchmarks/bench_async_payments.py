@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Async Payment Benchmark
+Runs the same number of payments against a gateway with fixed latency,
+once with the synchronous PaymentProcessor on a thread pool and once with
+AsyncPaymentProcessor on a single event loop.
+"""
+
+import argparse
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import _paths  # noqa: F401
+from AsyncPaymentInterface import AsyncPaymentProcessor, SimulatedAsyncGateway
+from PaymentInterface import Payment, PaymentDetails, PaymentProcessor, PaymentStatus, transaction_ids
+
+
+class BlockingGateway(Payment):
+    """Synchronous gateway stand-in that blocks its thread for the round trip."""
+
+    def __init__(self, latency):
+        self.latency = latency
+        self.transactions = {}
+
+    def validate_payment(self, amount):
+        return 0 < amount <= 10000
+
+    def process_payment(self, amount, currency="USD"):
+        time.sleep(self.latency)
+        transaction_id = transaction_ids.next_id("SIM")
+        details = PaymentDetails(amount, currency, "Simulated gateway payment", transaction_id,
+                                 datetime.now(), PaymentStatus.COMPLETED)
+        self.transactions[transaction_id] = details
+        return details
+
+    def refund(self, transaction_id):
+        return False
+
+    def get_status(self, transaction_id):
+        return PaymentStatus.FAILED
+
+
+def run_threads(count, latency, threads):
+    processor = PaymentProcessor(BlockingGateway(latency))
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        list(executor.map(processor.process_transaction, [100.0] * count))
+    return time.perf_counter() - start
+
+
+async def run_async(count, latency, concurrency):
+    processor = AsyncPaymentProcessor(SimulatedAsyncGateway(latency=latency), max_concurrency=concurrency)
+    start = time.perf_counter()
+    results = await processor.process_batch([100.0] * count)
+    elapsed = time.perf_counter() - start
+    failures = sum(1 for result in results if isinstance(result, Exception))
+    if failures:
+        raise SystemExit(f"{failures} async payments failed")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--count", type=int, default=5000, help="payments per run")
+    parser.add_argument("--latency", type=float, default=0.05, help="gateway round trip in seconds")
+    parser.add_argument("--threads", type=int, default=64, help="thread pool size for the sync run")
+    parser.add_argument("--concurrency", type=int, default=2000, help="in-flight limit for the async run")
+    args = parser.parse_args()
+
+    threaded = run_threads(args.count, args.latency, args.threads)
+    print(f"{f'{args.threads} threads, sync':<28} {args.count / threaded:>10,.0f} payments/s")
+    asynchronous = asyncio.run(run_async(args.count, args.latency, args.concurrency))
+    print(f"{f'1 event loop, {args.concurrency} in flight':<28} {args.count / asynchronous:>10,.0f} payments/s"
+          f"  ({threaded / asynchronous:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
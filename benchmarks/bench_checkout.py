@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Checkout Benchmark
+Charges a stream of orders two ways: one calculate_cost() and one
+process_transaction() per parcel, and through CheckoutPipeline, which
+groups charges per customer and payment method into batched settlements.
+Each provider call costs a fixed simulated gateway latency.
+"""
+
+import argparse
+import random
+import time
+
+import _paths  # noqa: F401
+from PaymentInterface import CreditCardPayment, PaymentProcessor, PayPalPayment, ShardedLedger
+from shipment_system.checkout import CheckoutPipeline, Order
+from shipment_system.factories import default_registry
+
+
+def with_latency(provider_class, latency):
+    class Provider(provider_class):
+        def process_payment(self, amount, currency="USD"):
+            time.sleep(latency)
+            return super().process_payment(amount, currency)
+    return Provider
+
+
+def make_processors(latency):
+    return {
+        "paypal": PaymentProcessor(with_latency(PayPalPayment, latency)("client_id", "client_secret",
+                                                                          ledger=ShardedLedger())),
+        "card": PaymentProcessor(with_latency(CreditCardPayment, latency)("merchant_id", "api_key",
+                                                                            ledger=ShardedLedger())),
+    }
+
+
+def make_orders(count, customers):
+    generator = random.Random(7)
+    return [
+        Order(f"order-{index}", f"customer-{generator.randrange(customers)}", generator.choice(("paypal", "card")),
+              generator.choice(("DHL", "FedEx", "UPS")), generator.choice(("air", "ground", "water")),
+              "Rotterdam, Netherlands", round(generator.uniform(0.5, 40.0), 1))
+        for index in range(count)
+    ]
+
+
+def per_parcel(orders, processors):
+    for order in orders:
+        shipment, _ = default_registry.create(order.carrier, order.shipment_type, order.destination, order.weight)
+        processors[order.payment_method].process_transaction(round(shipment.calculate_cost(), 2), "USD")
+    return len(orders)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--orders", type=int, default=20000)
+    parser.add_argument("--customers", type=int, default=500)
+    parser.add_argument("--latency", type=float, default=0.0002, help="seconds per provider call")
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args()
+
+    orders = make_orders(args.orders, args.customers)
+
+    start = time.perf_counter()
+    transactions = per_parcel(orders, make_processors(args.latency))
+    elapsed = time.perf_counter() - start
+    print(f"{'per parcel':<10} {transactions:>8,} transactions  {elapsed:7.2f}s  "
+          f"{elapsed / args.orders * 1e6:8.1f} us/order")
+
+    pipeline = CheckoutPipeline(make_processors(args.latency), max_concurrency=args.concurrency)
+    start = time.perf_counter()
+    failed = sum(result.error is not None for result in pipeline.run(orders))
+    elapsed = time.perf_counter() - start
+    metrics = pipeline.metrics
+    print(f"{'pipeline':<10} {metrics.settlements:>8,} transactions  {elapsed:7.2f}s  "
+          f"{elapsed / args.orders * 1e6:8.1f} us/order  "
+          f"({metrics.orders_per_transaction:.1f} orders/transaction, {metrics.batches} batches, {failed} failed)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Concurrent Ledger Stress Test
+Threads share one provider, process payments, then all race to refund
+every transaction. Each transaction must be refunded exactly once; the
+run reports correctness and throughput per ledger, shard count and thread
+count.
+"""
+
+import argparse
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import _paths  # noqa: F401
+from PaymentInterface import InMemoryLedger, PaymentStatus, PayPalPayment, ShardedLedger
+
+
+def stress(ledger, threads, payments):
+    provider = PayPalPayment("client_id", "client_secret", ledger=ledger)
+    per_thread = payments // threads
+
+    def pay(_):
+        return [provider.process_payment(25.0, "USD").transaction_id for _ in range(per_thread)]
+
+    def refund_all(transaction_ids):
+        return sum(provider.refund(transaction_id) for transaction_id in transaction_ids)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        transaction_ids = [tid for chunk in executor.map(pay, range(threads)) for tid in chunk]
+        refunded = sum(executor.map(refund_all, [transaction_ids] * threads))
+    elapsed = time.perf_counter() - start
+
+    correct = (
+        len(ledger) == len(transaction_ids)
+        and refunded == len(transaction_ids)
+        and all(provider.get_status(tid) is PaymentStatus.REFUNDED for tid in transaction_ids)
+    )
+    operations = len(transaction_ids) * (1 + threads)
+    return correct, refunded - len(transaction_ids), operations / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--payments", type=int, default=40000)
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--shards", type=int, nargs="+", default=[1, 16])
+    parser.add_argument("--switch-interval", type=float, default=1e-6,
+                        help="sys.setswitchinterval value; small values provoke races")
+    args = parser.parse_args()
+    sys.setswitchinterval(args.switch_interval)
+
+    ledgers = [("InMemoryLedger", InMemoryLedger)]
+    ledgers += [(f"ShardedLedger({shards})", lambda shards=shards: ShardedLedger(shards)) for shards in args.shards]
+    print(f"{'ledger':<18} {'threads':>7} {'correct':>8} {'double refunds':>15} {'ops/s':>12}")
+    for label, make_ledger in ledgers:
+        for threads in args.threads:
+            correct, doubled, rate = stress(make_ledger(), threads, args.payments)
+            print(f"{label:<18} {threads:>7} {str(correct):>8} {doubled:>15,} {rate:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
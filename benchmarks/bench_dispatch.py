@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Factory Dispatch Benchmark
+Compares the per-shipment cost of the original if/elif dispatch in
+create_and_configure_shipment with the table-driven FactoryRegistry.
+"""
+
+import argparse
+import timeit
+
+import _paths  # noqa: F401
+from shipment_system.factories import DHLFactory, FedExFactory, UPSFactory, default_registry
+from shipment_system.products.dhl.dhl_air_shipment import DHLAirShipment
+from shipment_system.products.fedex.fedex_ground_shipment import FedExGroundShipment
+from shipment_system.products.ups.ups_water_shipment import UPSWaterShipment
+
+REQUESTS = [
+    ("DHL", "air", "Tokyo, Japan", 10.5, {"express": True}),
+    ("FedEx", "ground", "Chicago, USA", 25.0, {"local": True}),
+    ("UPS", "water", "Rotterdam, Netherlands", 1500.0, {"freight_forwarding": True}),
+]
+
+
+def legacy_create_and_configure_shipment(factory_name, shipment_type, destination, weight, **kwargs):
+    """The dispatch code create_and_configure_shipment used before the registry."""
+    if factory_name.lower() == "dhl":
+        factory = DHLFactory()
+    elif factory_name.lower() == "fedex":
+        factory = FedExFactory()
+    elif factory_name.lower() == "ups":
+        factory = UPSFactory()
+    else:
+        raise ValueError(f"Unknown factory: {factory_name}")
+
+    if shipment_type.lower() == "air":
+        shipment = factory.create_air_shipment()
+    elif shipment_type.lower() == "ground":
+        shipment = factory.create_ground_shipment()
+    elif shipment_type.lower() == "water":
+        shipment = factory.create_water_shipment()
+    else:
+        raise ValueError(f"Unknown shipment type: {shipment_type}")
+
+    shipment.set_destination(destination)
+    shipment.set_weight(weight)
+
+    if isinstance(shipment, DHLAirShipment) and "express" in kwargs:
+        shipment.set_express_air(kwargs["express"])
+    if isinstance(shipment, FedExGroundShipment) and "local" in kwargs:
+        shipment.set_local_delivery(kwargs["local"])
+    if isinstance(shipment, UPSWaterShipment) and "freight_forwarding" in kwargs:
+        shipment.set_freight_forwarding(kwargs["freight_forwarding"])
+
+    return shipment, factory
+
+
+def per_shipment_ns(create, number, repeat):
+    def run():
+        for carrier, mode, destination, weight, options in REQUESTS:
+            create(carrier, mode, destination, weight, **options)
+
+    best = min(timeit.repeat(run, number=number, repeat=repeat))
+    return best / (number * len(REQUESTS)) * 1e9
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--number", type=int, default=50_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    legacy = per_shipment_ns(legacy_create_and_configure_shipment, args.number, args.repeat)
+    registry = per_shipment_ns(default_registry.create, args.number, args.repeat)
+    print(f"{'if/elif dispatch':<20} {legacy:>8.0f} ns/shipment")
+    print(f"{'FactoryRegistry':<20} {registry:>8.0f} ns/shipment  ({legacy / registry:.2f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
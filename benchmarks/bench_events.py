@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Event Logging Benchmark
+Payments per second from several threads when provider events are printed
+synchronously, disabled, queued to a background writer, or written as JSON.
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import _paths  # noqa: F401
+import PaymentEvents
+from PaymentInterface import PaymentProcessor, PayPalPayment
+
+
+class PrintingPayPal(PayPalPayment):
+    """PayPal provider as it was before events: one synchronous print per payment."""
+
+    sink = None
+
+    def process_payment(self, amount, currency="USD"):
+        details = super().process_payment(amount, currency)
+        print(f"Processing PayPal payment of {amount} {currency}", file=self.sink, flush=True)
+        return details
+
+
+def run(provider, count, threads):
+    processor = PaymentProcessor(provider)
+    per_thread = count // threads
+
+    def work(_):
+        for _ in range(per_thread):
+            processor.process_transaction(25.0, "USD")
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        list(executor.map(work, range(threads)))
+    return per_thread * threads / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--count", type=int, default=200000)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--output", default=os.devnull, help="file the sinks write to")
+    args = parser.parse_args()
+
+    with open(args.output, "w") as sink:
+        PrintingPayPal.sink = sink
+        results = [("synchronous print", run(PrintingPayPal("client_id", "client_secret"), args.count, args.threads))]
+        results.append(("events disabled", run(PayPalPayment("client_id", "client_secret"), args.count, args.threads)))
+        for label, json_output in (("queued console", False), ("queued json", True)):
+            PaymentEvents.configure(stream=sink, json_output=json_output)
+            try:
+                results.append((label, run(PayPalPayment("client_id", "client_secret"), args.count, args.threads)))
+            finally:
+                PaymentEvents.shutdown()
+
+    for label, rate in results:
+        print(f"{label:<18} {rate:>12,.0f} payments/s")
+
+
+if __name__ == "__main__":
+    main()
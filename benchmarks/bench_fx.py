@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+FX Conversion Benchmark
+Minor-unit amounts converted per second by FxRates, for a single-currency
+batch and for a mixed-currency settlement batch, against converting each
+amount through Decimal.
+"""
+
+import argparse
+import random
+import time
+from array import array
+from decimal import ROUND_HALF_EVEN, Decimal
+
+import _paths  # noqa: F401
+from CompactPayments import currency_exponent
+from CurrencyExchange import FxRates
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--count", type=int, default=2000000)
+    args = parser.parse_args()
+
+    fx = FxRates()
+    generator = random.Random(7)
+    amounts = array("q", (generator.randrange(1, 10**8) for _ in range(args.count)))
+    currencies = [generator.choice(fx.currencies) for _ in range(args.count)]
+
+    def per_amount_decimal(amounts, currencies):
+        rates = {}
+        for currency in fx.currencies:
+            rate = fx.rate(currency, "USD")
+            exponent = currency_exponent("USD") - currency_exponent(currency)
+            rates[currency] = (Decimal(rate.numerator) / Decimal(rate.denominator)).scaleb(exponent)
+        return [int((Decimal(amount) * rates[currency]).to_integral_value(ROUND_HALF_EVEN))
+                for amount, currency in zip(amounts, currencies)]
+
+    rows = [
+        ("decimal, mixed", timed(per_amount_decimal, amounts, currencies)[1]),
+        ("convert_batch EUR", timed(fx.convert_batch, amounts, "EUR", "USD")[1]),
+        ("normalize_batch", timed(fx.normalize_batch, amounts, currencies, "USD")[1]),
+    ]
+    for label, elapsed in rows:
+        print(f"{label:<18} {args.count / elapsed / 1e6:8.2f} M amounts/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Tracking ID Allocator Benchmark
+Measures tracking id throughput across threads and worker processes and
+checks that no id is handed out twice.
+"""
+
+import argparse
+import multiprocessing
+import tempfile
+import threading
+import time
+
+import _paths  # noqa: F401
+from shipment_system.tracking.id_allocator import TimeOrderedIdAllocator
+
+
+def allocate_in_threads(allocator, threads, per_thread, bulk):
+    """Allocate ids from several threads and return them with the elapsed time."""
+    results = [None] * threads
+
+    def work(slot):
+        if bulk:
+            results[slot] = allocator.allocate_many(per_thread)
+        else:
+            allocate = allocator.allocate
+            results[slot] = [allocate() for _ in range(per_thread)]
+
+    workers = [threading.Thread(target=work, args=(slot,)) for slot in range(threads)]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - start
+    return [value for ids in results for value in ids], elapsed
+
+
+def process_worker(args):
+    """Allocate ids in a worker process with its own reserved node id."""
+    node_dir, per_process = args
+    allocator = TimeOrderedIdAllocator(node_dir=node_dir)
+    start = time.perf_counter()
+    ids = [allocator.allocate() for _ in range(per_process)]
+    return ids, time.perf_counter() - start
+
+
+def report(label, ids, elapsed):
+    collisions = len(ids) - len(set(ids))
+    print(f"{label:<32} {len(ids):>10,} ids  {len(ids) / elapsed:>14,.0f} ids/s  collisions: {collisions}")
+    return collisions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--count", type=int, default=2_000_000, help="ids per scenario")
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--processes", type=int, default=4)
+    args = parser.parse_args()
+
+    collisions = 0
+    with tempfile.TemporaryDirectory() as node_dir:
+        allocator = TimeOrderedIdAllocator(node_dir=node_dir)
+        ids, elapsed = allocate_in_threads(allocator, 1, args.count, bulk=False)
+        collisions += report("allocate(), 1 thread", ids, elapsed)
+        ids, elapsed = allocate_in_threads(allocator, args.threads, args.count // args.threads, bulk=False)
+        collisions += report(f"allocate(), {args.threads} threads", ids, elapsed)
+        ids, elapsed = allocate_in_threads(allocator, args.threads, args.count // args.threads, bulk=True)
+        collisions += report(f"allocate_many(), {args.threads} threads", ids, elapsed)
+
+        per_process = args.count // args.processes
+        start = time.perf_counter()
+        with multiprocessing.Pool(args.processes) as pool:
+            results = pool.map(process_worker, [(node_dir, per_process)] * args.processes)
+        elapsed = time.perf_counter() - start
+        ids = [value for chunk, _ in results for value in chunk]
+        collisions += report(f"allocate(), {args.processes} processes", ids, max(t for _, t in results))
+        print(f"{'':<32} (wall time including pool start-up: {elapsed:.2f}s)")
+
+    if collisions:
+        raise SystemExit(f"Found {collisions} duplicate ids")
+
+
+if __name__ == "__main__":
+    main()
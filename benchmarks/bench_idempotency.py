@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Idempotency Benchmark
+Simulates a retry storm: every payment request is sent several times from
+concurrent client threads, and the number of provider calls is compared
+with and without the idempotency layer.
+"""
+
+import argparse
+import contextlib
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import _paths  # noqa: F401
+from IdempotentPayments import IdempotentPaymentProcessor
+from PaymentInterface import PaymentProcessor, PayPalPayment
+
+
+class CountingPayPal(PayPalPayment):
+    """PayPal provider that counts gateway calls and simulates their latency."""
+
+    def __init__(self, latency):
+        super().__init__("client_id", "client_secret")
+        self.latency = latency
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def process_payment(self, amount, currency="USD"):
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.latency)
+        return super().process_payment(amount, currency)
+
+
+def storm(requests, retries, threads, latency, idempotent):
+    provider = CountingPayPal(latency)
+    processor = PaymentProcessor(provider)
+    front = IdempotentPaymentProcessor(processor) if idempotent else processor
+    calls = [(f"order-{index}", float(index % 900 + 1)) for index in range(requests)] * (retries + 1)
+    random.Random(7).shuffle(calls)
+
+    def send(call):
+        key, amount = call
+        if idempotent:
+            return front.process_transaction(amount, "USD", idempotency_key=key)
+        return front.process_transaction(amount, "USD")
+
+    start = time.perf_counter()
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull), \
+            ThreadPoolExecutor(max_workers=threads) as executor:
+        results = list(executor.map(send, calls))
+    elapsed = time.perf_counter() - start
+    return provider.calls, len({details.transaction_id for details in results}), elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000, help="distinct payment requests")
+    parser.add_argument("--retries", type=int, default=4, help="extra attempts per request")
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--latency", type=float, default=0.002, help="gateway round trip in seconds")
+    args = parser.parse_args()
+
+    for label, idempotent in (("no idempotency", False), ("idempotency keys", True)):
+        calls, charges, elapsed = storm(args.requests, args.retries, args.threads, args.latency, idempotent)
+        print(f"{label:<18} {calls:>8,} provider calls  {charges:>8,} charges  {elapsed:6.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Import Time Benchmark
+Cold start of a fresh interpreter that creates one shipment with a single
+carrier, or one with every carrier, through create_and_configure_shipment.
+Reports the median wall time and how many shipment_system modules loaded.
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from _paths import ROOT
+
+SCENARIOS = {
+    "interpreter only": "pass",
+    "import main": "import shipment_system.main",
+    "single carrier": (
+        "from shipment_system.main import create_and_configure_shipment as create\n"
+        "create('DHL', 'air', 'Tokyo, Japan', 10.5, express=True)"
+    ),
+    "all carriers": (
+        "from shipment_system.main import create_and_configure_shipment as create\n"
+        "for carrier in ('DHL', 'FedEx', 'UPS'):\n"
+        "    create(carrier, 'air', 'Tokyo, Japan', 10.5)"
+    ),
+}
+
+REPORT = "\nimport sys\nprint(sum(name.startswith('shipment_system') for name in sys.modules))"
+
+
+def cold_start(code):
+    env = dict(os.environ, PYTHONPATH=os.path.join(ROOT, "AbstractFactory"))
+    start = time.perf_counter()
+    output = subprocess.run([sys.executable, "-c", code + REPORT], env=env, check=True,
+                            capture_output=True, text=True).stdout
+    return time.perf_counter() - start, int(output.split()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    # One untimed run per scenario so every module has its bytecode cached.
+    for code in SCENARIOS.values():
+        cold_start(code)
+    for label, code in SCENARIOS.items():
+        runs = [cold_start(code) for _ in range(args.repeat)]
+        median = statistics.median(elapsed for elapsed, _ in runs)
+        print(f"{label:<18} {median * 1e3:8.1f} ms  {runs[0][1]:>3} shipment_system modules")
+
+
+if __name__ == "__main__":
+    main()
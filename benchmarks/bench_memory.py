@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Shipment Memory Benchmark
+Compares the bytes needed per in-flight shipment for the old __dict__-based
+objects, the slotted product classes and the columnar ShipmentStore.
+"""
+
+import argparse
+import gc
+import tracemalloc
+
+import _paths  # noqa: F401
+from shipment_system.pricing.codes import Carrier, Mode
+from shipment_system.products.dhl import DHLAirShipment
+from shipment_system.storage import ShipmentStore
+
+DESTINATIONS = ["Tokyo, Japan", "Chicago, USA", "Rotterdam, Netherlands", "Paris, France"]
+
+
+class DictShipment:
+    """Same fields as a product before the hierarchy used __slots__."""
+
+    def __init__(self, tracking_number):
+        self.tracking_number = tracking_number
+        self.weight = 0.0
+        self.destination = ""
+        self.express_air = False
+
+
+def build_dict_shipments(count):
+    shipments = []
+    for index in range(count):
+        shipment = DictShipment(DHLAirShipment().tracking_number)
+        shipment.weight = float(index % 500)
+        shipment.destination = DESTINATIONS[index % len(DESTINATIONS)]
+        shipment.express_air = bool(index & 1)
+        shipments.append(shipment)
+    return shipments
+
+
+def build_slotted_shipments(count):
+    shipments = []
+    for index in range(count):
+        shipment = DHLAirShipment()
+        shipment.set_weight(float(index % 500))
+        shipment.set_destination(DESTINATIONS[index % len(DESTINATIONS)])
+        shipment.set_express_air(bool(index & 1))
+        shipments.append(shipment)
+    return shipments
+
+
+def build_store(count):
+    store = ShipmentStore()
+    for index in range(count):
+        store.add(Carrier.DHL, Mode.AIR, float(index % 500), DESTINATIONS[index % len(DESTINATIONS)], bool(index & 1))
+    return store
+
+
+def measure(build, count):
+    """Return the bytes still allocated per shipment after building ``count`` of them."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build(count)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return (after - before) / count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--count", type=int, default=200_000)
+    args = parser.parse_args()
+
+    baseline = measure(build_dict_shipments, args.count)
+    print(f"{'__dict__ objects':<20} {baseline:>8.1f} bytes/shipment")
+    for label, build in (("__slots__ objects", build_slotted_shipments), ("ShipmentStore", build_store)):
+        size = measure(build, args.count)
+        print(f"{label:<20} {size:>8.1f} bytes/shipment  ({baseline / size:.1f}x smaller)")
+
+
+if __name__ == "__main__":
+    main()
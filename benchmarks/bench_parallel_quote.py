@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Parallel Quote Scaling Benchmark
+Shipments quoted per second by ParallelQuoter at 1, 2, 4, ... N worker
+processes, next to the single-process BatchRateEngine. Workers are started
+and warmed before timing, so only steady-state throughput is measured.
+"""
+
+import argparse
+import os
+import random
+import time
+
+import _paths  # noqa: F401
+from shipment_system.parallel import ParallelQuoter
+from shipment_system.pricing import BatchRateEngine
+from shipment_system.storage import ShipmentStore
+from shipment_system.storage.shipment_store import FLAG_OPTION
+
+
+def worker_counts(maximum):
+    counts = []
+    count = 1
+    while count < maximum:
+        counts.append(count)
+        count *= 2
+    return counts + [maximum]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--shipments", type=int, default=2000000)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count())
+    parser.add_argument("--chunk-size", type=int, default=65536)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    generator = random.Random(7)
+    store = ShipmentStore()
+    for _ in range(args.shipments):
+        store.add(generator.randrange(3), generator.randrange(3), generator.uniform(0.1, 2000.0),
+                  "Rotterdam, Netherlands", generator.random() < 0.5, tracking_id=0)
+
+    engine = BatchRateEngine()
+    options = [flag & FLAG_OPTION for flag in store.flags]
+    start = time.perf_counter()
+    expected = engine.quote(store.carriers, store.modes, store.weights, options)
+    serial = args.shipments / (time.perf_counter() - start)
+    print(f"{'in-process':<12} {serial:>14,.0f} shipments/s")
+
+    for workers in worker_counts(args.max_workers):
+        with ParallelQuoter(workers=workers, chunk_size=args.chunk_size) as quoter:
+            best = float("inf")
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                costs = quoter.quote_store(store)
+                best = min(best, time.perf_counter() - start)
+            if costs != expected:
+                raise AssertionError(f"Costs from {workers} workers differ from BatchRateEngine")
+        rate = args.shipments / best
+        print(f"{f'{workers} workers':<12} {rate:>14,.0f} shipments/s  {rate / serial:5.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Payment Record Memory Benchmark
+Compares the bytes held per payment record by PaymentDetails,
+CompactPaymentDetails and the PaymentColumns column store.
+"""
+
+import argparse
+import gc
+import tracemalloc
+from datetime import datetime, timedelta
+
+import _paths  # noqa: F401
+from CompactPayments import CompactPaymentDetails, PaymentColumns
+from PaymentInterface import PaymentDetails, PaymentStatus, transaction_ids
+
+CURRENCIES = ["USD", "EUR", "MXN", "JPY"]
+DESCRIPTIONS = ["PayPal payment", "Credit Card payment", "Bank Transfer payment"]
+STATUSES = [PaymentStatus.COMPLETED, PaymentStatus.PROCESSING, PaymentStatus.REFUNDED]
+
+
+def make_payments(ids):
+    start = datetime(2025, 1, 1)
+    return [
+        PaymentDetails(
+            amount=float(index % 100000) / 100 + 0.01,
+            # Fresh strings per record, as they would arrive from a request or a database row.
+            currency="".join(CURRENCIES[index % len(CURRENCIES)]),
+            description="".join(DESCRIPTIONS[index % len(DESCRIPTIONS)]),
+            transaction_id=transaction_id,
+            timestamp=start + timedelta(microseconds=index * 997),
+            status=STATUSES[index % len(STATUSES)],
+        )
+        for index, transaction_id in enumerate(ids)
+    ]
+
+
+def measure(build, count):
+    """Return the bytes still allocated per record after ``build()``."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return (after - before) / count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--count", type=int, default=200_000)
+    args = parser.parse_args()
+
+    # Transaction IDs are shared by every layout, so they are created up front and not counted.
+    ids = [transaction_ids.next_id("PP") for _ in range(args.count)]
+    baseline = measure(lambda: make_payments(ids), args.count)
+    print(f"{'PaymentDetails':<24} {baseline:>8.1f} bytes/record")
+
+    # The compact forms are built from the same input; only what they keep is counted.
+    payments = make_payments(ids)
+    scenarios = (
+        ("CompactPaymentDetails", lambda: [CompactPaymentDetails.from_details(details) for details in payments]),
+        ("PaymentColumns", lambda: PaymentColumns(payments)),
+    )
+    for label, build in scenarios:
+        size = measure(build, args.count)
+        print(f"{label:<24} {size:>8.1f} bytes/record  (saves {baseline - size:.1f}, {baseline / size:.1f}x smaller)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Tracking Index Benchmark
+Builds a TrackingIndex, writes a snapshot, and measures how long reopening
+it takes and how fast single lookups, multi-gets and bulk status updates
+run against the mapped snapshot.
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+
+import _paths  # noqa: F401
+from shipment_system.storage import ShipmentStore
+from shipment_system.tracking import TrackingIndex, TrackingStatus
+
+DESTINATIONS = ["Tokyo, Japan", "Chicago, USA", "Rotterdam, Netherlands", "Paris, France"]
+
+
+def percentile(samples, fraction):
+    return sorted(samples)[int(fraction * (len(samples) - 1))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--shipments", type=int, default=1000000)
+    parser.add_argument("--lookups", type=int, default=100000)
+    parser.add_argument("--snapshot", help="snapshot path (default: a temporary file)")
+    args = parser.parse_args()
+
+    store = ShipmentStore()
+    for index in range(args.shipments):
+        store.add(index % 3, index // 3 % 3, float(index % 500), DESTINATIONS[index % len(DESTINATIONS)])
+
+    start = time.perf_counter()
+    index = TrackingIndex()
+    index.add_store(store)
+    build = time.perf_counter() - start
+
+    path = args.snapshot or os.path.join(tempfile.mkdtemp(), "tracking.idx")
+    start = time.perf_counter()
+    index.save(path)
+    save = time.perf_counter() - start
+
+    start = time.perf_counter()
+    index = TrackingIndex.open(path)
+    opened = time.perf_counter() - start
+
+    generator = random.Random(7)
+    sample = [generator.choice(store.tracking_ids) for _ in range(args.lookups)]
+    latencies = []
+    for tracking_id in sample:
+        start = time.perf_counter()
+        index.get(tracking_id)
+        latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    index.get_many(sample)
+    multi_get = time.perf_counter() - start
+
+    start = time.perf_counter()
+    index.update_many(sample, TrackingStatus.IN_TRANSIT)
+    updates = time.perf_counter() - start
+
+    print(f"shipments        {args.shipments:>12,}")
+    print(f"snapshot size    {os.path.getsize(path) / args.shipments:>12.1f} bytes/shipment")
+    print(f"build            {build:>12.2f} s")
+    print(f"save             {save:>12.2f} s")
+    print(f"open             {opened * 1e3:>12.1f} ms")
+    print(f"get p50 / p99    {percentile(latencies, 0.5) * 1e6:>8.1f} / {percentile(latencies, 0.99) * 1e6:.1f} us")
+    print(f"get_many         {args.lookups / multi_get:>12,.0f} lookups/s")
+    print(f"update_many      {args.lookups / updates:>12,.0f} updates/s")
+    index.close()
+    if not args.snapshot:
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
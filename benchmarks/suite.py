@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+Benchmark Suite
+Micro- and macrobenchmarks for the shipment system and the payment
+interface. Results can be saved as JSON and compared against a baseline;
+the comparison fails when a benchmark got slower than the threshold.
+
+Examples:
+    python benchmarks/suite.py --output baseline.json
+    python benchmarks/suite.py --compare baseline.json --threshold 0.10
+"""
+
+import argparse
+import contextlib
+import gc
+import json
+import os
+import platform
+import sys
+import time
+from datetime import datetime
+
+import _paths  # noqa: F401
+from PaymentInterface import PaymentDetails, PaymentProcessor, PaymentStatus, PayPalPayment, transaction_ids
+from shipment_system.factories import DHLFactory
+from shipment_system.main import create_and_configure_shipment
+
+BENCHMARKS = {}
+
+
+def benchmark(name, kind="micro", ops=10_000):
+    """Register a benchmark.
+
+    The decorated function receives the number of operations and returns a
+    zero-argument callable performing them; setup work stays untimed.
+    """
+
+    def register(setup):
+        BENCHMARKS[name] = (kind, ops, setup)
+        return setup
+
+    return register
+
+
+@contextlib.contextmanager
+def quiet():
+    """Silence output printed by the code under test."""
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        yield
+
+
+@benchmark("shipment.construct")
+def bench_shipment_construct(ops):
+    factory = DHLFactory()
+
+    def run():
+        create = factory.create_air_shipment
+        for _ in range(ops):
+            create()
+
+    return run
+
+
+@benchmark("shipment.calculate_cost")
+def bench_calculate_cost(ops):
+    shipment = DHLFactory().create_air_shipment()
+    shipment.set_weight(10.5)
+    shipment.set_express_air(True)
+
+    def run():
+        calculate_cost = shipment.calculate_cost
+        for _ in range(ops):
+            calculate_cost()
+
+    return run
+
+
+@benchmark("shipment.create_and_configure")
+def bench_create_and_configure(ops):
+    requests = [
+        ("DHL", "air", "Tokyo, Japan", 10.5, {"express": True}),
+        ("FedEx", "ground", "Chicago, USA", 25.0, {"local": True}),
+        ("UPS", "water", "Rotterdam, Netherlands", 1500.0, {"freight_forwarding": True}),
+    ]
+    batch = (requests * (ops // len(requests) + 1))[:ops]
+
+    def run():
+        for carrier, mode, destination, weight, options in batch:
+            create_and_configure_shipment(carrier, mode, destination, weight, **options)
+
+    return run
+
+
+@benchmark("payment.process_transaction")
+def bench_process_transaction(ops):
+    processor = PaymentProcessor(PayPalPayment("client_id", "client_secret"))
+
+    def run():
+        with quiet():
+            process = processor.process_transaction
+            for _ in range(ops):
+                process(100.0, "USD")
+
+    return run
+
+
+@benchmark("payment.transaction_id", ops=100_000)
+def bench_transaction_id(ops):
+    def run():
+        next_id = transaction_ids.next_id
+        for _ in range(ops):
+            next_id("PP")
+
+    return run
+
+
+@benchmark("payment.get_status", ops=100_000)
+def bench_get_status(ops):
+    provider = PayPalPayment("client_id", "client_secret")
+    now = datetime.now()
+    ids = [f"PP_{index:012d}" for index in range(10_000)]
+    for transaction_id in ids:
+        provider.transactions.record(PaymentDetails(
+            100.0, "USD", "PayPal payment", transaction_id, now, PaymentStatus.COMPLETED
+        ))
+    lookups = (ids * (ops // len(ids) + 1))[:ops]
+    processor = PaymentProcessor(provider)
+
+    def run():
+        check_status = processor.check_status
+        for transaction_id in lookups:
+            check_status(transaction_id)
+
+    return run
+
+
+@benchmark("macro.quote_1m_shipments", kind="macro", ops=1_000_000)
+def bench_quote_shipments(ops):
+    carriers = ("DHL", "FedEx", "UPS")
+    modes = ("air", "ground", "water")
+
+    def run():
+        for index in range(ops):
+            shipment, _ = create_and_configure_shipment(
+                carriers[index % 3], modes[(index // 3) % 3], "Paris, France", float(index % 2000)
+            )
+            shipment.calculate_cost()
+
+    return run
+
+
+@benchmark("macro.process_1m_payments", kind="macro", ops=1_000_000)
+def bench_process_payments(ops):
+    def run():
+        processor = PaymentProcessor(PayPalPayment("client_id", "client_secret"))
+        with quiet():
+            process = processor.process_transaction
+            for index in range(ops):
+                process(float(index % 5000 + 1), "USD")
+
+    return run
+
+
+def run_benchmark(name, scale, repeat):
+    """Run one benchmark and return its timing summary."""
+    kind, ops, setup = BENCHMARKS[name]
+    ops = max(1, int(ops * scale))
+    run = setup(ops)
+    timings = []
+    for _ in range(repeat if kind == "micro" else 1):
+        gc.collect()
+        start = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - start)
+    best = min(timings)
+    return {
+        "kind": kind,
+        "ops": ops,
+        "repeat": len(timings),
+        "seconds": best,
+        "ns_per_op": best / ops * 1e9,
+        "ops_per_sec": ops / best,
+    }
+
+
+def compare(results, baseline, threshold):
+    """Print the change against a baseline and return the names that regressed."""
+    regressions = []
+    for name, result in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            print(f"{name:<34} (no baseline)")
+            continue
+        change = result["ns_per_op"] / previous["ns_per_op"] - 1
+        marker = ""
+        if change > threshold:
+            regressions.append(name)
+            marker = "  REGRESSION"
+        print(f"{name:<34} {previous['ns_per_op']:>10.1f} -> {result['ns_per_op']:>10.1f} ns/op  {change:+7.1%}{marker}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--filter", default="", help="only run benchmarks whose name contains this text")
+    parser.add_argument("--micro-only", action="store_true", help="skip the macrobenchmarks")
+    parser.add_argument("--scale", type=float, default=1.0, help="multiply every operation count")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per microbenchmark, best one counts")
+    parser.add_argument("--output", help="write results to this JSON file")
+    parser.add_argument("--compare", help="baseline JSON file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10, help="allowed slowdown, 0.10 = 10%%")
+    args = parser.parse_args()
+
+    results = {}
+    for name, (kind, _, _) in BENCHMARKS.items():
+        if args.filter not in name or (args.micro_only and kind == "macro"):
+            continue
+        results[name] = result = run_benchmark(name, args.scale, args.repeat)
+        print(f"{name:<34} {result['ns_per_op']:>10.1f} ns/op {result['ops_per_sec']:>14,.0f} ops/s")
+
+    if args.output:
+        report = {
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "results": results,
+        }
+        with open(args.output, "w", encoding="utf-8") as output:
+            json.dump(report, output, indent=2)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as baseline_file:
+            baseline = json.load(baseline_file)["results"]
+        print()
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            raise SystemExit(f"{len(regressions)} benchmark(s) slower than {args.threshold:.0%}: {', '.join(regressions)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+import random
+
+import pytest
+
+from shipment_system.pricing import BatchRateEngine, Carrier, Mode
+from shipment_system.products.dhl import DHLAirShipment, DHLGroundShipment, DHLWaterShipment
+from shipment_system.products.fedex import FedExAirShipment, FedExGroundShipment, FedExWaterShipment
+from shipment_system.products.ups import UPSAirShipment, UPSGroundShipment, UPSWaterShipment
+
+# calculate_cost() of every product as originally written:
+# (product class, option setter, option values, base, per kg, option multiplier).
+ORIGINAL_FORMULAS = [
+    (DHLAirShipment, "set_express_air", (False, True), 100.0, 2.5, 1.5),
+    (DHLGroundShipment, "set_route_optimization", (False, True), 50.0, 1.2, 1.1),
+    (DHLWaterShipment, "set_container_type", ("Standard", "Premium"), 200.0, 0.8, 1.3),
+    (FedExAirShipment, "set_first_class", (False, True), 120.0, 2.8, 1.7),
+    (FedExGroundShipment, "set_local_delivery", (False, True), 45.0, 1.1, 0.9),
+    (FedExWaterShipment, "set_international_shipping", (False, True), 180.0, 0.9, 1.4),
+    (UPSAirShipment, "set_next_day_air", (False, True), 110.0, 2.6, 1.8),
+    (UPSGroundShipment, "set_ground_saver", (False, True), 55.0, 1.3, 0.85),
+    (UPSWaterShipment, "set_freight_forwarding", (False, True), 190.0, 0.85, 1.25),
+]
+
+def _weights(count=500, seed=1):
+    rng = random.Random(seed)
+    return [0.0, 1.0, 0.1, 2.5, 1e6] + [rng.uniform(0.01, 5000.0) for _ in range(count)]
+
+def _original_cost(base, per_kg, multiplier, weight, option):
+    base_cost = base + (weight * per_kg)
+    return base_cost * multiplier if option else base_cost
+
+@pytest.mark.parametrize("product_class, setter, values, base, per_kg, multiplier", ORIGINAL_FORMULAS,
+                         ids=[entry[0].__name__ for entry in ORIGINAL_FORMULAS])
+def test_calculate_cost_and_quote_match_the_original_formulas(product_class, setter, values, base, per_kg, multiplier):
+    engine = BatchRateEngine()
+    weights = _weights()
+    for option_on, value in enumerate(values):
+        expected = [_original_cost(base, per_kg, multiplier, weight, option_on) for weight in weights]
+        actual = []
+        for weight in weights:
+            shipment = product_class()
+            shipment.set_weight(weight)
+            getattr(shipment, setter)(value)
+            actual.append(shipment.calculate_cost())
+        assert actual == expected
+        quoted = engine.quote([product_class.carrier] * len(weights), [product_class.mode] * len(weights),
+                              weights, [option_on] * len(weights))
+        assert list(quoted) == expected
+
+def test_quote_mixed_batch_matches_quote_one():
+    engine = BatchRateEngine()
+    rng = random.Random(2)
+    rows = [(rng.choice(list(Carrier)), rng.choice(list(Mode)), rng.uniform(0.01, 5000.0), rng.random() < 0.5)
+            for _ in range(2000)]
+    carriers, modes, weights, options = map(list, zip(*rows))
+    assert list(engine.quote(carriers, modes, weights, options)) == [engine.quote_one(*row) for row in rows]
+
+def test_quote_ndarray_matches_the_python_path():
+    numpy = pytest.importorskip("numpy")
+    engine = BatchRateEngine()
+    rng = random.Random(3)
+    count = 5000
+    carriers = [rng.randrange(len(Carrier)) for _ in range(count)]
+    modes = [rng.randrange(len(Mode)) for _ in range(count)]
+    weights = [rng.uniform(0.01, 5000.0) for _ in range(count)]
+    options = [rng.random() < 0.5 for _ in range(count)]
+    quoted = engine.quote(numpy.array(carriers, dtype=numpy.int8), numpy.array(modes, dtype=numpy.int8),
+                          numpy.array(weights), numpy.array(options))
+    assert isinstance(quoted, numpy.ndarray)
+    assert quoted.tolist() == list(engine.quote(carriers, modes, weights, options))
+
+def test_quote_rejects_columns_of_different_lengths():
+    with pytest.raises(ValueError):
+        BatchRateEngine().quote([0, 1], [0], [1.0, 2.0], [False, True])
@@ -0,0 +1,32 @@
+from PaymentInterface import PaymentProcessor, PayPalPayment
+from shipment_system.checkout import CheckoutPipeline, Order
+
+class FailingProcessor:
+    def process_batch(self, amounts, currencies):
+        raise ConnectionError("gateway down")
+
+def _orders(count, payment_method="paypal"):
+    return [
+        Order(f"o{i}", f"c{i % 3}", payment_method, "DHL", "air", "Berlin", 1.0 + i)
+        for i in range(count)
+    ]
+
+def test_processor_exception_fails_its_orders_and_the_stream_continues():
+    processors = {"paypal": PaymentProcessor(PayPalPayment("client", "secret")), "broken": FailingProcessor()}
+    pipeline = CheckoutPipeline(processors, window=4)
+    orders = _orders(6) + _orders(6, "broken") + _orders(6)
+    results = list(pipeline.run(orders))
+    assert len(results) == len(orders)
+    broken = [result for order, result in zip(orders, results) if order.payment_method == "broken"]
+    assert all(isinstance(result.error, ConnectionError) and result.transaction_id is None for result in broken)
+    paid = [result for order, result in zip(orders, results) if order.payment_method == "paypal"]
+    assert all(result.error is None and result.transaction_id for result in paid)
+    assert pipeline.metrics.failed_orders == 6
+
+def test_order_options_default_is_not_shared():
+    first, second = _orders(2)
+    assert first.options is None and second.options is None
+    results = list(CheckoutPipeline({"paypal": PaymentProcessor(PayPalPayment("client", "secret"))}).run(
+        [first, first._replace(order_id="o9", options={"express": True})]
+    ))
+    assert results[1].cost > results[0].cost
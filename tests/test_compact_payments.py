@@ -0,0 +1,27 @@
+from datetime import datetime
+from decimal import InvalidOperation
+
+import pytest
+
+from CompactPayments import PaymentColumns
+from PaymentInterface import PaymentDetails, PaymentStatus
+
+def payment(index, description, amount=10.0, currency="USD"):
+    return PaymentDetails(amount, currency, description, f"txn-{index}", datetime(2024, 1, 1),
+                          PaymentStatus.COMPLETED)
+
+def test_more_than_65536_distinct_descriptions():
+    columns = PaymentColumns(payment(index, f"order {index}") for index in range(70_000))
+    assert len(columns.descriptions) == 70_000
+    assert columns.row(69_999).description == "order 69999"
+    assert columns.totals_by_currency() == {"USD": 70_000 * 1000}
+
+def test_a_payment_that_fails_to_convert_leaves_the_columns_aligned():
+    columns = PaymentColumns([payment(0, "first")])
+    with pytest.raises(InvalidOperation):
+        columns.append(payment(1, "second", amount="not a number"))
+    columns.append(payment(2, "third", amount=1.5, currency="JPY"))
+    assert len(columns) == 2
+    assert len(columns.amounts_minor) == len(columns.currency_ids) == len(columns.description_ids) == 2
+    row = columns.row(1)
+    assert (row.transaction_id, row.description, row.currency, row.amount_minor) == ("txn-2", "third", "JPY", 2)
@@ -0,0 +1,74 @@
+import json
+import random
+from decimal import ROUND_HALF_EVEN, Decimal, localcontext
+
+import pytest
+
+from CompactPayments import currency_exponent
+from CurrencyExchange import DEFAULT_FX_RATES_PATH, FxRates
+from PaymentInterface import CreditCardPayment, PaymentProcessor
+
+with open(DEFAULT_FX_RATES_PATH) as rates_file:
+    RATES = {currency: Decimal(rate) for currency, rate in json.load(rates_file)["rates"].items()}
+
+# Currencies with 0, 2 and 3 minor unit digits.
+CURRENCIES = ["JPY", "USD", "KWD"]
+PAIRS = [(source, target) for source in CURRENCIES for target in CURRENCIES]
+
+def expected_minor(amount_minor, source, target):
+    """Convert with Decimal arithmetic, rounding half to even once."""
+    with localcontext() as context:
+        context.prec = 60
+        major = Decimal(amount_minor).scaleb(-currency_exponent(source))
+        converted = major * RATES[target] / RATES[source]
+        return int(converted.scaleb(currency_exponent(target)).quantize(Decimal(1), ROUND_HALF_EVEN))
+
+def sample_amounts(seed=7):
+    rng = random.Random(seed)
+    return [0, 1, 5, 99, 100, 12_345, 10**12] + [rng.randrange(1, 10**10) for _ in range(500)]
+
+@pytest.fixture(scope="module")
+def fx():
+    return FxRates()
+
+def test_currency_exponents():
+    assert [currency_exponent(currency) for currency in CURRENCIES] == [0, 2, 3]
+
+@pytest.mark.parametrize("source, target", PAIRS)
+def test_convert_minor_matches_decimal(fx, source, target):
+    for amount in sample_amounts():
+        assert fx.convert_minor(amount, source, target) == expected_minor(amount, source, target)
+
+@pytest.mark.parametrize("source, target", PAIRS)
+def test_convert_batch_matches_decimal(fx, source, target):
+    amounts = sample_amounts()
+    assert list(fx.convert_batch(amounts, source, target)) == [
+        expected_minor(amount, source, target) for amount in amounts
+    ]
+
+def test_normalize_batch_of_mixed_currencies_matches_decimal(fx):
+    rng = random.Random(11)
+    amounts = sample_amounts()
+    currencies = [rng.choice(CURRENCIES) for _ in amounts]
+    for target in CURRENCIES:
+        assert list(fx.normalize_batch(amounts, currencies, target)) == [
+            expected_minor(amount, currency, target) for amount, currency in zip(amounts, currencies)
+        ]
+
+def test_halfway_amounts_round_to_even(tmp_path):
+    path = tmp_path / "fx_rates.json"
+    path.write_text(json.dumps({"base": "USD", "rates": {"USD": "1", "EUR": "0.5", "KWD": "0.0005"}}))
+    fx = FxRates(str(path))
+    assert [fx.convert_minor(cents, "USD", "EUR") for cents in (1, 3, 5, 7)] == [0, 2, 2, 4]
+    # 1 USD cent is 0.005 KWD fils; 100 cents are half a fil.
+    assert [fx.convert_minor(cents, "USD", "KWD") for cents in (100, 300)] == [0, 2]
+
+def test_limit_check_converts_to_the_limit_currency(fx):
+    processor = PaymentProcessor(CreditCardPayment("merchant", "key"), fx=fx)
+    assert CreditCardPayment.max_amount == 5000
+    # 600,000 JPY is about 4,005 USD; 4,999 GBP is about 6,490 USD.
+    assert processor.process_transaction(600_000, "JPY").currency == "JPY"
+    with pytest.raises(ValueError, match="4999 GBP"):
+        processor.process_transaction(4999, "GBP")
+    results = processor.process_batch([600_000, 4999], ["JPY", "GBP"])
+    assert [result.succeeded for result in results] == [True, False]
@@ -0,0 +1,85 @@
+import io
+import os
+import json
+import logging
+import threading
+
+import pytest
+
+import PaymentEvents
+from shipment_system.events import event_log
+
+# The payment project keeps its own copy of the event log so it runs
+# without the shipment tree; both copies must behave the same.
+@pytest.fixture(params=[event_log, PaymentEvents], ids=["shipment_system", "payments"])
+def EventLog(request):
+    return request.param.EventLog
+
+def test_background_sink_writes_every_event_from_several_threads(EventLog):
+    log = EventLog("test.events.threads")
+    stream = io.StringIO()
+    log.configure(stream=stream, json_output=True)
+
+    def work(thread):
+        for i in range(500):
+            log.emit(logging.INFO, "event %s-%s", thread, i, thread=thread, index=i)
+
+    threads = [threading.Thread(target=work, args=(t,)) for t in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    log.logger.warning("direct %s", "record", extra={"source": "logger"})
+    log.shutdown()
+
+    entries = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert len(entries) == 2001
+    assert {(entry["thread"], entry["index"]) for entry in entries[:-1] if "thread" in entry} == {
+        (t, i) for t in range(4) for i in range(500)
+    }
+    assert entries[-1]["message"] == "direct record"
+    assert entries[-1]["source"] == "logger"
+    assert entries[0]["level"] == "INFO"
+
+def test_synchronous_console_sink(EventLog):
+    log = EventLog("test.events.sync")
+    stream = io.StringIO()
+    log.configure(stream=stream, background=False)
+    log.emit(logging.INFO, "paid %s %s", 10, "USD", provider="PayPal")
+    log.shutdown()
+    log.emit(logging.INFO, "dropped")
+    assert stream.getvalue() == "paid 10 USD\n"
+
+def test_bad_event_is_reported_and_the_writer_keeps_going(EventLog, capsys):
+    log = EventLog("test.events.bad")
+    stream = io.StringIO()
+    log.configure(stream=stream)
+    log.emit(logging.INFO, "before")
+    log.emit(logging.INFO, "bad %d", "x")
+    log.emit(logging.INFO, "after %s", 1)
+    log.shutdown()
+    log.configure(stream=stream)
+    log.emit(logging.INFO, "later")
+    log.shutdown()
+    assert stream.getvalue() == "before\nafter 1\nlater\n"
+    assert "--- Logging error ---" in capsys.readouterr().err
+
+@pytest.mark.parametrize("module, directory", [
+    ("shipment_system.events", "AbstractFactory"),
+    ("PaymentEvents", "Interface"),
+])
+def test_queued_events_are_written_at_exit(module, directory, tmp_path):
+    import subprocess
+    import sys
+    output = tmp_path / "events.log"
+    script = (
+        "import logging\n"
+        f"from {module} import EventLog\n"
+        "log = EventLog('exit')\n"
+        f"log.configure(stream=open({str(output)!r}, 'w'))\n"
+        "for i in range(200000):\n"
+        "    log.emit(logging.INFO, 'event %s', i)\n"
+    )
+    root = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), directory)
+    subprocess.run([sys.executable, "-c", script], check=True, env={**os.environ, "PYTHONPATH": root})
+    assert len(output.read_text().splitlines()) == 200000
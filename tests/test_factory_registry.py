@@ -0,0 +1,63 @@
+import threading
+
+from shipment_system.factories.factory_registry import FactoryRegistry, _register_defaults
+
+THREADS = 8
+
+def _first_use_from_threads(call):
+    barrier = threading.Barrier(THREADS)
+    results = [None] * THREADS
+
+    def worker(i):
+        barrier.wait()
+        try:
+            results[i] = call()
+        except Exception as e:
+            results[i] = e
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(THREADS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+def test_lazy_carrier_first_use_from_several_threads():
+    for _ in range(20):
+        registry = FactoryRegistry()
+        _register_defaults(registry)
+        results = _first_use_from_threads(
+            lambda: registry.create("FedEx", "air", "Berlin", 4.0, first_class=True)
+        )
+        for result in results:
+            assert not isinstance(result, Exception), result
+            shipment, factory = result
+            assert type(shipment).__name__ == "FedExAirShipment"
+            assert shipment.first_class is True
+        assert len({id(factory) for _, factory in results}) == 1
+
+def test_lazy_carrier_get_factory_from_several_threads():
+    for _ in range(20):
+        registry = FactoryRegistry()
+        _register_defaults(registry)
+        results = _first_use_from_threads(lambda: registry.get_factory("ups"))
+        assert not any(isinstance(result, Exception) for result in results), results
+        assert len({id(factory) for factory in results}) == 1
+
+def test_failed_loader_can_be_retried():
+    from shipment_system.factories.dhl_factory import register
+    registry = FactoryRegistry()
+    attempts = []
+
+    def loader(reg):
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise RuntimeError("transient")
+        register(reg)
+
+    registry.register_lazy("DHL", loader)
+    try:
+        registry.get_factory("DHL")
+    except RuntimeError:
+        pass
+    assert registry.get_factory("DHL").offer_insurance() is True
@@ -0,0 +1,91 @@
+import multiprocessing
+import os
+import subprocess
+import sys
+import time
+
+from shipment_system.tracking import id_allocator
+from shipment_system.tracking.id_allocator import ID_EPOCH_MS, MAX_LEAD_MS, TimeOrderedIdAllocator, reserve_node_id
+
+def _now_slot():
+    return int(time.time() * 1000) - ID_EPOCH_MS
+
+def test_burst_does_not_run_ahead_of_the_clock():
+    allocator = TimeOrderedIdAllocator(node_id=5)
+    ids = allocator.allocate_many(200_000)
+    assert allocator._last_slot - _now_slot() <= MAX_LEAD_MS
+    successor = TimeOrderedIdAllocator(node_id=5)
+    time.sleep((MAX_LEAD_MS + 1) / 1000)
+    assert not set(ids) & set(successor.allocate_many(50_000))
+
+def _allocate_and_exit(node_dir, count, queue):
+    allocator = TimeOrderedIdAllocator(node_dir=node_dir, max_lead_ms=10_000)
+    ids = allocator.allocate_many(count)
+    queue.put((allocator.node_id, ids[0], ids[-1]))
+
+def test_next_owner_of_a_node_resumes_after_the_last_slot(tmp_path):
+    context = multiprocessing.get_context("spawn")
+    queue = context.Queue()
+    # A generous lead lets the first owner run well ahead of the clock.
+    process = context.Process(target=_allocate_and_exit, args=(str(tmp_path), 2_000_000, queue))
+    process.start()
+    node_id, first, last = queue.get()
+    process.join()
+    successor = TimeOrderedIdAllocator(node_dir=str(tmp_path))
+    assert successor.node_id == node_id
+    ids = successor.allocate_many(100_000)
+    assert ids[0] > last
+
+def _reserve(node_dir, barrier, queue):
+    barrier.wait()
+    queue.put(reserve_node_id(node_dir))
+    time.sleep(0.5)
+
+def test_concurrent_processes_reserve_distinct_nodes(tmp_path):
+    context = multiprocessing.get_context("fork")
+    processes = 8
+    barrier = context.Barrier(processes)
+    queue = context.Queue()
+    workers = [context.Process(target=_reserve, args=(str(tmp_path), barrier, queue)) for _ in range(processes)]
+    for worker in workers:
+        worker.start()
+    node_ids = [queue.get() for _ in workers]
+    for worker in workers:
+        worker.join()
+    assert len(set(node_ids)) == processes
+
+def test_node_of_a_killed_process_is_freed(tmp_path):
+    context = multiprocessing.get_context("fork")
+    queue = context.Queue()
+    process = context.Process(target=_reserve, args=(str(tmp_path), context.Barrier(1), queue))
+    process.start()
+    node_id = queue.get()
+    process.kill()
+    process.join()
+    assert node_id == 0
+    assert reserve_node_id(str(tmp_path)) == 0
+    assert os.path.exists(tmp_path / "node-0.lock")
+
+def test_node_dir_is_per_user_and_configurable(tmp_path):
+    assert str(os.getuid()) in os.path.basename(id_allocator.DEFAULT_NODE_DIR)
+    root = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "AbstractFactory")
+    output = subprocess.run(
+        [sys.executable, "-c",
+         "from shipment_system.tracking.id_allocator import DEFAULT_NODE_DIR, reserve_node_id\n"
+         "print(DEFAULT_NODE_DIR, reserve_node_id())"],
+        cwd=root, env={**os.environ, "SHIPMENT_NODE_DIR": str(tmp_path)},
+        capture_output=True, text=True, check=True,
+    ).stdout.split()
+    assert output == [str(tmp_path), "0"]
+    assert os.listdir(tmp_path) == ["node-0.lock"]
+
+def test_node_files_of_other_users_are_skipped(tmp_path, monkeypatch):
+    open_file = os.open
+
+    def open_as_other_user(path, *args):
+        if os.path.basename(path) == "node-0.lock":
+            raise PermissionError(path)
+        return open_file(path, *args)
+
+    monkeypatch.setattr(id_allocator.os, "open", open_as_other_user)
+    assert reserve_node_id(str(tmp_path)) == 1
@@ -0,0 +1,79 @@
+import threading
+import time
+
+import pytest
+
+from IdempotentPayments import IdempotentPaymentProcessor, SQLiteIdempotencyStore
+from PaymentInterface import PaymentProcessor, PayPalPayment
+
+class SlowPayPal(PayPalPayment):
+    """PayPal provider that counts its calls and takes a while to answer."""
+
+    def __init__(self):
+        super().__init__("client", "secret")
+        self.calls = 0
+        self._calls_lock = threading.Lock()
+
+    def process_payment(self, amount, currency="USD"):
+        with self._calls_lock:
+            self.calls += 1
+        time.sleep(0.05)
+        return super().process_payment(amount, currency)
+
+def _race(calls):
+    barrier = threading.Barrier(len(calls))
+    results = [None] * len(calls)
+
+    def run(i):
+        barrier.wait()
+        results[i] = calls[i]()
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(len(calls))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+def test_concurrent_retries_coalesce_on_one_charge():
+    provider = SlowPayPal()
+    processor = IdempotentPaymentProcessor(PaymentProcessor(provider))
+    results = _race([lambda: processor.process_transaction(25.0, "USD", "order-1")] * 8)
+    assert provider.calls == 1
+    assert len({details.transaction_id for details in results}) == 1
+    assert processor.coalesced == 7
+    with pytest.raises(ValueError):
+        processor.process_transaction(30.0, "USD", "order-1")
+
+def test_processors_sharing_a_store_charge_once(tmp_path):
+    path = str(tmp_path / "keys.db")
+    provider = SlowPayPal()
+    processors = [
+        IdempotentPaymentProcessor(PaymentProcessor(provider), store=SQLiteIdempotencyStore(path))
+        for _ in range(4)
+    ]
+    results = _race([lambda p=p: p.process_transaction(25.0, "USD", "order-1") for p in processors])
+    assert provider.calls == 1
+    assert len({details.transaction_id for details in results}) == 1
+    restarted = IdempotentPaymentProcessor(PaymentProcessor(provider), store=SQLiteIdempotencyStore(path))
+    assert restarted.process_transaction(25.0, "USD", "order-1").transaction_id == results[0].transaction_id
+    assert provider.calls == 1
+
+def test_failed_charge_releases_the_key(tmp_path):
+    store = SQLiteIdempotencyStore(str(tmp_path / "keys.db"))
+    processor = IdempotentPaymentProcessor(PaymentProcessor(PayPalPayment("client", "secret")), store=store)
+    with pytest.raises(ValueError):
+        processor.process_transaction(-5.0, "USD", "order-1")
+    assert len(store) == 0
+    assert processor.process_transaction(5.0, "USD", "order-1").amount == 5.0
+
+def test_expired_keys_are_deleted(tmp_path):
+    store = SQLiteIdempotencyStore(str(tmp_path / "keys.db"), purge_every=1)
+    processor = IdempotentPaymentProcessor(PaymentProcessor(PayPalPayment("client", "secret")), ttl=0.05,
+                                           store=store)
+    first = processor.process_transaction(5.0, "USD", "order-1")
+    processor.process_transaction(5.0, "USD", "order-2")
+    time.sleep(0.1)
+    processor._results.clear()
+    assert processor.process_transaction(5.0, "USD", "order-1").transaction_id != first.transaction_id
+    assert len(store) == 1
@@ -0,0 +1,39 @@
+import pytest
+
+import PaymentMetrics
+from shipment_system.metrics import instrumentation
+
+# The payment project keeps its own copy of the instrumentation so it runs
+# without the shipment tree; both copies must behave the same.
+@pytest.fixture(params=[instrumentation, PaymentMetrics], ids=["shipment_system", "payments"])
+def metrics(request):
+    return request.param
+
+def test_sampled_calls_record_one_in_n_and_count_every_failure(metrics):
+    registry = metrics.MetricsRegistry("test")
+    histogram = registry.histogram("duration")
+    errors = registry.counter("errors")
+
+    @metrics.timed(histogram, errors, sample_every=4)
+    def divide(a, b):
+        return a / b
+
+    assert [divide(8, 2) for _ in range(8)] == [4.0] * 8
+    assert histogram.count == 2
+    for _ in range(3):
+        with pytest.raises(ZeroDivisionError):
+            divide(1, 0)
+    assert errors.value == 3
+    assert histogram.count == 3
+
+def test_detach_restores_the_original_methods(metrics):
+    class Provider:
+        def pay(self, amount):
+            return amount
+
+    original = Provider.pay
+    registry = metrics.MetricsRegistry("test")
+    with metrics.attach(Provider, ["pay"], registry):
+        assert Provider().pay(5) == 5
+    assert Provider.pay is original
+    assert 'test_call_duration_seconds_count{method="pay",target="Provider"} 1' in registry.to_prometheus()
@@ -0,0 +1,33 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "AbstractFactory")
+
+def run(code):
+    return subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True,
+                          check=True).stdout.split()
+
+@pytest.mark.parametrize("package, name, module", [
+    ("shipment_system.factories", "DHLFactory", "shipment_system.factories.dhl_factory"),
+    ("shipment_system.products.dhl", "DHLAirShipment", "shipment_system.products.dhl.dhl_air_shipment"),
+    ("shipment_system.products.fedex", "FedExAirShipment", "shipment_system.products.fedex.fedex_air_shipment"),
+    ("shipment_system.products.ups", "UPSAirShipment", "shipment_system.products.ups.ups_air_shipment"),
+    ("shipment_system.tracking", "TrackingIndex", "shipment_system.tracking.tracking_index"),
+])
+def test_names_load_their_module_on_first_use(package, name, module):
+    loaded_before, listed, loaded_after, cached = run(
+        "import sys, importlib\n"
+        f"package = importlib.import_module({package!r})\n"
+        f"print({module!r} in sys.modules, {name!r} in dir(package))\n"
+        f"getattr(package, {name!r})\n"
+        f"print({module!r} in sys.modules, {name!r} in vars(package))\n"
+    )
+    assert (loaded_before, listed, loaded_after, cached) == ("False", "True", "True", "True")
+
+def test_unknown_names_raise_attribute_error():
+    import shipment_system.tracking as tracking
+    with pytest.raises(AttributeError, match="shipment_system.tracking"):
+        tracking.Missing
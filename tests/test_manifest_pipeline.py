@@ -0,0 +1,39 @@
+from shipment_system.factories.dhl_factory import DHLFactory
+from shipment_system.factories.factory_registry import FactoryRegistry, _register_defaults
+from shipment_system.ingestion.manifest_pipeline import quote_chunks
+from shipment_system.products.dhl import DHLGroundShipment
+
+class PalletShipment(DHLGroundShipment):
+    __slots__ = ("pallets",)
+
+    def __init__(self):
+        super().__init__()
+        self.pallets = 1
+
+    def set_pallets(self, pallets):
+        self.pallets = pallets
+
+    def calculate_cost(self):
+        return super().calculate_cost() * self.pallets
+
+class PalletFactory(DHLFactory):
+    def create_ground_shipment(self):
+        return PalletShipment()
+
+def test_plugin_options_are_parsed_with_their_registered_parser():
+    registry = FactoryRegistry()
+    _register_defaults(registry)
+    registry.register_factory("Pallets", PalletFactory())
+    registry.register_option(PalletShipment, "pallets", PalletShipment.set_pallets, parse=int)
+    rows = [
+        {"carrier": "Pallets", "shipment_type": "ground", "destination": "Lyon", "weight": "10", "pallets": "3"},
+        {"carrier": "Pallets", "shipment_type": "ground", "destination": "Lyon", "weight": "10", "pallets": ""},
+        {"carrier": "DHL", "shipment_type": "water", "destination": "Oslo", "weight": "10", "container_type": "Premium"},
+        {"carrier": "DHL", "shipment_type": "air", "destination": "Oslo", "weight": "10", "express": "yes"},
+        {"carrier": "DHL", "shipment_type": "air", "destination": "Oslo", "weight": "10", "express": "no"},
+    ]
+    [quotes] = quote_chunks(rows, registry=registry)
+    assert quotes[0].cost == 3 * quotes[1].cost
+    assert quotes[2].cost == (200.0 + 10 * 0.8) * 1.3
+    assert quotes[3].cost == (100.0 + 10 * 2.5) * 1.5
+    assert quotes[4].cost == 100.0 + 10 * 2.5
@@ -0,0 +1,9 @@
+from CurrencyExchange import FxRates
+from PaymentInterface import PaymentProcessor, PaymentStatus, PayPalPayment
+
+def test_unknown_currency_fails_only_its_items():
+    processor = PaymentProcessor(PayPalPayment("client", "secret"), fx=FxRates())
+    results = processor.process_batch([10, 20, 30, 5], ["USD", "XYZ", "EUR", "XYZ"])
+    assert [result.succeeded for result in results] == [True, False, True, False]
+    assert "XYZ" in str(results[1].error)
+    assert results[2].details.status == PaymentStatus.COMPLETED
@@ -0,0 +1,40 @@
+import threading
+
+from CurrencyExchange import FxRates
+from PaymentInterface import BankTransferPayment, PaymentStatus, PayPalPayment
+from PaymentRouting import RoutingPaymentProcessor
+
+def _router(**kwargs):
+    router = RoutingPaymentProcessor(**kwargs)
+    router.add_provider("paypal", PayPalPayment("client", "secret"), fee_rate=0.034, fixed_fee=0.49)
+    router.add_provider("bank_transfer", BankTransferPayment("bank", "account"), fixed_fee=25.0)
+    return router
+
+def test_refund_and_status_are_found_through_the_provider_ledgers():
+    router = _router()
+    payments = [router.process_transaction(amount) for amount in (10.0, 20000.0)]
+    assert not any(isinstance(value, dict) and value for value in vars(router).values())
+    assert router.check_status(payments[0].transaction_id) == PaymentStatus.COMPLETED
+    assert router.request_refund(payments[0].transaction_id) is True
+    assert router.check_status(payments[0].transaction_id) == PaymentStatus.REFUNDED
+    assert router.check_status(payments[1].transaction_id) == PaymentStatus.PROCESSING
+    assert router.check_status("PP_unknown") == PaymentStatus.FAILED
+    assert router.request_refund("PP_unknown") is False
+
+def test_rank_converts_amounts_to_each_providers_limit_currency():
+    assert {route.name for route in _router().rank(9500.0, "EUR")} == {"paypal", "bank_transfer"}
+    assert [route.name for route in _router(fx=FxRates()).rank(9500.0, "EUR")] == ["bank_transfer"]
+
+def test_concurrent_observations_are_all_counted():
+    route = _router().routes[0]
+
+    def work():
+        for _ in range(5000):
+            route.observe(0.01, False, 0.2)
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert route.calls == 20000
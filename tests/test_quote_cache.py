@@ -0,0 +1,79 @@
+import json
+import shutil
+
+import pytest
+
+from shipment_system.pricing import QuoteCache, RateTable
+from shipment_system.pricing.rate_table import DEFAULT_RATES_PATH
+from shipment_system.products.dhl import DHLAirShipment
+
+@pytest.fixture
+def rate_table(tmp_path):
+    path = tmp_path / "rates.json"
+    shutil.copyfile(DEFAULT_RATES_PATH, path)
+    return RateTable(str(path))
+
+def set_dhl_air_base(table, base):
+    with open(table.path, encoding="utf-8") as rates_file:
+        data = json.load(rates_file)
+    data["DHL"]["air"]["base"] = base
+    with open(table.path, "w", encoding="utf-8") as rates_file:
+        json.dump(data, rates_file)
+    table.reload()
+
+def shipment(weight):
+    shipment = DHLAirShipment()
+    shipment.set_weight(weight)
+    return shipment
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def test_least_recently_used_entry_is_evicted(rate_table):
+    cache = QuoteCache(maxsize=2, rate_table=rate_table)
+    cache.quote(shipment(1.0))
+    cache.quote(shipment(2.0))
+    cache.quote(shipment(1.0))
+    cache.quote(shipment(3.0))
+    assert cache.evictions == 1
+    assert cache.key(shipment(2.0)) not in cache._entries
+    cache.quote(shipment(1.0))
+    assert cache.stats()["hits"] == 2
+
+def test_entries_expire_after_the_ttl(rate_table):
+    clock = FakeClock()
+    cache = QuoteCache(ttl=10.0, rate_table=rate_table, clock=clock)
+    cache.quote(shipment(1.0))
+    clock.now = 9.0
+    cache.quote(shipment(1.0))
+    assert (cache.hits, cache.expirations) == (1, 0)
+    clock.now = 10.0
+    cache.quote(shipment(1.0))
+    assert (cache.hits, cache.expirations, cache.misses) == (1, 1, 2)
+
+def test_reload_invalidates_cached_quotes(rate_table):
+    cache = QuoteCache(rate_table=rate_table)
+    assert cache.quote(shipment(1.0)).cost == 102.5
+    set_dhl_air_base(rate_table, 200.0)
+    assert cache.quote(shipment(1.0)).cost == 202.5
+    assert cache.invalidations == 1
+
+def test_quote_priced_during_a_reload_is_not_cached(rate_table):
+    cache = QuoteCache(rate_table=rate_table)
+    lookup = rate_table.lookup
+
+    def lookup_then_reload(*args):
+        rate = lookup(*args)
+        rate_table.lookup = lookup
+        set_dhl_air_base(rate_table, 200.0)
+        return rate
+
+    rate_table.lookup = lookup_then_reload
+    assert cache.quote(shipment(1.0)).cost == 102.5
+    assert len(cache) == 0
+    assert cache.quote(shipment(1.0)).cost == 202.5
+    assert len(cache) == 1
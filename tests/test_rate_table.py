@@ -0,0 +1,67 @@
+import json
+import os
+import shutil
+import time
+
+import pytest
+
+from shipment_system.pricing import Carrier, Mode, RateTable
+from shipment_system.pricing.rate_table import DEFAULT_RATES_PATH
+
+@pytest.fixture
+def rate_table(tmp_path):
+    path = tmp_path / "rates.json"
+    shutil.copyfile(DEFAULT_RATES_PATH, path)
+    return RateTable(str(path))
+
+def write_rates(table, edit):
+    with open(DEFAULT_RATES_PATH, encoding="utf-8") as rates_file:
+        data = json.load(rates_file)
+    edit(data)
+    with open(table.path, "w", encoding="utf-8") as rates_file:
+        json.dump(data, rates_file)
+    # Move the mtime forward so the change is seen on coarse-grained filesystems.
+    stat = os.stat(table.path)
+    os.utime(table.path, ns=(stat.st_atime_ns, table._mtime + 1_000_000_000))
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+def set_base(base):
+    def edit(data):
+        data["DHL"]["air"]["base"] = base
+    return edit
+
+@pytest.mark.parametrize("edit", [
+    lambda data: data["DHL"]["air"].pop("base"),
+    lambda data: data["DHL"].update(air=None),
+    lambda data: data["DHL"]["air"].update(per_kg="heavy"),
+    lambda data: data.update(DHL=[]),
+], ids=["missing base", "rate not a mapping", "non-numeric per_kg", "modes not a mapping"])
+def test_malformed_entries_raise_value_error(rate_table, edit):
+    write_rates(rate_table, edit)
+    with pytest.raises(ValueError):
+        rate_table.reload()
+
+def test_watcher_survives_a_malformed_file_and_picks_up_the_fix(rate_table):
+    stop = rate_table.watch(interval=0.01)
+    try:
+        write_rates(rate_table, set_base(150.0))
+        assert wait_for(lambda: rate_table.version == 2)
+        assert rate_table.lookup(Carrier.DHL, Mode.AIR)[0] == 150.0
+
+        write_rates(rate_table, lambda data: data["DHL"]["air"].pop("base"))
+        time.sleep(0.1)
+        assert rate_table.version == 2
+        assert rate_table.lookup(Carrier.DHL, Mode.AIR)[0] == 150.0
+
+        write_rates(rate_table, set_base(175.0))
+        assert wait_for(lambda: rate_table.version == 3)
+        assert rate_table.lookup(Carrier.DHL, Mode.AIR)[0] == 175.0
+    finally:
+        stop.set()
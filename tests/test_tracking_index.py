@@ -0,0 +1,25 @@
+from shipment_system.pricing import Carrier, Mode
+from shipment_system.tracking import TrackingIndex, TrackingStatus
+from shipment_system.tracking.id_allocator import format_tracking_number
+
+def test_malformed_tracking_numbers_are_unknown(tmp_path):
+    index = TrackingIndex()
+    index.add(42, Carrier.DHL, Mode.AIR, 1.5, "Berlin")
+    known = format_tracking_number(42, Carrier.DHL)
+    for malformed in ("bogus", "TRK-DHL-ZZZ", "TRK-", ""):
+        assert index.get(malformed) is None
+        assert index.status(malformed) is None
+        assert malformed not in index
+        assert index.timeline(malformed) == []
+        assert index.update_status(malformed, TrackingStatus.DELIVERED) is False
+    assert [record and record.destination for record in index.get_many(["bogus", known, "TRK-DHL-ZZZ"])] == [
+        None, "Berlin", None,
+    ]
+    path = str(tmp_path / "index.snapshot")
+    index.save(path)
+    snapshot = TrackingIndex.open(path)
+    try:
+        assert snapshot.get_many(["bogus", known])[1].status == TrackingStatus.CREATED
+        assert snapshot.get("TRK-DHL-ZZZ") is None
+    finally:
+        snapshot.close()
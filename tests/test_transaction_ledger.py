@@ -0,0 +1,98 @@
+import os
+from datetime import datetime, timedelta
+
+import pytest
+
+from PaymentInterface import PaymentDetails, PaymentStatus
+from TransactionLedger import MmapLogLedger, SQLiteLedger
+
+START = datetime(2026, 1, 1)
+
+def _details(i, status=PaymentStatus.COMPLETED):
+    return PaymentDetails(10.0 + i, "USD", f"payment {i} é", f"PP_{i:06d}", START + timedelta(minutes=i), status)
+
+def _open(kind, tmp_path):
+    if kind == "mmap":
+        return MmapLogLedger(str(tmp_path / "ledger"), initial_capacity=8)
+    return SQLiteLedger(str(tmp_path / "ledger.db"), batch_size=7)
+
+@pytest.fixture(params=["mmap", "sqlite"])
+def kind(request):
+    return request.param
+
+def test_round_trip_and_reopen(kind, tmp_path):
+    ledger = _open(kind, tmp_path)
+    records = [_details(i, PaymentStatus.PROCESSING if i % 3 else PaymentStatus.COMPLETED) for i in range(100)]
+    for details in records:
+        ledger.record(details)
+    assert ledger.update_status("PP_000001", PaymentStatus.REFUNDED)
+    assert not ledger.update_status("PP_missing", PaymentStatus.REFUNDED)
+    assert ledger.get("PP_000050") == records[50]
+    ledger.close()
+
+    reopened = _open(kind, tmp_path)
+    try:
+        assert len(reopened) == 100
+        assert reopened.get("PP_000050") == records[50]
+        assert reopened.get_status("PP_000001") == PaymentStatus.REFUNDED
+        assert reopened.get("PP_missing") is None
+        assert "PP_000099" in reopened
+    finally:
+        reopened.close()
+
+def test_range_and_status_queries(kind, tmp_path):
+    ledger = _open(kind, tmp_path)
+    try:
+        for i in range(50):
+            ledger.record(_details(i, PaymentStatus.PROCESSING if i % 2 else PaymentStatus.COMPLETED))
+        between = ledger.find_between(START + timedelta(minutes=10), START + timedelta(minutes=20))
+        assert sorted(details.transaction_id for details in between) == [f"PP_{i:06d}" for i in range(10, 20)]
+        processing = ledger.find_by_status(PaymentStatus.PROCESSING)
+        assert sorted(details.transaction_id for details in processing) == [f"PP_{i:06d}" for i in range(1, 50, 2)]
+        ledger.update_status("PP_000001", PaymentStatus.FAILED)
+        assert len(ledger.find_by_status(PaymentStatus.PROCESSING)) == 24
+    finally:
+        ledger.close()
+
+def test_compaction_drops_old_settled_transactions(kind, tmp_path):
+    ledger = _open(kind, tmp_path)
+    for i in range(40):
+        ledger.record(_details(i, PaymentStatus.PROCESSING if i % 2 else PaymentStatus.COMPLETED))
+    assert ledger.compact(START + timedelta(minutes=20)) == 10
+    assert ledger.get("PP_000000") is None
+    assert ledger.get("PP_000001").status == PaymentStatus.PROCESSING
+    assert len(ledger) == 30
+    ledger.record(_details(100))
+    ledger.close()
+    reopened = _open(kind, tmp_path)
+    try:
+        assert len(reopened) == 31
+        assert reopened.get("PP_000100") == _details(100)
+    finally:
+        reopened.close()
+
+def test_mmap_ledger_reopens_after_a_torn_write(tmp_path):
+    ledger = MmapLogLedger(str(tmp_path / "ledger"))
+    for i in range(10):
+        ledger.record(_details(i))
+    ledger.close()
+    log_path = tmp_path / "ledger" / "ledger.log"
+    intact_size = os.path.getsize(log_path)
+    with open(log_path, "ab") as log:
+        log.write(MmapLogLedger._encode(_details(10))[:20])
+
+    reopened = MmapLogLedger(str(tmp_path / "ledger"))
+    try:
+        assert os.path.getsize(log_path) == intact_size
+        assert len(reopened) == 10
+        assert reopened.get("PP_000010") is None
+        reopened.record(_details(11))
+        assert reopened.get("PP_000011") == _details(11)
+    finally:
+        reopened.close()
+    again = MmapLogLedger(str(tmp_path / "ledger"))
+    try:
+        assert again.get("PP_000011") == _details(11)
+        assert again.get("PP_000009") == _details(9)
+    finally:
+        again.close()